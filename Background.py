@@ -0,0 +1,100 @@
+from typing import Any, Callable
+from threading import Thread
+from queue import Queue, Empty
+from tkinter import Misc
+from time import perf_counter
+
+type PROGRESS = Callable[[float], None]
+
+class BackgroundTask:
+    """
+    Runs a function on a worker thread and reports back on the Tk main thread.
+
+    Tk widgets may only be touched from the main thread, so the worker never calls the callbacks itself:
+    it puts messages on a queue that the main thread drains every POLL_INTERVAL milliseconds with after().
+
+    When on_item is given, work is a generator and each value it yields is handed to on_item as soon as
+    possible. Items are handled for at most ITEM_BUDGET seconds per poll so the event loop keeps running
+    between them, and the queue holds at most QUEUED_ITEMS messages so the worker can't run far ahead.
+    """
+
+    POLL_INTERVAL: int = 100
+    ITEM_BUDGET: float = 0.008
+    QUEUED_ITEMS: int = 8
+
+    def __init__(self, widget: Misc, work: Callable[[PROGRESS], Any], on_done: Callable[[Any], None], on_error: Callable[[BaseException], None], on_progress: PROGRESS | None = None, on_item: Callable[[Any], None] | None = None) -> None:
+        """
+        Args:
+            widget (Misc): Any widget, used to schedule the polling.
+            work (Callable[[PROGRESS], Any]): The function to run. It receives a callback taking the fraction done, from 0 to 1.
+            on_done (Callable[[Any], None]): Called on the main thread with the return value of work, or the number of items it yielded.
+            on_error (Callable[[BaseException], None]): Called on the main thread with the exception raised by work.
+            on_progress (PROGRESS | None): Called on the main thread with the latest fraction reported by work.
+            on_item (Callable[[Any], None] | None): Called on the main thread with each value yielded by work.
+        """
+        self.widget: Misc = widget
+        self.work: Callable[[PROGRESS], Any] = work
+        self.on_done: Callable[[Any], None] = on_done
+        self.on_error: Callable[[BaseException], None] = on_error
+        self.on_progress: PROGRESS | None = on_progress
+        self.on_item: Callable[[Any], None] | None = on_item
+        self.messages: Queue = Queue(self.QUEUED_ITEMS if on_item else 0)
+
+    def start(self) -> None:
+        Thread(target=self._run, daemon=True).start()
+        self.widget.after(self.POLL_INTERVAL, self._poll)
+
+    def _run(self) -> None:
+        """
+        Runs on the worker thread
+        """
+        try:
+            result: Any = self.work(lambda fraction: self.messages.put(('progress', fraction)))
+
+            if self.on_item:
+                items: int = 0
+
+                for item in result:
+                    self.messages.put(('item', item))
+                    items += 1
+
+                result = items
+        except BaseException as error:
+            self.messages.put(('error', error))
+        else:
+            self.messages.put(('done', result))
+
+    def _poll(self) -> None:
+        """
+        Runs on the main thread until the worker has finished
+        """
+        latest_progress: float | None = None
+        deadline: float = perf_counter() + self.ITEM_BUDGET
+        handled_item: bool = False
+
+        while not handled_item or perf_counter() < deadline:
+            try:
+                kind, value = self.messages.get_nowait()
+            except Empty:
+                break
+
+            if kind == 'progress':
+                latest_progress = value
+                continue
+
+            if kind == 'item':
+                self.on_item(value)
+                handled_item = True
+                continue
+
+            if kind == 'done':
+                self.on_done(value)
+            else:
+                self.on_error(value)
+            return
+
+        if latest_progress is not None and self.on_progress:
+            self.on_progress(latest_progress)
+
+        # come back right after the event loop had its turn while items are flowing
+        self.widget.after(1 if handled_item else self.POLL_INTERVAL, self._poll)
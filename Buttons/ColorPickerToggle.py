@@ -6,12 +6,14 @@ from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from Program import App
+    from Canvas import OpenGLCanvas
 
 # start of code
 from customtkinter import CTkButton, CTkFrame
-from CTkColorPicker import *
-from Global import Global
+from Journal import Operation
+from Shapes.Shape import Shape
 from typing import Type
+import numpy as np
 
 class ColorPickerToggle(CTkButton):
     def __init__(self, parent: Type[CTkFrame], app: App, *args, **kwargs):
@@ -34,12 +36,20 @@ class ColorPickerToggle(CTkButton):
         The click event for the button
         """
         super()._clicked(event)
+
+        # loaded on first use, it isn't needed to show the window
+        from CTkColorPicker import AskColor
+
         pick_color: AskColor = AskColor()
 
         chosen_color = pick_color.get()
         self.configure(fg_color=chosen_color if chosen_color else "white")
 
-        if not Global.shape:
+        canvas: OpenGLCanvas = self.app.right_content
+        rows: np.ndarray = canvas.selected_rows()
+
+        if not chosen_color or not rows.size:
             return
 
-        Global.shape.set_new_color_from_hex(chosen_color)
\ No newline at end of file
+        color: tuple = Shape.rgb_from_hex(chosen_color)
+        canvas.edit_rows(rows, Operation.RECOLOR, lambda rows: canvas.shapes.recolor(rows, color))
\ No newline at end of file
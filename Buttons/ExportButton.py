@@ -8,25 +8,108 @@ if TYPE_CHECKING:
     from Navigation import Navigation
     from Canvas import OpenGLCanvas
 
-from customtkinter import CTkButton
-from Shapes.Shape import Shape
-from typing import List, Type
+from typing import Callable, Iterator
+from customtkinter import CTkButton, CTkInputDialog
 from CTkToast import CTkToast
 
-from Save import export_to_file
+from Shapes.ShapeStore import ShapeStore
+from Background import BackgroundTask, PROGRESS
+from Save import save_file_dialog, write_dsd
+from ImageExport import render_png
+from SvgExport import write_svg
 
 class ExportButton(CTkButton):
 
     def __init__(self, master: Navigation, canvas: OpenGLCanvas, width: int|20 = 20, *args, **kwargs):
         super().__init__(master, text="Export", width=width, *args, **kwargs)
         self.canvas: OpenGLCanvas = canvas
+        self.progress_toast: CTkButton | None = None
+        self.png_bands: Iterator[float] | None = None
 
         if not canvas:
             raise Exception('OpengGL canvas must be passed as an argument')
 
     def _clicked(self, event):
         super()._clicked(event)
-        shapes: List[Type[Shape]] = self.canvas.shapes
 
-        if export_to_file(shapes):
-            CTkToast.toast("Exported Successfully")
\ No newline at end of file
+        file_path: str | None = save_file_dialog()
+
+        if file_path is None:
+            CTkToast.toast('Cancelled file selection')
+            return
+
+        # the canvas stays editable while the file is written, so the worker gets a copy of the shapes
+        shapes: ShapeStore = self.canvas.shapes.snapshot()
+
+        if file_path.lower().endswith('.png'):
+            self._export_png(file_path, shapes)
+            return
+
+        # vector images hold every shape, wherever the camera is
+        write: Callable[[str, ShapeStore, PROGRESS], None] = write_svg if file_path.lower().endswith('.svg') else write_dsd
+
+        self.configure(state='disabled')
+        self.progress_toast = CTkToast.progress('Exporting 0%')
+
+        BackgroundTask(
+            self,
+            lambda report: write(file_path, shapes, progress=report),
+            on_done=self._exported,
+            on_error=self._failed,
+            on_progress=lambda fraction: self.progress_toast.configure(text=f'Exporting {fraction:.0%}')
+        ).start()
+
+    def _export_png(self, file_path: str, shapes: ShapeStore) -> None:
+        """
+        Draws what the canvas shows into a PNG of the width the user picks. The image is drawn with the canvas'
+        OpenGL context, which belongs to the Tk thread, so one band of tiles is drawn per idle tick instead of on a worker.
+        """
+        canvas: OpenGLCanvas = self.canvas
+        answer: str | None = CTkInputDialog(text='Width of the image in pixels', title='Export PNG').get_input()
+
+        if answer is None:
+            CTkToast.toast('Cancelled PNG export')
+            return
+
+        if not answer.strip().isdigit() or int(answer) < 1:
+            CTkToast.toast(f'{answer} is not a width in pixels')
+            return
+
+        width: int = int(answer)
+        height: int = max(1, round(width * canvas.height / canvas.width))
+
+        self.configure(state='disabled')
+        self.progress_toast = CTkToast.progress('Exporting 0%')
+
+        canvas.tkMakeCurrent()
+        self.png_bands = render_png(file_path, shapes, width, height, canvas.camera.visible_rectangle(canvas.width, canvas.height))
+        self.after_idle(self._draw_png_band)
+
+    def _draw_png_band(self) -> None:
+        try:
+            self.canvas.tkMakeCurrent()
+            fraction: float = next(self.png_bands)
+        except StopIteration:
+            self.png_bands = None
+            self._exported(None)
+            return
+        except Exception as error:
+            self.png_bands = None
+            self._failed(error)
+            return
+
+        self.progress_toast.configure(text=f'Exporting {fraction:.0%}')
+        self.after(1, self._draw_png_band)
+
+    def _finish(self) -> None:
+        CTkToast.dismiss(self.progress_toast)
+        self.progress_toast = None
+        self.configure(state='normal')
+
+    def _exported(self, _) -> None:
+        self._finish()
+        CTkToast.toast("Exported Successfully")
+
+    def _failed(self, error: BaseException) -> None:
+        self._finish()
+        CTkToast.toast(f'Export failed: {error}')
@@ -11,8 +11,8 @@ if TYPE_CHECKING:
 from customtkinter import CTkButton, CTkImage, CTkFrame
 from abc import ABC, abstractmethod
 from typing import Type
-from PIL import Image
-from os import path
+
+from IconAtlas import IconAtlas
 
 class ImageButton(CTkButton, ABC):
     def __init__(self, parent: Type[CTkFrame], app: App, image_file_name: str, *args, **kwargs):
@@ -32,14 +32,12 @@ class ImageButton(CTkButton, ABC):
         self.image_file_name: str = image_file_name
         self.app: App = app
 
-        image_path: str = path.join('icon_asset', f"{image_file_name}.PNG")
-
-        if not path.exists(image_path):
+        # the icons are sliced from one cached atlas and shared between buttons
+        try:
+            icon: CTkImage = IconAtlas.icon(image_file_name)
+        except KeyError:
             raise TypeError('The name of the image must be the same as the __name__ of the method')
 
-        image = Image.open(fp=image_path)
-
-        icon: CTkImage = CTkImage(size=(25, 25), light_image=image, dark_image=image)
         self.configure(image=icon, text='', height=0, width=0)
 
     @abstractmethod
@@ -9,17 +9,18 @@ if TYPE_CHECKING:
     from Canvas import OpenGLCanvas
 
 from customtkinter import CTkButton
-from Shapes.Shape import Shape
-from typing import List, Type
+from pickle import UnpicklingError
 from CTkToast import CTkToast
 
-from Save import import_from_file
+from Background import BackgroundTask
+from Save import open_file_dialog, stream_scene
 
 class ImportButton(CTkButton):
 
     def __init__(self, master: Navigation, canvas: OpenGLCanvas, width: int|20 = 20, *args, **kwargs):
         super().__init__(master, text="Import", width=width, *args, **kwargs)
         self.canvas: OpenGLCanvas = canvas
+        self.progress_toast: CTkButton | None = None
 
         if not canvas:
             raise Exception('OpengGL canvas must be passed as an argument')
@@ -27,17 +28,42 @@ class ImportButton(CTkButton):
     def _clicked(self, event):
         super()._clicked(event)
 
-        shapes: List[Type[Shape]] = import_from_file()
+        file_path: str | None = open_file_dialog()
 
-        if shapes is None:
+        if not file_path:
+            CTkToast.toast('Cancelled selection')
             return
 
-        all_are_shapes: List[bool] = all(issubclass(type(shape), Shape) for shape in shapes)
+        self.configure(state='disabled')
+        self.progress_toast = CTkToast.progress('Importing 0%')
 
-        if not all_are_shapes:
-            CTkToast.toast('Some data or all data imported are not shapes')
-            return
+        # chunks are appended as they arrive, so the first shapes show up before the file is fully read
+        self.canvas.begin_import()
+
+        BackgroundTask(
+            self,
+            lambda report: stream_scene(file_path, report),
+            on_done=self._imported,
+            on_error=self._failed,
+            on_progress=lambda fraction: self.progress_toast.configure(text=f'Importing {fraction:.0%}'),
+            on_item=self.canvas.append_shapes
+        ).start()
 
-        self.canvas.shapes = shapes
+    def _finish(self, imported: bool) -> None:
+        self.canvas.finish_import(imported)
+        CTkToast.dismiss(self.progress_toast)
+        self.progress_toast = None
+        self.configure(state='normal')
+
+    def _imported(self, _) -> None:
+        self._finish(True)
         CTkToast.toast("Imported Successfully")
-        return
+
+    def _failed(self, error: BaseException) -> None:
+        self._finish(False)
+
+        if isinstance(error, (ValueError, UnpicklingError, EOFError)):
+            CTkToast.toast('Some data or all data imported are not shapes, the previous shapes were kept')
+            return
+
+        CTkToast.toast(f'Import failed: {error}. The previous shapes were kept')
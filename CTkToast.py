@@ -39,6 +39,31 @@ class CTkToast(CTkFrame):
 
         instance.after(instance.delay, remove_toast_button)
 
+    @staticmethod
+    def progress(message: str) -> CTkButton:
+        """
+        Shows a toast that stays until it is passed to CTkToast.dismiss.
+        Its text can be updated with configure(text=...) to report progress.
+        """
+        instance: CTkToast = CTkToast.get_instance()
+
+        toast_button: CTkButton = CTkButton(instance, text=message)
+        toast_button.pack(pady=BOTTOM_PADDING_ONLY)
+        return toast_button
+
+    @staticmethod
+    def dismiss(toast_button: CTkButton) -> None:
+        """
+        Removes a toast created by CTkToast.progress
+        """
+        instance: CTkToast = CTkToast.get_instance()
+
+        toast_button.destroy()
+        instance.update()
+
+        if len(instance.winfo_children()) == 0:
+            instance.configure(height=0)
+
     def __init__(self, master: Type[CTk] = None, position: Tuple[int, int] | None = None, delay: int = 2000, **kwargs):
         super().__init__(master=master, **kwargs)
 
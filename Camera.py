@@ -0,0 +1,68 @@
+from typing import Tuple
+
+from custom_types import RECTANGLE
+from constants import MIN_ZOOM, MAX_ZOOM
+
+class Camera:
+    """
+    Maps canvas pixels to world coordinates, the coordinates shapes are stored and hit-tested in.
+
+    Attributes:
+        x (float): The world x coordinate shown at the left edge of the canvas.
+        y (float): The world y coordinate shown at the top edge of the canvas.
+        zoom (float): How many canvas pixels one world unit covers.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Shows the world at its original position and size, where world coordinates are canvas pixels.
+        """
+        self.x: float = 0.0
+        self.y: float = 0.0
+        self.zoom: float = 1.0
+
+    def to_world(self, x: float, y: float) -> Tuple[float, float]:
+        """
+        Converts a point of the canvas, such as the position of a mouse event, to world coordinates.
+        """
+        return self.x + x / self.zoom, self.y + y / self.zoom
+
+    def pan(self, dx: float, dy: float) -> None:
+        """
+        Moves the world by a distance in canvas pixels, so what was under the mouse follows it.
+        """
+        self.x -= dx / self.zoom
+        self.y -= dy / self.zoom
+
+    def zoom_at(self, x: float, y: float, factor: float) -> bool:
+        """
+        Multiplies the zoom by a factor, clamped between MIN_ZOOM and MAX_ZOOM, keeping the world point
+        under a point of the canvas in place.
+
+        Args:
+            x (float): The x coordinate of the canvas point, usually the mouse.
+            y (float): The y coordinate of the canvas point.
+            factor (float): Above 1 to zoom in, below 1 to zoom out.
+
+        Returns:
+            bool: Whether the zoom changed.
+        """
+        zoom: float = min(MAX_ZOOM, max(MIN_ZOOM, self.zoom * factor))
+
+        if zoom == self.zoom:
+            return False
+
+        world_x, world_y = self.to_world(x, y)
+        self.zoom = zoom
+        self.x = world_x - x / zoom
+        self.y = world_y - y / zoom
+        return True
+
+    def visible_rectangle(self, width: int, height: int) -> RECTANGLE:
+        """
+        Returns the world rectangle shown on a canvas of the given size, as left, top, right, bottom.
+        """
+        return self.x, self.y, self.x + width / self.zoom, self.y + height / self.zoom
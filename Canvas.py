@@ -9,25 +9,40 @@ if TYPE_CHECKING:
     from Program import App
 
 # start of code
-from typing import Dict, List, Type
-from OpenGL.GLU import *
+from typing import Callable, Dict, List, Set, Tuple, Type
+from time import perf_counter
 from OpenGL.GL import *
+from customtkinter import CTkLabel
 import pyopengltk
-
+import numpy as np
+
+from Renderers.Manager import renderers, DEFAULT_RENDERER
+from Renderers.Renderer import Renderer
+from Camera import Camera
+from Journal import Journal, Operation
+from History import History, Change, capture, restore
+from FrameStats import FrameStats
+from SpatialIndex import SpatialIndex
 from KeyPress import get_pressed_status
 from custom_types import COORDINATE
+from Shapes.ShapeStore import ShapeStore
 from Shapes.Manager import shapes
 from Shapes.Shape import Shape
 from CTkToast import CTkToast
+from constants import AUTOSAVE_DIRECTORY, JOURNAL_FLUSH_INTERVAL, HISTORY_MEMORY_LIMIT, STATS_OVERLAY_INTERVAL, BOX_SELECT_THRESHOLD, SELECTION_BOX_COLOR, ZOOM_STEP, CANVAS_COLOR
 from Global import Global
 
 class OpenGLCanvas(pyopengltk.OpenGLFrame):
-    def __init__(self, parent: App, **kwargs) -> None:
+    def __init__(self, parent: App, renderer: str = DEFAULT_RENDERER, max_fps: int | None = None, animate: bool = False, stats_csv: str | None = None, **kwargs) -> None:
         """
         Initializes the App object.
 
         Args:
             parent (App): The parent MainApp object.
+            renderer (str): The name of the renderer used to draw the shapes (see Renderers.Manager).
+            max_fps (int | None): Caps how many frames are drawn per second. None draws as soon as possible.
+            animate (bool): Redraws continuously instead of only when the canvas changes.
+            stats_csv (str | None): A CSV file every frame's timings are appended to.
             **kwargs: Additional keyword arguments to pass to the parent class initializer.
         """
         super().__init__(parent, **kwargs)
@@ -37,17 +52,54 @@ class OpenGLCanvas(pyopengltk.OpenGLFrame):
         self.bind("<ButtonPress-1>", self._on_mouse_press)
         self.bind("<ButtonRelease-1>", self._on_mouse_release)
 
+        # the wheel zooms around the mouse (Button-4 and Button-5 on X11), dragging with the middle or right button pans
+        self.bind("<MouseWheel>", self._on_mouse_wheel)
+        self.bind("<Button-4>", self._on_mouse_wheel)
+        self.bind("<Button-5>", self._on_mouse_wheel)
+
+        for button in (2, 3):
+            self.bind(f"<ButtonPress-{button}>", self._on_pan_press)
+            self.bind(f"<B{button}-Motion>", self._on_pan_drag)
+
         # Main frame
         self.parent: App = parent
 
-        # Animation
-        self.animate: int = 1
+        # Redraws are requested through invalidate() and drawn on the next idle tick
+        self.animate: int = 0
+        self.max_fps: int | None = max_fps
+        self.pending_redraw: str | None = None
+        self.last_frame_time: float = 0
+        self.set_animation(animate)
 
         # Shapes
-        self.shapes: List[Type[Shape]] = []
+        self.shapes: ShapeStore = ShapeStore()
+        self.spatial_index: SpatialIndex = SpatialIndex()
+        self.renderer: Renderer = renderers()[renderer]()
+
+        # Which part of the world the canvas shows. Shapes and drags are in world coordinates
+        self.camera: Camera = Camera()
+        self.pan_coordinates: COORDINATE = None
+
+        # Autosave
+        self.journal: Journal = Journal(AUTOSAVE_DIRECTORY)
+        self.after(JOURNAL_FLUSH_INTERVAL, self._flush_journal)
+
+        # Undo and redo
+        self.history: History = History(HISTORY_MEMORY_LIMIT)
 
-        # Drag Events
+        # The shapes and history an import replaced, put back if the import fails
+        self.replaced_scene: Tuple[ShapeStore, History] | None = None
+
+        # Frame timings, shown over the canvas with F3
+        self.frame_stats: FrameStats = FrameStats()
+        self.stats_overlay: CTkLabel | None = None
+
+        if stats_csv:
+            self.frame_stats.start_csv(stats_csv)
+
+        # Drag Events, for drawing a new shape or a box selection
         self.dragging: bool = False
+        self.extend_selection: bool = False
         self.start_coordinates: COORDINATE = None
         self.current_coordinates: COORDINATE = None
         self.end_coordinates: COORDINATE = None
@@ -64,6 +116,10 @@ class OpenGLCanvas(pyopengltk.OpenGLFrame):
         state: List[str] = press_status.get('state', None)
         key: str = press_status['key']
 
+        if key == 'F3':
+            self.toggle_stats_overlay()
+            return
+
         if not state:
             return
 
@@ -71,85 +127,96 @@ class OpenGLCanvas(pyopengltk.OpenGLFrame):
         pressed_control: bool = 'Control' in state
         held_both: bool = pressed_shift and pressed_control
 
+        if pressed_control and not pressed_shift:
+
+            if key == 'z':
+                self.undo()
+                return
+
+            if key == 'y':
+                self.redo()
+                return
+
+            if key == '0':
+                self.camera.reset()
+                self.invalidate(scene_changed=False)
+                return
+
+        rows: np.ndarray = self.selected_rows()
+
         if held_both:
 
             if key == 'plus':
-                if Global.shape == None:
+                if not rows.size:
                     CTkToast.toast("Select a shape first to increase its size")
                     return
 
-                Global.shape.increase_shape()
+                self.edit_rows(rows, Operation.RESIZE, lambda rows: self.shapes.resize(rows, 5))
                 return
 
             if key == 'underscore':
-                if Global.shape == None:
+                if not rows.size:
                     CTkToast.toast("Select a shape first to decrease its size")
                     return
 
-                Global.shape.decrease_shape()
+                self.edit_rows(rows, Operation.RESIZE, lambda rows: self.shapes.resize(rows, -5))
                 return
 
             if key == 'Left':
-                if Global.shape == None:
+                if not rows.size:
                     CTkToast.toast("Select a shape first to rotate it to counter clockwise")
                     return
 
-                Global.shape.rotate_left()
+                self.edit_rows(rows, Operation.ROTATE, lambda rows: self.shapes.rotate(rows, -1))
                 return
 
             if key == 'Right':
-                if Global.shape == None:
+                if not rows.size:
                     CTkToast.toast("Select a shape first to rotate it clockwise")
                     return
 
-                Global.shape.rotate_right()
+                self.edit_rows(rows, Operation.ROTATE, lambda rows: self.shapes.rotate(rows, 1))
                 return
 
         else:
             if key == 'Delete':
-                if Global.shape == None:
+                if not rows.size:
                     CTkToast.toast("Select a shape to delete")
                     return
 
-                for shape in self.shapes:
-                    shape_name: str = shape.__class__.__name__
-                    selected_shape_name: str = Global.shape.__class__.__name__
-
-                    if selected_shape_name == shape_name:
-                        self.shapes.remove(shape)
-                        Global.shape = None
+                self.delete_rows(rows)
                 return
 
             if key == 'Up':
-                if Global.shape == None:
+                if not rows.size:
                     CTkToast.toast("Select a shape first to move it up")
                     return
 
-                Global.shape.move_up()
+                self.edit_rows(rows, Operation.MOVE, lambda rows: self.shapes.translate(rows, 0, -10))
                 return
 
             if key == 'Down':
-                if Global.shape == None:
+                if not rows.size:
                     CTkToast.toast("Select a shape first to move it down")
                     return
 
-                Global.shape.move_down()
+                self.edit_rows(rows, Operation.MOVE, lambda rows: self.shapes.translate(rows, 0, 10))
                 return
 
             if key == 'Left':
-                if Global.shape == None:
+                if not rows.size:
                     CTkToast.toast("Select a shape first to move it to the left")
                     return
 
-                Global.shape.move_left()
+                self.edit_rows(rows, Operation.MOVE, lambda rows: self.shapes.translate(rows, -10, 0))
                 return
 
             if key == 'Right':
-                if Global.shape == None:
+                if not rows.size:
                     CTkToast.toast("Select a shape first to move it to the right")
                     return
 
-                Global.shape.move_right()
+                self.edit_rows(rows, Operation.MOVE, lambda rows: self.shapes.translate(rows, 10, 0))
                 return
 
     def _on_mouse_move(self, event) -> None:
@@ -157,92 +224,269 @@ class OpenGLCanvas(pyopengltk.OpenGLFrame):
         Handles mouse move events
         """
         if self.dragging:
-            if Global.clicked_button:
-                self.current_coordinates = (event.x, event.y)
+            self.current_coordinates = self.camera.to_world(event.x, event.y)
+
+            # only the preview over the shapes changes
+            self.invalidate(scene_changed=False)
 
     def _on_mouse_press(self, event) -> None:
         """
         Handles mouse press events
         """
+        x, y = self.camera.to_world(event.x, event.y)
+
         if Global.clicked_button:
             self.dragging = True
-            self.start_coordinates = (event.x, event.y)
+            self.start_coordinates = (x, y)
             self.current_coordinates = self.start_coordinates
+            self.invalidate(scene_changed=False)
             return
 
-        is_within_any_shape_bounds: bool = False
+        state: List[str] | str = get_pressed_status(event).get('state', [])
+        candidates: List[int] = self.spatial_index.candidates(x, y)
+        shape: Type[Shape] | None = self.shapes.topmost_within_bounds(x, y, candidates)
 
-        if len(self.shapes) == 0:
+        # a press on empty canvas starts a box selection, finished in _on_mouse_release
+        if shape is None:
+            self.dragging = True
+            self.start_coordinates = (x, y)
+            self.current_coordinates = self.start_coordinates
+            self.extend_selection = 'Shift' in state
             return
 
-        for shape in self.shapes[::-1]:
-            if not shape.within_bounds(event.x, event.y):
-                continue
+        # shift-click adds the shape to the selection, or takes it out when it already is in it
+        if 'Shift' in state:
+            shape.selected = not shape.selected
+        else:
+            self.shapes.select(shape.row)
 
-            is_within_any_shape_bounds = True
+        self.invalidate()
 
-            if not Global.shape:
-                shape.selected = True
-                Global.shape = shape
+    def _on_mouse_release(self, event):
+        """
+        Handles mouse release events
+        """
+        if not self.dragging:
+            return
 
-            Global.shape.selected = False
-            Global.shape = shape
+        self.end_coordinates = self.camera.to_world(event.x, event.y)
 
-            Global.shape.selected = True
-            break
+        if Global.clicked_button:
+            self.insert_shape(self.start_coordinates, self.end_coordinates)
+        else:
+            self.select_in_box(self.start_coordinates, self.end_coordinates, self.extend_selection)
 
-        if not is_within_any_shape_bounds and Global.shape:
-            Global.shape.selected = False
-            Global.shape = None
+        self.dragging = False
+        self.start_coordinates = None
+        self.end_coordinates = None
 
+    def _on_mouse_wheel(self, event) -> None:
+        """
+        Zooms in or out around the mouse
+        """
+        zooming_in: bool = event.num == 4 or event.delta > 0
+        factor: float = ZOOM_STEP if zooming_in else 1 / ZOOM_STEP
 
-    def _on_mouse_release(self, event):
+        if self.camera.zoom_at(event.x, event.y, factor):
+            self.invalidate(scene_changed=False)
+
+    def _on_pan_press(self, event) -> None:
         """
-        Handles mouse release events
+        Starts panning the canvas
         """
-        if Global.clicked_button and self.dragging:
-            self.end_coordinates = (event.x, event.y)
-            self.insert_shape(self.start_coordinates, self.end_coordinates)
+        self.pan_coordinates = (event.x, event.y)
+
+    def _on_pan_drag(self, event) -> None:
+        """
+        Moves the world with the mouse
+        """
+        if self.pan_coordinates is None:
+            return
+
+        self.camera.pan(event.x - self.pan_coordinates[0], event.y - self.pan_coordinates[1])
+        self.pan_coordinates = (event.x, event.y)
+        self.invalidate(scene_changed=False)
+
+    def select_in_box(self, start_coordinates: COORDINATE, end_coordinates: COORDINATE, extend: bool = False) -> None:
+        """
+        Selects every shape whose bounds intersect or lie inside a rectangle, found with a range query on the spatial index.
+        A box smaller than BOX_SELECT_THRESHOLD pixels on screen is a click on empty canvas, which clears the selection.
+
+        Args:
+            start_coordinates (COORDINATE): A corner of the rectangle, in world coordinates.
+            end_coordinates (COORDINATE): The opposite corner.
+            extend (bool): Whether to add to the selection instead of replacing it.
+        """
+        left, right = sorted((start_coordinates[0], end_coordinates[0]))
+        top, bottom = sorted((start_coordinates[1], end_coordinates[1]))
+
+        if max(right - left, bottom - top) * self.camera.zoom < BOX_SELECT_THRESHOLD:
+            if not extend:
+                self.shapes.select(None)
+
+            self.invalidate()
+            return
+
+        candidates: Set[int] = self.spatial_index.candidates_in(left, top, right, bottom)
+        rows: np.ndarray = self.shapes.intersecting_rectangle(left, top, right, bottom, candidates)
+
+        if extend:
+            self.shapes.selected[rows] = True
+        else:
+            self.shapes.select(rows)
+
+        self.invalidate()
+
+    def invalidate(self, scene_changed: bool = True) -> None:
+        """
+        Marks the canvas as changed and schedules a redraw.
+
+        Calls made before the redraw happens are coalesced into that single redraw,
+        which is delayed when needed so frames are not drawn faster than max_fps.
+
+        Args:
+            scene_changed (bool): Whether the shapes changed. False when only a drag preview moved or the camera
+                panned or zoomed, which lets the renderer reuse what it built for the previous frame.
+        """
+        if scene_changed:
+            self.renderer.scene_changed = True
+
+        if self.pending_redraw is not None or self.animate > 0:
+            return
+
+        delay: int = 0
+
+        if self.max_fps:
+            elapsed: float = (perf_counter() - self.last_frame_time) * 1000
+            delay = max(0, int(1000 / self.max_fps - elapsed))
+
+        if delay:
+            self.pending_redraw = self.after(delay, self._redraw_pending)
+        else:
+            self.pending_redraw = self.after_idle(self._redraw_pending)
+
+    def _redraw_pending(self) -> None:
+        """
+        Draws the frame scheduled by invalidate()
+        """
+        self.pending_redraw = None
+
+        if not self.context_created or not self.winfo_ismapped():
+            return
+
+        # keeps an animation loop from being doubled up
+        if self.cb:
+            self.after_cancel(self.cb)
+
+        self._display()
+
+    def set_animation(self, enabled: bool) -> None:
+        """
+        Switches between continuous redrawing (capped at max_fps when set) and redrawing on invalidate().
+
+        Args:
+            enabled (bool): Whether the canvas should redraw continuously.
+        """
+        if not enabled:
+            self.animate = 0
+            return
+
+        # pyopengltk waits self.animate milliseconds between frames
+        self.animate = max(1, int(1000 / self.max_fps)) if self.max_fps else 1
+
+        if self.context_created:
+            self._redraw_pending()
+
+    def toggle_stats_overlay(self) -> None:
+        """
+        Shows or hides the rolling FPS, frame time percentiles and the phases and counters of the last frame
+        """
+        if self.stats_overlay is not None:
+            self.stats_overlay.destroy()
+            self.stats_overlay = None
+            return
+
+        self.stats_overlay = CTkLabel(self, text='', justify='left', anchor='w', fg_color='black', text_color='white', corner_radius=4)
+        self.stats_overlay.place(x=8, y=8)
+        self._refresh_stats_overlay()
+
+    def _refresh_stats_overlay(self) -> None:
+        if self.stats_overlay is None:
+            return
+
+        self.stats_overlay.configure(text=self.frame_stats.overlay_text())
+        self.after(STATS_OVERLAY_INTERVAL, self._refresh_stats_overlay)
+
+    def tkResize(self, event) -> None:
+        """
+        Handles <Configure> events by resizing the viewport and redrawing once
+        """
+        super().tkResize(event)
+
+        Shape.canvas_width = self.width
+        Shape.canvas_height = self.height
 
-            self.dragging = False
-            self.start_coordinates = None
-            self.end_coordinates = None
+        self.invalidate()
 
     def initgl(self) -> None:
         """
         Initializes the canvas
         """
         glViewport(0, 0, self.width, self.height)
-        glClearColor(0.17, 0.17, 0.17, 1.0)
+        glClearColor(*CANVAS_COLOR, 1.0)
 
     def redraw(self) -> None:
         """
         Sets canvas properties and calls a shape draw method if not None
         """
-        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        self.last_frame_time = perf_counter()
+        self.frame_stats.begin_frame()
+        self.renderer.draw_frame(self.shapes, self.width, self.height, self.frame_stats, self.camera.visible_rectangle(self.width, self.height))
 
-        glMatrixMode(GL_PROJECTION)
-        glLoadIdentity()
-        glOrtho(0, self.width, self.height, 0, -1, 1)
-        glMatrixMode(GL_MODELVIEW)
-        glLoadIdentity()
+        if self.dragging and Global.clicked_button:
+            with self.frame_stats.phase('drag'):
+                glBegin(GL_LINES)
+                glVertex2f(*self.start_coordinates)
+                glVertex2f(*self.current_coordinates)
+                glEnd()
 
-        if self.shapes:
-            Shape.canvas_width = self.winfo_width()
-            Shape.canvas_height = self.winfo_height()
+            self.frame_stats.count(vertices=2, gl_calls=4)
 
-            for shape in self.shapes:
-                shape.draw_to_canvas()
+        elif self.dragging:
+            with self.frame_stats.phase('drag'):
+                self.draw_selection_box()
 
-        if self.dragging and Global.clicked_button:
-            glBegin(GL_LINES)
-            glVertex2f(*self.start_coordinates)
-            glVertex2f(*self.current_coordinates)
-            glEnd()
+            self.frame_stats.count(vertices=8, gl_calls=17)
+
+        self.frame_stats.end_frame()
+
+    def draw_selection_box(self) -> None:
+        """
+        Draws the rectangle of a box selection being dragged, filled with a translucent SELECTION_BOX_COLOR
+        """
+        (start_x, start_y), (end_x, end_y) = self.start_coordinates, self.current_coordinates
+        corners: List[COORDINATE] = [(start_x, start_y), (end_x, start_y), (end_x, end_y), (start_x, end_y)]
+
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+
+        glColor4f(*SELECTION_BOX_COLOR, 0.15)
+        glBegin(GL_QUADS)
+        for corner in corners:
+            glVertex2f(*corner)
+        glEnd()
+
+        glColor4f(*SELECTION_BOX_COLOR, 1)
+        glBegin(GL_LINE_LOOP)
+        for corner in corners:
+            glVertex2f(*corner)
+        glEnd()
+
+        glDisable(GL_BLEND)
 
     def insert_shape(self, start_coordinates, end_coordinates) -> None:
         """
-        Inserts a shape into the canvas
+        Inserts a shape into the canvas, between two corners in world coordinates
         """
         shape_class_reference: Type[Shape] = shapes().get(Global.clicked_button.image_file_name)
         shape_instance: Type[Shape] = shape_class_reference(start_coordinates=list(start_coordinates), end_coordinates=list(end_coordinates))
@@ -251,4 +495,229 @@ class OpenGLCanvas(pyopengltk.OpenGLFrame):
         Global.clicked_button = None
 
         self.parent.configure(cursor='arrow')
-        self.shapes.append(shape_instance)
+        self._add_shape(shape_instance, len(self.shapes))
+        self.history.record(Operation.INSERT, shape_instance, None, shape_instance.row)
+
+    def selected_rows(self) -> np.ndarray:
+        """
+        Returns the rows of the selected shapes, bottom to top
+        """
+        return np.flatnonzero(self.shapes.selected)
+
+    def edit_rows(self, rows: np.ndarray, operation: Operation, edit: Callable[[np.ndarray], None]) -> None:
+        """
+        Applies a bulk edit to shapes of the canvas, keeping what it changed so it can be undone
+
+        Args:
+            rows (np.ndarray): The rows of the shapes to edit.
+            operation (Operation): What the edit does to the shapes.
+            edit (Callable[[np.ndarray], None]): Makes the change to the rows, for example a call to ShapeStore.translate.
+        """
+        before: Tuple[np.ndarray, ...] = capture(operation, self.shapes, rows)
+        edit(rows)
+        self.history.record(operation, rows, before, capture(operation, self.shapes, rows))
+        self.rows_changed(rows, operation)
+
+    def rows_changed(self, rows: np.ndarray, operation: Operation) -> None:
+        """
+        Records a bulk edit made to shapes of the canvas and redraws them, with one update of the spatial index and of the journal
+        """
+        self.spatial_index.update_rows(self.shapes, rows)
+        self.journal.record_rows(operation, self.shapes, rows)
+        self.invalidate()
+
+    def delete_rows(self, rows: np.ndarray) -> None:
+        """
+        Removes shapes from the canvas
+        """
+        self.history.record(Operation.DELETE, self._remove_rows(rows), rows, None)
+
+    def _add_shape(self, shape: Type[Shape], row: int) -> None:
+        """
+        Inserts a shape at a row of the canvas. Rows below the top are journaled with every value
+        the shape may have been edited to, since an insert record alone only holds its corners.
+        """
+        self.shapes.insert(row, shape)
+        self.spatial_index.insert(shape)
+        self.journal.record(Operation.INSERT, shape)
+
+        if row < len(self.shapes) - 1:
+            for operation in (Operation.MOVE, Operation.RESIZE, Operation.ROTATE, Operation.RECOLOR):
+                self.journal.record(operation, shape)
+
+        self.invalidate()
+
+    def _add_rows(self, rows: np.ndarray, shapes: ShapeStore) -> None:
+        """
+        Puts shapes taken out by _remove_rows back at their rows. Like _add_shape, every value they may have
+        been edited to is journaled, and the shapes come back deselected.
+        """
+        self.shapes.put(rows, shapes)
+        self.shapes.selected[rows] = False
+        self.spatial_index.insert_rows(self.shapes, rows)
+
+        for operation in (Operation.INSERT, Operation.MOVE, Operation.RESIZE, Operation.ROTATE, Operation.RECOLOR):
+            self.journal.record_rows(operation, self.shapes, rows)
+
+        self.invalidate()
+
+    def _remove_rows(self, rows: np.ndarray) -> ShapeStore:
+        """
+        Takes many shapes out of the canvas at once
+
+        Returns:
+            ShapeStore: The removed shapes, for undo to put back.
+        """
+        # replayed top first, so every record still points at the row it was written for
+        self.journal.record_rows(Operation.DELETE, self.shapes, rows[::-1])
+        removed: ShapeStore = self.shapes.take(rows)
+        self.spatial_index.remove_rows(self.shapes, rows)
+
+        self.invalidate()
+        return removed
+
+    def _remove_shape(self, shape: Type[Shape]) -> None:
+        """
+        Takes a shape out of the canvas, deselecting it first
+        """
+        shape.selected = False
+        self.journal.record(Operation.DELETE, shape)
+        row: int = shape.row
+        self.shapes.remove(shape)
+        self.spatial_index.remove_rows(self.shapes, np.array([row]))
+        self.invalidate()
+
+    def undo(self) -> None:
+        """
+        Reverts the latest change made to the shapes of the canvas
+        """
+        change: Change | None = self.history.undo()
+
+        if change is None:
+            CTkToast.toast('Nothing to undo')
+            return
+
+        if change.operation == Operation.INSERT:
+            self._remove_shape(change.shape)
+
+        elif change.operation == Operation.DELETE:
+            self._add_rows(change.before, change.shape)
+
+        else:
+            restore(change.operation, self.shapes, change.shape, change.before)
+            self.rows_changed(change.shape, change.operation)
+
+    def redo(self) -> None:
+        """
+        Applies again the latest change reverted by undo
+        """
+        change: Change | None = self.history.redo()
+
+        if change is None:
+            CTkToast.toast('Nothing to redo')
+            return
+
+        if change.operation == Operation.INSERT:
+            self._add_shape(change.shape, change.after)
+
+        elif change.operation == Operation.DELETE:
+            change.shape = self._remove_rows(change.before)
+
+        else:
+            restore(change.operation, self.shapes, change.shape, change.after)
+            self.rows_changed(change.shape, change.operation)
+
+    def set_shapes(self, shapes: ShapeStore | List[Type[Shape]], autosave: bool = True) -> None:
+        """
+        Replaces every shape in the canvas. Shapes given as a list are moved into a new store
+
+        Args:
+            shapes (ShapeStore | List[Type[Shape]]): The new shapes.
+            autosave (bool): Whether to snapshot the new shapes into the autosave right away.
+        """
+        self.shapes = shapes if isinstance(shapes, ShapeStore) else ShapeStore(shapes)
+        self.spatial_index.rebuild(self.shapes)
+
+        # the history refers to the shapes being replaced
+        self.history.clear()
+
+        if autosave:
+            self.journal.compact(self.shapes)
+
+        self.invalidate()
+
+    def begin_import(self) -> None:
+        """
+        Empties the canvas before shapes are streamed into it with append_shapes. The shapes and history it
+        had are kept aside until finish_import, which puts them back if the import failed.
+        Edits aren't journaled until finish_import, whose snapshot includes them.
+        """
+        self.replaced_scene = (self.shapes, self.history)
+        self.history = History(HISTORY_MEMORY_LIMIT)
+        self.set_shapes(ShapeStore(), autosave=False)
+        self.journal.suspend()
+
+    def append_shapes(self, shapes: ShapeStore) -> None:
+        """
+        Moves a chunk of shapes on top of the canvas
+
+        Args:
+            shapes (ShapeStore): The chunk, left empty afterwards.
+        """
+        first: int = len(self.shapes)
+        self.shapes.extend_store(shapes)
+        self.spatial_index.insert_rows(self.shapes, np.arange(first, len(self.shapes)))
+
+        self.invalidate()
+
+    def finish_import(self, imported: bool = True) -> None:
+        """
+        Snapshots the streamed shapes into the autosave and resumes journaling. When the import failed, the
+        shapes and history the canvas had before are put back instead, and the autosave, which still holds
+        them, carries on where it stopped.
+
+        Args:
+            imported (bool): Whether every shape of the file was read.
+        """
+        shapes, history = self.replaced_scene
+        self.replaced_scene = None
+
+        if imported:
+            self.journal.compact(self.shapes)
+            return
+
+        self.set_shapes(shapes, autosave=False)
+        self.history = history
+        self.journal.resume()
+
+    def recover_autosave(self) -> bool:
+        """
+        Restores the shapes of a session that didn't exit cleanly. An autosave that can't be read is
+        set aside instead, so it doesn't stop the app from starting every time.
+
+        Returns:
+            bool: Whether any shape was recovered.
+        """
+        try:
+            shapes: ShapeStore | None = self.journal.recover()
+        except (OSError, ValueError) as error:
+            self.journal.set_aside()
+            CTkToast.toast(f'The unsaved work of the last session could not be recovered: {error}. Its files were renamed to .corrupt')
+            return False
+
+        if not shapes:
+            return False
+
+        self.set_shapes(shapes, autosave=False)
+        return True
+
+    def _flush_journal(self) -> None:
+        """
+        Periodically writes the buffered edits to disk, compacting the journal when it grew too long
+        """
+        if self.journal.needs_compaction():
+            self.journal.compact(self.shapes)
+        else:
+            self.journal.flush()
+
+        self.after(JOURNAL_FLUSH_INTERVAL, self._flush_journal)
@@ -0,0 +1,171 @@
+from typing import Dict, Iterator, List, TextIO, Tuple
+from collections import deque
+from contextlib import contextmanager
+from time import perf_counter
+from os import path
+import csv
+
+type FRAME = Dict[str, float]
+
+PHASES: Tuple[str, ...] = ('setup', 'shapes', 'selection', 'drag')
+COUNTERS: Tuple[str, ...] = ('shapes_drawn', 'culled', 'vertices', 'gl_calls')
+CSV_FIELDS: Tuple[str, ...] = ('time', 'total', *PHASES, *COUNTERS)
+
+class FrameStats:
+    """
+    Per-frame timings and counters of the canvas, kept for the last ROLLING_FRAMES frames.
+
+    A frame is timed between begin_frame and end_frame. Code run inside a phase is timed under the
+    phase's name, minus the time spent in phases nested in it, so the phases of a frame add up to
+    at most its total. Renderers add the shapes they draw and cull, and the vertices and GL calls they submit, with count.
+
+    Attributes:
+        frames (deque[FRAME]): The latest frames, oldest first. Times are in seconds.
+        csv_file (TextIO | None): Where every finished frame is appended, when set with start_csv.
+    """
+
+    ROLLING_FRAMES: int = 240
+
+    def __init__(self) -> None:
+        self.frames: deque[FRAME] = deque(maxlen=self.ROLLING_FRAMES)
+        self.current: FRAME | None = None
+        self.frame_start: float = 0
+
+        # start time and time spent in nested phases, for each phase being timed
+        self.open_phases: List[List[float]] = []
+
+        self.csv_file: TextIO | None = None
+        self.csv_writer: csv.DictWriter | None = None
+
+    # Recording
+
+    def begin_frame(self) -> None:
+        self.frame_start = perf_counter()
+        self.current = {'time': self.frame_start, **{name: 0.0 for name in PHASES}, **{name: 0 for name in COUNTERS}}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Times the code of a with block under a phase of the current frame.
+
+        Args:
+            name (str): One of PHASES.
+        """
+        timing: List[float] = [perf_counter(), 0.0]
+        self.open_phases.append(timing)
+
+        try:
+            yield
+        finally:
+            self.open_phases.pop()
+            elapsed: float = perf_counter() - timing[0]
+
+            if self.current is not None:
+                self.current[name] += elapsed - timing[1]
+
+            if self.open_phases:
+                self.open_phases[-1][1] += elapsed
+
+    def count(self, shapes_drawn: int = 0, vertices: int = 0, gl_calls: int = 0, culled: int = 0) -> None:
+        """
+        Adds to the counters of the current frame.
+        """
+        if self.current is None:
+            return
+
+        self.current['shapes_drawn'] += shapes_drawn
+        self.current['culled'] += culled
+        self.current['vertices'] += vertices
+        self.current['gl_calls'] += gl_calls
+
+    def end_frame(self) -> None:
+        if self.current is None:
+            return
+
+        self.current['total'] = perf_counter() - self.frame_start
+        self.frames.append(self.current)
+
+        if self.csv_writer is not None:
+            self.csv_writer.writerow(self.current)
+
+        self.current = None
+
+    # Queries
+
+    def latest(self) -> FRAME | None:
+        """
+        Returns the last finished frame.
+        """
+        return self.frames[-1] if self.frames else None
+
+    def fps(self) -> float:
+        """
+        Returns how many frames per second were drawn over the rolling window.
+        """
+        if len(self.frames) < 2:
+            return 0.0
+
+        elapsed: float = self.frames[-1]['time'] - self.frames[0]['time']
+        return (len(self.frames) - 1) / elapsed if elapsed > 0 else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """
+        Returns a percentile of the frame times over the rolling window, in seconds.
+
+        Args:
+            percent (float): From 0 to 100, for example 99 for the p99 frame time.
+        """
+        if not self.frames:
+            return 0.0
+
+        totals: List[float] = sorted(frame['total'] for frame in self.frames)
+        return totals[min(len(totals) - 1, round(percent / 100 * (len(totals) - 1)))]
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Returns the rolling FPS, the p50 and p99 frame times and the phases and counters of the last frame.
+        Times are in milliseconds.
+        """
+        latest: FRAME = self.latest() or {name: 0.0 for name in (*PHASES, *COUNTERS)}
+
+        return {
+            'fps': self.fps(),
+            'p50_ms': self.percentile(50) * 1000,
+            'p99_ms': self.percentile(99) * 1000,
+            **{f'{name}_ms': latest[name] * 1000 for name in PHASES},
+            **{name: int(latest[name]) for name in COUNTERS},
+        }
+
+    def overlay_text(self) -> str:
+        stats: Dict[str, float] = self.summary()
+
+        return (
+            f"{stats['fps']:.0f} fps  p50 {stats['p50_ms']:.1f} ms  p99 {stats['p99_ms']:.1f} ms\n"
+            + '  '.join(f"{name} {stats[f'{name}_ms']:.1f}" for name in PHASES) + ' ms\n'
+            + f"{stats['shapes_drawn']:,} shapes  {stats['culled']:,} culled  {stats['vertices']:,} vertices  {stats['gl_calls']:,} GL calls"
+        )
+
+    # CSV
+
+    def start_csv(self, file_path: str) -> None:
+        """
+        Appends every frame finished from now on to a CSV file, writing the header when the file is new.
+
+        Args:
+            file_path (str): The CSV file.
+        """
+        self.stop_csv()
+
+        is_new: bool = not path.exists(file_path) or path.getsize(file_path) == 0
+        self.csv_file = open(file_path, 'a', newline='')
+        self.csv_writer = csv.DictWriter(self.csv_file, fieldnames=CSV_FIELDS)
+
+        if is_new:
+            self.csv_writer.writeheader()
+
+    def stop_csv(self) -> None:
+        if self.csv_file is not None:
+            self.csv_file.close()
+
+        self.csv_file = None
+        self.csv_writer = None
@@ -6,12 +6,9 @@ from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from Buttons.ShapeButton import ShapeButton
-    from Shapes.Shape import Shape
 
 # start of code
-from typing import Type
 
 class Global:
 
     clicked_button: ShapeButton = None
-    shape: Type[Shape] = None
\ No newline at end of file
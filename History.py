@@ -0,0 +1,174 @@
+# for type checking purposes.
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from Shapes.Shape import Shape
+
+# start of code
+from typing import Any, Deque, Dict, List, Tuple, Type
+from collections import deque
+from time import perf_counter
+import numpy as np
+
+from Journal import Operation
+from Shapes.ShapeStore import ShapeStore
+
+# the store columns each operation changes, which is all an undo entry has to remember
+CHANGED_COLUMNS: Dict[Operation, Tuple[str, ...]] = {
+    Operation.MOVE: ('center',),
+    Operation.RESIZE: ('end', 'half_size'),
+    Operation.ROTATE: ('angle',),
+    Operation.RECOLOR: ('background_color',),
+}
+
+# operations sent once per key repeat, merged into one entry while the same shapes keep changing
+MERGED_OPERATIONS: Tuple[Operation, ...] = (Operation.MOVE, Operation.RESIZE, Operation.ROTATE)
+
+def capture(operation: Operation, shapes: ShapeStore, rows: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    Returns a copy of the values an operation changes, for the given rows.
+    """
+    return tuple(shapes.columns[name][rows] for name in CHANGED_COLUMNS[operation])
+
+def restore(operation: Operation, shapes: ShapeStore, rows: np.ndarray, values: Tuple[np.ndarray, ...]) -> None:
+    """
+    Sets back the values returned by capture.
+    """
+    for name, value in zip(CHANGED_COLUMNS[operation], values):
+        shapes.columns[name][rows] = value
+
+def same_target(first: Any, second: Any) -> bool:
+    """
+    Whether two changes were made to the same shape, or to the same rows.
+    """
+    if isinstance(first, np.ndarray) and isinstance(second, np.ndarray):
+        return np.array_equal(first, second)
+
+    return first is second
+
+class Change:
+    """
+    One reversible edit, holding only what it needs to be reverted and applied again:
+
+    - edits keep the rows they changed and the changed columns of those rows before and after;
+    - inserts keep the shape and the row it was inserted at;
+    - deletes keep the store of the removed shapes and the rows they were removed from.
+
+    Rows stay valid since changes are undone and redone in order, each against the scene it left.
+    """
+
+    __slots__ = ('operation', 'shape', 'before', 'after', 'time', 'size')
+
+    # rough memory footprints, used to enforce the limit of the history
+    EDIT_BYTES: int = 256
+    SHAPE_BYTES: int = 2048
+
+    def __init__(self, operation: Operation, shape: Type[Shape] | ShapeStore | np.ndarray, before: Any, after: Any) -> None:
+        self.operation: Operation = operation
+        self.shape: Type[Shape] | ShapeStore | np.ndarray = shape
+        self.before: Any = before
+        self.after: Any = after
+        self.time: float = perf_counter()
+
+        # removed shapes keep a store alive for as long as their entry
+        if operation in CHANGED_COLUMNS:
+            self.size: int = self.EDIT_BYTES + shape.nbytes + sum(value.nbytes for value in (*before, *after))
+        else:
+            self.size = self.SHAPE_BYTES * (len(shape) if isinstance(shape, ShapeStore) else 1)
+
+class History:
+    """
+    Undo and redo stacks of small reversible deltas instead of scene snapshots, so an undo step
+    costs the same whatever the size of the scene.
+
+    The entries are kept under memory_limit bytes by evicting the oldest undo entries.
+    Consecutive key-repeat edits of the same shapes are merged into a single entry.
+
+    Attributes:
+        memory_limit (int): The most bytes the entries may use, estimated with Change.size.
+        size (int): The bytes used by the entries of both stacks.
+        undo_stack (Deque[Change]): The changes that can be undone, oldest first.
+        redo_stack (List[Change]): The changes that can be redone, most recently undone last.
+    """
+
+    MERGE_WINDOW: float = 0.5
+
+    def __init__(self, memory_limit: int) -> None:
+        """
+        Args:
+            memory_limit (int): The most bytes the entries may use.
+        """
+        self.memory_limit: int = memory_limit
+        self.size: int = 0
+        self.undo_stack: Deque[Change] = deque()
+        self.redo_stack: List[Change] = []
+
+    def record(self, operation: Operation, shape: Type[Shape] | ShapeStore | np.ndarray, before: Any, after: Any) -> None:
+        """
+        Adds a change on top of the undo stack and forgets everything that could be redone.
+
+        Args:
+            operation (Operation): What was done to the shape.
+            shape (Type[Shape] | ShapeStore | np.ndarray): The rows edited, the shape inserted or the shapes deleted.
+            before (Any): The result of capture before an edit, or the rows of the deleted shapes.
+            after (Any): The result of capture after an edit, or the row of the inserted shape.
+        """
+        for change in self.redo_stack:
+            self.size -= change.size
+
+        self.redo_stack.clear()
+
+        last: Change | None = self.undo_stack[-1] if self.undo_stack else None
+
+        if (
+            last is not None and operation in MERGED_OPERATIONS and last.operation == operation
+            and same_target(last.shape, shape) and perf_counter() - last.time < self.MERGE_WINDOW
+        ):
+            last.after = after
+            last.time = perf_counter()
+            return
+
+        change: Change = Change(operation, shape, before, after)
+        self.undo_stack.append(change)
+        self.size += change.size
+
+        while self.size > self.memory_limit and len(self.undo_stack) > 1:
+            self.size -= self.undo_stack.popleft().size
+
+    def undo(self) -> Change | None:
+        """
+        Moves the latest change to the redo stack and returns it, for the caller to revert.
+        """
+        if not self.undo_stack:
+            return None
+
+        change: Change = self.undo_stack.pop()
+        self.redo_stack.append(change)
+
+        # the next edit must not merge into the change now on top
+        if self.undo_stack:
+            self.undo_stack[-1].time = 0
+
+        return change
+
+    def redo(self) -> Change | None:
+        """
+        Moves the latest undone change back to the undo stack and returns it, for the caller to apply again.
+        """
+        if not self.redo_stack:
+            return None
+
+        change: Change = self.redo_stack.pop()
+
+        # edits made after a redo start an entry of their own
+        change.time = 0
+        self.undo_stack.append(change)
+        return change
+
+    def clear(self) -> None:
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.size = 0
@@ -0,0 +1,144 @@
+from typing import Dict, List, Tuple
+from customtkinter import CTkImage
+from PIL import Image
+from os import path
+import json
+import os
+
+from constants import ICON_DIRECTORY, CACHE_DIRECTORY
+
+# icons are scaled down to this many pixels per side when packed, enough for 25px buttons on 4x displays
+ICON_RESOLUTION: int = 100
+ICON_EXTENSION: str = '.PNG'
+
+ATLAS_PATH: str = path.join(CACHE_DIRECTORY, 'icon_atlas.png')
+INDEX_PATH: str = path.join(CACHE_DIRECTORY, 'icon_atlas.json')
+
+type SOURCES = Dict[str, int]
+type CELL = Tuple[int, int, int, int]
+
+class IconAtlas:
+    """
+    Every toolbar icon packed side by side into one image, so the toolbar is built with a single decode.
+
+    The atlas and its index are cached in CACHE_DIRECTORY and rebuilt when an icon is added, removed or
+    modified, which is detected from the modification times of the files in ICON_DIRECTORY. When the cache
+    can't be written, the atlas built in memory is used as is. Icons are looked up by name, ignoring case,
+    and the CTkImage of each icon is created once and shared by every button showing it.
+    """
+
+    instance: 'IconAtlas | None' = None
+
+    @staticmethod
+    def get_instance() -> 'IconAtlas':
+        if IconAtlas.instance is None:
+            IconAtlas.instance = IconAtlas()
+
+        return IconAtlas.instance
+
+    @staticmethod
+    def icon(name: str, size: Tuple[int, int] = (25, 25)) -> CTkImage:
+        """
+        Returns the shared CTkImage of an icon.
+
+        Args:
+            name (str): The file name of the icon without its extension, in any case.
+            size (Tuple[int, int]): The size of the icon on screen.
+
+        Raises:
+            KeyError: When there is no icon with that name.
+        """
+        atlas: IconAtlas = IconAtlas.get_instance()
+        key: Tuple[str, Tuple[int, int]] = (name.lower(), size)
+        image: CTkImage | None = atlas.images.get(key)
+
+        if image is None:
+            x, y, width, height = atlas.cells[name.lower()]
+            icon: Image.Image = atlas.image.crop((x, y, x + width, y + height))
+            image = CTkImage(size=size, light_image=icon, dark_image=icon)
+            atlas.images[key] = image
+
+        return image
+
+    def __init__(self) -> None:
+        self.images: Dict[Tuple[str, Tuple[int, int]], CTkImage] = {}
+
+        sources: SOURCES = self.sources()
+        cached: Tuple[Image.Image, Dict[str, CELL]] | None = self.read_cache(sources)
+
+        if cached is None:
+            cached = self.build(sources)
+            self.write_cache(sources, *cached)
+
+        self.image: Image.Image = cached[0]
+        self.cells: Dict[str, CELL] = cached[1]
+
+    def sources(self) -> SOURCES:
+        """
+        Returns the modification time of each icon file, by lowercase name.
+        """
+        return {
+            file_name[:-len(ICON_EXTENSION)].lower(): os.stat(path.join(ICON_DIRECTORY, file_name)).st_mtime_ns
+            for file_name in sorted(os.listdir(ICON_DIRECTORY)) if file_name.endswith(ICON_EXTENSION)
+        }
+
+    def read_cache(self, sources: SOURCES) -> Tuple[Image.Image, Dict[str, CELL]] | None:
+        """
+        Loads the cached atlas, or returns None when it is missing or older than the icons.
+        """
+        try:
+            with open(INDEX_PATH) as file:
+                index: dict = json.load(file)
+
+            if index['sources'] != sources:
+                return None
+
+            image: Image.Image = Image.open(ATLAS_PATH)
+            image.load()
+        except (OSError, ValueError, KeyError):
+            return None
+
+        return image, {name: tuple(cell) for name, cell in index['cells'].items()}
+
+    def build(self, sources: SOURCES) -> Tuple[Image.Image, Dict[str, CELL]]:
+        """
+        Decodes every icon, scales it to ICON_RESOLUTION and packs them in one row.
+        """
+        names: List[str] = list(sources)
+        image: Image.Image = Image.new('RGBA', (ICON_RESOLUTION * max(1, len(names)), ICON_RESOLUTION))
+        cells: Dict[str, CELL] = {}
+
+        for file_name in os.listdir(ICON_DIRECTORY):
+            name: str = file_name[:-len(ICON_EXTENSION)].lower()
+
+            if name not in sources or not file_name.endswith(ICON_EXTENSION):
+                continue
+
+            x: int = names.index(name) * ICON_RESOLUTION
+
+            with Image.open(path.join(ICON_DIRECTORY, file_name)) as icon:
+                icon = icon.convert('RGBA')
+                icon.thumbnail((ICON_RESOLUTION, ICON_RESOLUTION), Image.LANCZOS)
+
+            image.paste(icon, (x, 0))
+            cells[name] = (x, 0, icon.width, icon.height)
+
+        return image, cells
+
+    def write_cache(self, sources: SOURCES, image: Image.Image, cells: Dict[str, CELL]) -> None:
+        """
+        Saves the atlas and its index, the index last so a partial write is never mistaken for a valid cache.
+        Read-only locations are ignored, the atlas is then rebuilt on the next start.
+        """
+        try:
+            os.makedirs(CACHE_DIRECTORY, exist_ok=True)
+
+            image.save(ATLAS_PATH + '.tmp', format='PNG')
+            os.replace(ATLAS_PATH + '.tmp', ATLAS_PATH)
+
+            with open(INDEX_PATH + '.tmp', 'w') as file:
+                json.dump({'sources': sources, 'cells': cells}, file)
+
+            os.replace(INDEX_PATH + '.tmp', INDEX_PATH)
+        except OSError:
+            pass
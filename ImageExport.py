@@ -0,0 +1,238 @@
+from typing import BinaryIO, Iterator, List
+from OpenGL.GL import *
+import numpy as np
+import struct
+import zlib
+
+from Renderers.Manager import renderers, DEFAULT_RENDERER
+from Renderers.Renderer import Renderer
+from Shapes.ShapeStore import ShapeStore
+from FrameStats import FrameStats
+from Background import PROGRESS
+from Save import atomic_open
+from custom_types import RECTANGLE
+
+PNG_SIGNATURE: bytes = b'\x89PNG\r\n\x1a\n'
+PNG_COMPRESSION: int = 6
+
+# compressed bytes gathered before an IDAT chunk is written
+PNG_CHUNK: int = 1 << 20
+
+# the width and height of the offscreen framebuffer tiles are drawn in
+TILE_SIZE: int = 1024
+
+class PngWriter:
+    """
+    Writes an 8-bit RGB PNG row by row, compressing the rows as they come so the image is never held whole.
+
+    Every row uses the Sub filter, which stores each byte as its difference with the same channel of the
+    pixel on its left, so the flat areas of a drawing compress to almost nothing.
+
+    Attributes:
+        width (int): The width of the image in pixels.
+        height (int): The height of the image in pixels.
+        rows_written (int): How many rows were written so far.
+    """
+
+    def __init__(self, file: BinaryIO, width: int, height: int, compression: int = PNG_COMPRESSION) -> None:
+        """
+        Writes the signature and header of the image.
+
+        Args:
+            file (BinaryIO): The file to write to, opened in binary mode.
+            width (int): The width of the image in pixels.
+            height (int): The height of the image in pixels.
+            compression (int): The zlib level, from 0 to 9.
+        """
+        self.file: BinaryIO = file
+        self.width: int = width
+        self.height: int = height
+        self.rows_written: int = 0
+
+        self.compressor = zlib.compressobj(compression)
+        self.pending: List[bytes] = []
+        self.pending_size: int = 0
+
+        file.write(PNG_SIGNATURE)
+        self._chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+
+    def write_rows(self, rows: np.ndarray) -> None:
+        """
+        Appends rows to the image.
+
+        Args:
+            rows (np.ndarray): The rows as uint8 of shape (count, width, 3), top to bottom.
+        """
+        if rows.shape[1:] != (self.width, 3):
+            raise ValueError(f'Rows must have the shape (count, {self.width}, 3), not {rows.shape}')
+
+        if self.rows_written + len(rows) > self.height:
+            raise ValueError(f'The image is only {self.height} rows high')
+
+        flat: np.ndarray = rows.reshape(len(rows), -1)
+        filtered: np.ndarray = np.empty((len(rows), 1 + flat.shape[1]), dtype=np.uint8)
+        filtered[:, 0] = 1
+        filtered[:, 1:4] = flat[:, :3]
+        np.subtract(flat[:, 3:], flat[:, :-3], out=filtered[:, 4:])
+
+        self._compressed(self.compressor.compress(filtered.data))
+        self.rows_written += len(rows)
+
+    def close(self) -> None:
+        """
+        Writes the last of the compressed data and the end of the image. The file itself is left open.
+        """
+        if self.rows_written != self.height:
+            raise ValueError(f'Only {self.rows_written} of the {self.height} rows of the image were written')
+
+        self._compressed(self.compressor.flush())
+        self._write_pending()
+        self._chunk(b'IEND', b'')
+
+    def _compressed(self, data: bytes) -> None:
+        self.pending.append(data)
+        self.pending_size += len(data)
+
+        if self.pending_size >= PNG_CHUNK:
+            self._write_pending()
+
+    def _write_pending(self) -> None:
+        if self.pending:
+            self._chunk(b'IDAT', b''.join(self.pending))
+
+        self.pending = []
+        self.pending_size = 0
+
+    def _chunk(self, kind: bytes, data: bytes) -> None:
+        self.file.write(struct.pack('>I', len(data)))
+        self.file.write(kind)
+        self.file.write(data)
+        self.file.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(kind))))
+
+def fit_view(bounds: RECTANGLE, width: int, height: int) -> RECTANGLE:
+    """
+    Grows a world rectangle around its center to the aspect ratio of an image, so shapes aren't stretched.
+
+    Args:
+        bounds (RECTANGLE): The world rectangle that must be shown, as left, top, right, bottom.
+        width (int): The width of the image in pixels.
+        height (int): The height of the image in pixels.
+
+    Returns:
+        RECTANGLE: The world rectangle the image shows.
+    """
+    left, top, right, bottom = bounds
+    center_x, center_y = (left + right) / 2, (top + bottom) / 2
+
+    # world units per pixel, at least one way or the other
+    unit: float = max((right - left) / width, (bottom - top) / height) or 1.0
+    return center_x - width * unit / 2, center_y - height * unit / 2, center_x + width * unit / 2, center_y + height * unit / 2
+
+def render_png(file_path: str, shapes: ShapeStore, width: int, height: int, view: RECTANGLE, renderer: str = DEFAULT_RENDERER, tile_size: int = TILE_SIZE) -> Iterator[float]:
+    """
+    Draws a world rectangle into a PNG of any size with the current OpenGL context, one band of tiles at a time.
+
+    Tiles are drawn by a renderer of their own in an offscreen framebuffer, through Renderer.draw_frame like the
+    canvas, with the world rectangle of the tile as the view, so the image matches the screen. Each band of tiles
+    is read back and streamed to the file, so only tile_size rows of the image are in memory at once. Selection
+    borders aren't drawn.
+
+    Between bands the default framebuffer and the viewport are restored, so the Tk canvas can draw while an
+    export runs one band per idle tick of its context. The image replaces file_path once the last band is written;
+    closing the generator early leaves any previous file in place.
+
+    Args:
+        file_path (str): The PNG file to write.
+        shapes (ShapeStore): The shapes to draw.
+        width (int): The width of the image in pixels.
+        height (int): The height of the image in pixels.
+        view (RECTANGLE): The world rectangle the image shows, as left, top, right, bottom.
+        renderer (str): The name of the renderer drawing the tiles (see Renderers.Manager).
+        tile_size (int): The largest tile, clamped to what the OpenGL implementation supports.
+
+    Yields:
+        float: The fraction of the image written after each band.
+    """
+    if shapes.selected.any():
+        shapes = shapes.snapshot()
+        shapes.select(None)
+
+    tile_size = min(tile_size, int(glGetIntegerv(GL_MAX_RENDERBUFFER_SIZE)))
+    left, top, right, bottom = view
+    unit_x: float = (right - left) / width
+    unit_y: float = (bottom - top) / height
+
+    drawer: Renderer = renderers()[renderer]()
+    stats: FrameStats = FrameStats()
+
+    framebuffer: int = glGenFramebuffers(1)
+    color_buffer: int = glGenRenderbuffers(1)
+
+    try:
+        glBindRenderbuffer(GL_RENDERBUFFER, color_buffer)
+        glRenderbufferStorage(GL_RENDERBUFFER, GL_RGBA8, tile_size, tile_size)
+        glBindRenderbuffer(GL_RENDERBUFFER, 0)
+
+        glBindFramebuffer(GL_FRAMEBUFFER, framebuffer)
+        glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_RENDERBUFFER, color_buffer)
+        status: int = glCheckFramebufferStatus(GL_FRAMEBUFFER)
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+
+        if status != GL_FRAMEBUFFER_COMPLETE:
+            raise RuntimeError(f'The offscreen framebuffer is incomplete (status {status:#x})')
+
+        with atomic_open(file_path) as file:
+            writer: PngWriter = PngWriter(file, width, height)
+
+            for band_top in range(0, height, tile_size):
+                band_height: int = min(tile_size, height - band_top)
+                band: np.ndarray = np.empty((band_height, width, 3), dtype=np.uint8)
+                viewport: np.ndarray = glGetIntegerv(GL_VIEWPORT)
+
+                glBindFramebuffer(GL_FRAMEBUFFER, framebuffer)
+                glPixelStorei(GL_PACK_ALIGNMENT, 1)
+
+                for tile_left in range(0, width, tile_size):
+                    tile_width: int = min(tile_size, width - tile_left)
+                    tile_view: RECTANGLE = (
+                        left + tile_left * unit_x, top + band_top * unit_y,
+                        left + (tile_left + tile_width) * unit_x, top + (band_top + band_height) * unit_y
+                    )
+
+                    glViewport(0, 0, tile_width, band_height)
+                    drawer.draw_frame(shapes, tile_width, band_height, stats, tile_view)
+
+                    # OpenGL reads from the bottom row up
+                    pixels: bytes = glReadPixels(0, 0, tile_width, band_height, GL_RGB, GL_UNSIGNED_BYTE)
+                    band[:, tile_left:tile_left + tile_width] = np.frombuffer(pixels, dtype=np.uint8).reshape(band_height, tile_width, 3)[::-1]
+
+                glBindFramebuffer(GL_FRAMEBUFFER, 0)
+                glViewport(*viewport)
+
+                writer.write_rows(band)
+                yield (band_top + band_height) / height
+
+            writer.close()
+    finally:
+        drawer.release()
+        glDeleteRenderbuffers(1, [color_buffer])
+        glDeleteFramebuffers(1, [framebuffer])
+
+def write_png(file_path: str, shapes: ShapeStore, width: int, height: int, view: RECTANGLE | None = None, renderer: str = DEFAULT_RENDERER, progress: PROGRESS | None = None) -> None:
+    """
+    Draws shapes into a PNG with the current OpenGL context, such as an Offscreen.OffscreenContext, see render_png.
+
+    Args:
+        file_path (str): The PNG file to write.
+        shapes (ShapeStore): The shapes to draw.
+        width (int): The width of the image in pixels.
+        height (int): The height of the image in pixels.
+        view (RECTANGLE | None): The world rectangle the image shows. Defaults to every shape, fitted to the image.
+        renderer (str): The name of the renderer drawing the tiles.
+        progress (PROGRESS | None): Called with the fraction of the image written so far.
+    """
+    view = view or fit_view(shapes.bounds() or (0, 0, width, height), width, height)
+
+    for fraction in render_png(file_path, shapes, width, height, view, renderer):
+        if progress:
+            progress(fraction)
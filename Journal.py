@@ -0,0 +1,557 @@
+# for type checking purposes.
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from Shapes.Shape import Shape
+
+# start of code
+from typing import BinaryIO, Dict, List, Set, Type
+from enum import IntEnum
+from os import path
+import tempfile
+import struct
+import os
+import re
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+import numpy as np
+
+from Shapes.Manager import shapes as shape_classes
+from Shapes.ShapeStore import ShapeStore
+from Save import write_dsd, read_dsd
+
+class Operation(IntEnum):
+    INSERT = 1
+    MOVE = 2
+    RESIZE = 3
+    ROTATE = 4
+    RECOLOR = 5
+    DELETE = 6
+
+# journal layout (little endian):
+#   header   magic, version, generation, size of the kind table, then the kind table itself
+#   records  RECORD_SIZE bytes each: operation, kind, row and four values whose meaning depends on the operation
+JOURNAL_MAGIC: bytes = b'DSDJ'
+JOURNAL_VERSION: int = 1
+HEADER: struct.Struct = struct.Struct('<4sHxxII')
+RECORD: struct.Struct = struct.Struct('<BBxxIdddd')
+
+# the same layout as RECORD, to pack the records of a bulk edit at once
+RECORD_DTYPE: np.dtype = np.dtype([('operation', '<u1'), ('kind', '<u1'), ('padding', 'V2'), ('row', '<u4'), ('values', '<f8', (4,))])
+
+# every running app keeps its autosave in a session directory of its own, locked for as long as it runs
+SESSION_PREFIX: str = 'session-'
+LOCK_FILE_NAME: str = 'session.lock'
+
+def lock_session(directory: str) -> BinaryIO | None:
+    """
+    Takes the lock of a session directory. The operating system releases it when its owner exits, crashed or not.
+
+    Args:
+        directory (str): The session directory.
+
+    Returns:
+        BinaryIO | None: The open lock file, which holds the lock until it is closed, or None when another process holds it.
+    """
+    file: BinaryIO = open(path.join(directory, LOCK_FILE_NAME), 'a+b')
+
+    try:
+        if os.name == 'nt':
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        file.close()
+        return None
+
+    return file
+
+class Journal:
+    """
+    Crash-safe autosave made of a snapshot and an append-only log of the edits made since.
+
+    Each edit is one fixed-size record, buffered in memory and written with a single fsync per batch.
+    Once the log holds COMPACT_RECORDS records it is folded into a new .dsd snapshot. Snapshots and logs
+    are numbered by generation: a new snapshot is fully written before the log of its generation is
+    started and the older files are deleted, so a crash at any point leaves a consistent pair behind.
+
+    The files live in a session directory under the autosave root, claimed on first write and locked until
+    discard, so several running apps never touch each other's files. recover only adopts the directory
+    of a session whose app is no longer running.
+
+    Attributes:
+        root (str): The directory holding the session directories.
+        directory (str | None): The session directory of this journal, None until it is claimed.
+        lock (BinaryIO | None): The open lock file of the session directory.
+        generation (int): The generation of the current snapshot and log.
+        pending (List[bytes]): Records not written to disk yet.
+        records (int): Records in the current log, written or not.
+        kinds (List[str]): The shape class names, indexed by the kind field of the records.
+        suspended (bool): Whether edits are ignored, for when the next compact will capture them anyway.
+    """
+
+    BATCH_RECORDS: int = 256
+    COMPACT_RECORDS: int = 4096
+
+    def __init__(self, root: str) -> None:
+        """
+        Args:
+            root (str): The directory holding the session directories. It is created on first write.
+        """
+        self.root: str = root
+        self.directory: str | None = None
+        self.lock: BinaryIO | None = None
+        self.generation: int = 0
+        self.pending: List[bytes] = []
+        self.records: int = 0
+        self.suspended: bool = False
+        self.file: BinaryIO | None = None
+        self.kinds: List[str] = list(shape_classes())
+        self.kind_codes: Dict[str, int] = {name: code for code, name in enumerate(self.kinds)}
+
+    # Paths
+
+    def snapshot_path(self, generation: int) -> str:
+        return path.join(self.directory, f'autosave-{generation}.dsd')
+
+    def log_path(self, generation: int) -> str:
+        return path.join(self.directory, f'autosave-{generation}.journal')
+
+    def generations(self, directory: str | None = None) -> List[int]:
+        """
+        Returns the generations of the autosave files on disk, oldest first.
+
+        Args:
+            directory (str | None): The session directory to look in, the one of this journal by default.
+        """
+        directory = directory or self.directory
+
+        if directory is None or not path.isdir(directory):
+            return []
+
+        found: Set[int] = set()
+
+        for file_name in os.listdir(directory):
+            match = re.fullmatch(r'autosave-(\d+)\.(dsd|journal)', file_name)
+
+            if match:
+                found.add(int(match.group(1)))
+
+        return sorted(found)
+
+    def orphaned_sessions(self) -> List[str]:
+        """
+        Returns the session directories left with autosave files by apps that are no longer running, most recently written first.
+        """
+        if not path.isdir(self.root):
+            return []
+
+        orphans: List[str] = []
+
+        for file_name in os.listdir(self.root):
+            directory: str = path.join(self.root, file_name)
+
+            if not file_name.startswith(SESSION_PREFIX) or directory == self.directory or not self.generations(directory):
+                continue
+
+            lock: BinaryIO | None = lock_session(directory)
+
+            if lock is not None:
+                lock.close()
+                orphans.append(directory)
+
+        return sorted(orphans, key=lambda directory: max(path.getmtime(entry.path) for entry in os.scandir(directory)), reverse=True)
+
+    # Sessions
+
+    def _claim(self) -> None:
+        """
+        Creates and locks the session directory of this journal, unless it already has one.
+        """
+        if self.directory is not None:
+            return
+
+        os.makedirs(self.root, exist_ok=True)
+        self.directory = tempfile.mkdtemp(prefix=SESSION_PREFIX, dir=self.root)
+        self.lock = lock_session(self.directory)
+
+    def _adopt(self, directory: str) -> bool:
+        """
+        Takes over the session directory of an app that is no longer running, dropping the one of this journal.
+
+        Returns:
+            bool: Whether it was taken over, which fails when another app adopted it first.
+        """
+        lock: BinaryIO | None = lock_session(directory)
+
+        if lock is None:
+            return False
+
+        self.discard()
+        self.directory = directory
+        self.lock = lock
+        return True
+
+    # Recording
+
+    def record(self, operation: Operation, shape: Type[Shape]) -> None:
+        """
+        Buffers the record of an edit made to a shape of the canvas. Call it before a DELETE and after anything else.
+
+        Args:
+            operation (Operation): What was done to the shape.
+            shape (Type[Shape]): The shape that was edited.
+        """
+        if self.suspended:
+            return
+
+        kind: int = 0
+        values: tuple = (0, 0, 0, 0)
+
+        if operation == Operation.INSERT:
+            kind = self.kind_codes[type(shape).__name__]
+            values = (*shape.start_coordinates, *shape.end_coordinates)
+
+        elif operation == Operation.MOVE:
+            values = (shape.center_x, shape.center_y, 0, 0)
+
+        elif operation == Operation.RESIZE:
+            values = (*shape.end_coordinates, shape.half_size, 0)
+
+        elif operation == Operation.ROTATE:
+            values = (shape.angle, 0, 0, 0)
+
+        elif operation == Operation.RECOLOR:
+            values = (*shape.background_color, 0)
+
+        self.pending.append(RECORD.pack(operation, kind, shape.row, *values))
+        self.records += 1
+
+        if len(self.pending) >= self.BATCH_RECORDS:
+            self.flush()
+
+    def record_rows(self, operation: Operation, shapes: ShapeStore, rows: np.ndarray) -> None:
+        """
+        Buffers the records of a bulk edit, one per row, packed straight from the store columns.
+        Like record, call it before a DELETE and after anything else.
+
+        Args:
+            operation (Operation): What was done to the shapes.
+            shapes (ShapeStore): The store of the canvas.
+            rows (np.ndarray): The rows that were edited, in the order the records must be replayed in.
+        """
+        if self.suspended or not len(rows):
+            return
+
+        records: np.ndarray = np.zeros(len(rows), dtype=RECORD_DTYPE)
+        records['operation'] = operation
+        records['row'] = rows
+        values: np.ndarray = records['values']
+
+        if operation == Operation.INSERT:
+            codes: np.ndarray = np.array([self.kind_codes[kind.__name__] for kind in shapes.kinds], dtype=np.uint8)
+            records['kind'] = codes[shapes.column('kind')[rows]]
+            values[:, :2] = shapes.column('start')[rows]
+            values[:, 2:] = shapes.column('end')[rows]
+
+        elif operation == Operation.MOVE:
+            values[:, :2] = shapes.centers[rows]
+
+        elif operation == Operation.RESIZE:
+            values[:, :2] = shapes.column('end')[rows]
+            values[:, 2] = shapes.half_sizes[rows]
+
+        elif operation == Operation.ROTATE:
+            values[:, 0] = shapes.angles[rows]
+
+        elif operation == Operation.RECOLOR:
+            values[:, :3] = shapes.background_colors[rows]
+
+        self.pending.append(records.tobytes())
+        self.records += len(rows)
+
+        if len(self.pending) >= self.BATCH_RECORDS or len(rows) >= self.BATCH_RECORDS:
+            self.flush()
+
+    def _open_log(self) -> BinaryIO:
+        """
+        Opens the log of the current generation for appending, writing its header when it is new.
+        """
+        if self.file is not None:
+            return self.file
+
+        self._claim()
+        log_path: str = self.log_path(self.generation)
+        is_new: bool = not path.exists(log_path) or path.getsize(log_path) == 0
+
+        self.file = open(log_path, 'ab')
+
+        if is_new:
+            kind_table: bytes = '\n'.join(self.kinds).encode('utf-8')
+            self.file.write(HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, self.generation, len(kind_table)))
+            self.file.write(kind_table)
+
+        return self.file
+
+    def flush(self) -> None:
+        """
+        Writes the buffered records and waits until they are on disk.
+        """
+        if not self.pending:
+            return
+
+        file: BinaryIO = self._open_log()
+        file.write(b''.join(self.pending))
+        file.flush()
+        os.fsync(file.fileno())
+        self.pending.clear()
+
+    def suspend(self) -> None:
+        """
+        Stops recording edits until the next compact, which snapshots them along with everything else, or resume.
+        """
+        self.suspended = True
+
+    def resume(self) -> None:
+        """
+        Records edits again without a compact, for when the shapes are back to what was last recorded.
+        """
+        self.suspended = False
+
+    def needs_compaction(self) -> bool:
+        # while suspended the shapes may not be ones worth snapshotting yet
+        return not self.suspended and self.records >= self.COMPACT_RECORDS
+
+    def compact(self, shapes: ShapeStore) -> None:
+        """
+        Replaces the snapshot and log with a snapshot of the given shapes, starting a new generation.
+
+        Args:
+            shapes (ShapeStore): The current shapes of the canvas.
+        """
+        self._claim()
+        generation: int = self.generation + 1
+        snapshot_path: str = self.snapshot_path(generation)
+        temporary_path: str = snapshot_path + '.tmp'
+
+        write_dsd(temporary_path, shapes)
+
+        with open(temporary_path, 'rb+') as file:
+            os.fsync(file.fileno())
+
+        os.replace(temporary_path, snapshot_path)
+
+        self.close()
+        self.pending.clear()
+        self.records = 0
+        self.suspended = False
+        self.generation = generation
+        self._delete_generations_before(generation)
+
+    # Recovery
+
+    def recover(self) -> ShapeStore | None:
+        """
+        Rebuilds the scene left by a session that didn't exit cleanly, adopting its session directory so this
+        journal goes on in it. Call it before anything is recorded, since the files of this journal are dropped.
+
+        Returns:
+            ShapeStore | None: The recovered shapes, or None when there is nothing to recover.
+
+        Raises:
+            ValueError: When the snapshot or the log of the latest generation is damaged. set_aside then moves them out of the way.
+        """
+        for directory in self.orphaned_sessions():
+            if self._adopt(directory):
+                break
+        else:
+            return None
+
+        generations: List[int] = self.generations()
+
+        if not generations:
+            return None
+
+        self.generation = generations[-1]
+        snapshot_path: str = self.snapshot_path(self.generation)
+        shapes: ShapeStore = ShapeStore()
+
+        if path.exists(snapshot_path):
+            shapes = read_dsd(snapshot_path)
+            # the snapshot is about to be replaced, so stop viewing its memory map
+            shapes.own_columns()
+
+        log_path: str = self.log_path(self.generation)
+
+        if path.exists(log_path):
+            self.replay(log_path, shapes)
+
+        # fold what was recovered into a fresh generation, whose log uses the current kind table
+        self.compact(shapes)
+        return shapes
+
+    def replay(self, log_path: str, shapes: ShapeStore) -> int:
+        """
+        Applies the records of a log to a store. A record cut short by a crash is ignored.
+
+        Args:
+            log_path (str): The log to replay.
+            shapes (ShapeStore): The snapshot the log was recorded against.
+
+        Returns:
+            int: The number of records applied.
+
+        Raises:
+            ValueError: When the log is damaged, names a shape class the app doesn't have or points past the shapes.
+        """
+        with open(log_path, 'rb') as file:
+            data: bytes = file.read()
+
+        if len(data) < HEADER.size:
+            return 0
+
+        magic, version, _, kind_table_size = HEADER.unpack_from(data, 0)
+
+        if magic != JOURNAL_MAGIC or version > JOURNAL_VERSION:
+            raise ValueError(f'{log_path} is not a journal this version can read')
+
+        classes: Dict[str, type] = shape_classes()
+        kinds: List[str] = data[HEADER.size:HEADER.size + kind_table_size].decode('utf-8').split('\n')
+        start: int = HEADER.size + kind_table_size
+        complete: int = (len(data) - start) // RECORD.size
+
+        # consecutive inserts at rising rows, like those of an undone bulk delete, are put back at once, and so are
+        # consecutive deletes at falling rows taken out at once, instead of shifting the shapes above once per record
+        run_operation: Operation | None = None
+        run_rows: List[int] = []
+        inserted: ShapeStore = ShapeStore()
+        count: int = len(shapes)
+
+        for number, (operation, kind, row, first, second, third, fourth) in enumerate(RECORD.iter_unpack(data[start:start + complete * RECORD.size])):
+            extends_run: bool = operation == run_operation and (row > run_rows[-1] if operation == Operation.INSERT else row < run_rows[-1])
+
+            if run_operation is not None and not extends_run:
+                self._apply_run(shapes, run_operation, run_rows, inserted)
+                run_operation, run_rows, inserted = None, [], ShapeStore()
+
+            # an insert may land right on top of the shapes, every other record needs an existing row
+            if row > count or (row == count and operation != Operation.INSERT):
+                raise ValueError(f'record {number} of {log_path} points at row {row} of {count} shapes')
+
+            if operation == Operation.INSERT:
+                if kind >= len(kinds) or kinds[kind] not in classes:
+                    raise ValueError(f'record {number} of {log_path} inserts an unknown kind of shape')
+
+                # rows below the top come from undoing a delete
+                inserted.append(classes[kinds[kind]](start_coordinates=[first, second], end_coordinates=[third, fourth]))
+                run_operation = Operation.INSERT
+                run_rows.append(row)
+                count += 1
+
+            elif operation == Operation.DELETE:
+                run_operation = Operation.DELETE
+                run_rows.append(row)
+                count -= 1
+
+            elif operation == Operation.MOVE:
+                shapes.centers[row] = (first, second)
+
+            elif operation == Operation.RESIZE:
+                shapes.column('end')[row] = (first, second)
+                shapes.half_sizes[row] = third
+
+            elif operation == Operation.ROTATE:
+                shapes.angles[row] = first
+
+            elif operation == Operation.RECOLOR:
+                shapes.background_colors[row] = (first, second, third)
+
+            else:
+                raise ValueError(f'record {number} of {log_path} has the unknown operation {operation}')
+
+        if run_operation is not None:
+            self._apply_run(shapes, run_operation, run_rows, inserted)
+
+        return complete
+
+    @staticmethod
+    def _apply_run(shapes: ShapeStore, operation: Operation, rows: List[int], inserted: ShapeStore) -> None:
+        """
+        Applies a run of insert or delete records gathered by replay with a single put or take.
+
+        Args:
+            shapes (ShapeStore): The store being replayed into.
+            operation (Operation): INSERT for rows rising from record to record, DELETE for rows falling.
+            rows (List[int]): The rows of the records, in log order.
+            inserted (ShapeStore): The shapes of the insert records, in log order.
+        """
+        if operation == Operation.INSERT:
+            shapes.put(np.array(rows), inserted)
+        else:
+            shapes.take(np.array(rows[::-1]))
+
+    def set_aside(self) -> None:
+        """
+        Renames the files of the current generation, which recover couldn't read, to .corrupt so they are
+        kept for inspection but never recovered again, and starts a fresh, empty generation after it.
+        """
+        self.close()
+
+        for damaged_path in (self.snapshot_path(self.generation), self.log_path(self.generation)):
+            if path.exists(damaged_path):
+                os.replace(damaged_path, damaged_path + '.corrupt')
+
+        self.compact(ShapeStore())
+
+    # Cleanup
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def discard(self) -> None:
+        """
+        Deletes every autosave file of this session and gives up its directory, for when the app exits cleanly.
+        Files set aside as .corrupt are kept, along with the directory holding them.
+        """
+        self.close()
+        self.pending.clear()
+        self.records = 0
+        self._delete_generations_before(None)
+        self.generation = 0
+
+        if self.directory is None:
+            return
+
+        # the lock file can only be deleted once closed on Windows, and nothing is left for another app to adopt by then
+        if self.lock is not None:
+            self.lock.close()
+            self.lock = None
+
+        os.remove(path.join(self.directory, LOCK_FILE_NAME))
+
+        if not os.listdir(self.directory):
+            os.rmdir(self.directory)
+
+        self.directory = None
+
+    def _delete_generations_before(self, generation: int | None) -> None:
+        """
+        Deletes the autosave files older than a generation, or all of them when generation is None.
+        """
+        for old_generation in self.generations():
+            if generation is not None and old_generation >= generation:
+                continue
+
+            for old_path in (self.snapshot_path(old_generation), self.log_path(old_generation)):
+                if path.exists(old_path):
+                    os.remove(old_path)
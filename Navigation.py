@@ -8,13 +8,13 @@ from Buttons.ColorPickerToggle import ColorPickerToggle
 
 if TYPE_CHECKING:
     from Program import App
+    from Tutorial import Tutorial
 
 # start of code
 from Buttons.ImportButton import ImportButton
 from Buttons.ExportButton import ExportButton
 from Buttons.ShapeButton import ShapeButton
 from customtkinter import CTkFrame, CTkButton
-from Tutorial import Tutorial
 from typing import List
 from constants import *
 
@@ -32,7 +32,7 @@ class Navigation(CTkFrame):
         super().__init__(parent, **kwargs)
         self.parent: App = parent
 
-        controls_button: CTkButton = CTkButton(self, text="Controls", command=lambda: Tutorial().mainloop(), width=20)
+        controls_button: CTkButton = CTkButton(self, text="Controls", command=self.open_controls, width=20)
         controls_button.pack(fill="both", padx=DEFAULT_PADDING, pady=TOP_PADDING_ONLY)
 
         export_button: ExportButton = ExportButton(self, parent.right_content)
@@ -70,3 +70,12 @@ class Navigation(CTkFrame):
         # Removes the last button container if it doesn't contain any child
         if not container.winfo_children():
             container.destroy()
+
+    def open_controls(self) -> None:
+        """
+        Shows the controls window, importing it on first use so it doesn't slow down startup
+        """
+        from Tutorial import Tutorial
+
+        tutorial: Tutorial = Tutorial()
+        tutorial.mainloop()
@@ -0,0 +1,87 @@
+import ctypes
+import os
+
+from constants import CANVAS_COLOR
+
+# OpenGL is imported inside the functions, once prepare_platform has picked the platform
+
+# the most EGL configs looked through for one with 8 bits per channel
+EGL_CONFIGS: int = 64
+
+def headless() -> bool:
+    """
+    Whether there is no X display to open a window on, in which case frames are drawn through EGL.
+    """
+    return not os.environ.get('DISPLAY')
+
+def prepare_platform(offscreen: bool = False) -> None:
+    """
+    Selects the OpenGL platform. It has to run before OpenGL is imported anywhere.
+
+    Without a display, PyOpenGL is pointed at EGL and Mesa at its surfaceless platform,
+    so frames are rendered by llvmpipe on the CPU.
+
+    Args:
+        offscreen (bool): Whether only OffscreenContext will be used, so EGL is picked even with a display.
+    """
+    if headless() or offscreen:
+        os.environ.setdefault('PYOPENGL_PLATFORM', 'egl')
+
+    if headless():
+        os.environ.setdefault('EGL_PLATFORM', 'surfaceless')
+
+class OffscreenContext:
+    """
+    An OpenGL context drawing to an EGL pbuffer instead of a window, made current on creation.
+    It works with Mesa's software rasterizer alone, so no GPU or display is needed.
+
+    Attributes:
+        width (int): The width of the pbuffer in pixels.
+        height (int): The height of the pbuffer in pixels.
+    """
+
+    def __init__(self, width: int = 1, height: int = 1) -> None:
+        from OpenGL import EGL
+
+        self.width: int = width
+        self.height: int = height
+
+        display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+        major, minor = EGL.EGLint(), EGL.EGLint()
+
+        if not EGL.eglInitialize(display, ctypes.pointer(major), ctypes.pointer(minor)):
+            raise RuntimeError('Could not initialize EGL')
+
+        attributes = (EGL.EGLint * 11)(
+            EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+            EGL.EGL_RED_SIZE, 8, EGL.EGL_GREEN_SIZE, 8, EGL.EGL_BLUE_SIZE, 8,
+            EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+            EGL.EGL_NONE
+        )
+        configs = (EGL.EGLConfig * EGL_CONFIGS)()
+        config_count = EGL.EGLint()
+
+        if not EGL.eglChooseConfig(display, attributes, configs, EGL_CONFIGS, ctypes.pointer(config_count)) or not config_count.value:
+            raise RuntimeError('No EGL config supports offscreen OpenGL rendering')
+
+        # deeper configs are listed first, but a display has 8 bits per channel, which is what colors are rounded to on screen
+        config = next((config for config in configs[:config_count.value] if self._red_size(display, config) == 8), configs[0])
+
+        surface = EGL.eglCreatePbufferSurface(display, config, (EGL.EGLint * 5)(EGL.EGL_WIDTH, width, EGL.EGL_HEIGHT, height, EGL.EGL_NONE))
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        context = EGL.eglCreateContext(display, config, EGL.EGL_NO_CONTEXT, None)
+
+        if not EGL.eglMakeCurrent(display, surface, surface, context):
+            raise RuntimeError('Could not make the EGL context current')
+
+        from OpenGL.GL import glViewport, glClearColor
+        glViewport(0, 0, width, height)
+        glClearColor(*CANVAS_COLOR, 1.0)
+
+    @staticmethod
+    def _red_size(display, config) -> int:
+        from OpenGL import EGL
+
+        size = EGL.EGLint()
+        EGL.eglGetConfigAttrib(display, config, EGL.EGL_RED_SIZE, ctypes.pointer(size))
+        return size.value
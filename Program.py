@@ -4,13 +4,20 @@ import CTkToast
 from Navigation import Navigation
 from Canvas import OpenGLCanvas
 from CTkToast import CTkToast
+from Renderers.Manager import DEFAULT_RENDERER
 from custom_types import *
 from constants import *
 
 class App(CTk):
-    def __init__(self) -> None:
+    def __init__(self, renderer: str = DEFAULT_RENDERER, max_fps: int | None = None, animate: bool = False, stats_csv: str | None = None) -> None:
         """
         Initializes the app
+
+        Args:
+            renderer (str): The name of the renderer the canvas draws with.
+            max_fps (int | None): Caps the canvas frame rate. None leaves it uncapped.
+            animate (bool): Redraws the canvas continuously instead of only when it changes.
+            stats_csv (str | None): A CSV file the timings of every frame are appended to.
         """
         super().__init__()
         window_width: int = 1280
@@ -31,15 +38,28 @@ class App(CTk):
         self.grid_columnconfigure(1, weight=1, uniform="nav_col")
         self.bind("<Key>", self.pressed)
 
-        self.right_content: OpenGLCanvas = OpenGLCanvas(self)
+        self.right_content: OpenGLCanvas = OpenGLCanvas(self, renderer=renderer, max_fps=max_fps, animate=animate, stats_csv=stats_csv)
         self.right_content.grid(row=0, column=1, padx=BOTTOM_PADDING_ONLY, pady=DEFAULT_PADDING, sticky="nsew")
 
         left_content: Navigation = Navigation(parent=self)
         left_content.grid(row=0, column=0, padx=DEFAULT_PADDING, pady=DEFAULT_PADDING, sticky="nsew")
         CTkToast(master=self)
 
+        if self.right_content.recover_autosave():
+            CTkToast.toast("Recovered unsaved work from the last session")
+
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
     def pressed(self, event) -> None:
         """
         Handles key press events here since pyopengltk.OpenGlCanvas doesn't seem to catch key press events
         """
-        self.right_content.key_pressed(event)
\ No newline at end of file
+        self.right_content.key_pressed(event)
+
+    def close(self) -> None:
+        """
+        Exits cleanly, so the autosave isn't offered for recovery next time
+        """
+        self.right_content.journal.discard()
+        self.right_content.frame_stats.stop_csv()
+        self.destroy()
\ No newline at end of file
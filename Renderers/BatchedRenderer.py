@@ -0,0 +1,230 @@
+from typing import Dict, Tuple
+from OpenGL.GL import *
+import numpy as np
+import ctypes
+
+from Shapes.Polygon import FILL_PHASE
+from Shapes.ShapeStore import ShapeStore
+from Shapes.unit_tables import unit_vertices, drawn_sides
+from Renderers.Renderer import Renderer, INDEX_SIZE
+from Renderers.SelectionMesh import SelectionMesh, FLOATS_PER_VERTEX, VERTEX_STRIDE
+from FrameStats import FrameStats
+
+COLOR_OFFSET: int = 2 * ctypes.sizeof(ctypes.c_float)
+
+class BatchedRenderer(Renderer):
+    """
+    Draws the whole scene from a single interleaved vertex buffer.
+
+    Every polygon is triangulated as a fan and written into one position and color array in canvas order,
+    which is uploaded to a VBO and drawn with glDrawElements. The selection mesh is appended to the same
+    buffers, and each selected shape splits the batch to draw its border right after its fill, so borders
+    keep the same z-order as with the immediate renderer.
+
+    The buffers are in world coordinates, so they are only built again when the visible shapes are culled again.
+    Frames that pan or zoom within the culled rectangle draw them as they are with a new projection, except
+    that a zoom uploads the vertices of the selection mesh again, as its borders and dots keep their size on screen.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.vertex_buffer: int | None = None
+        self.index_buffer: int | None = None
+
+        # what the buffers hold: the first index of each shape, the rows of the selected shapes, the vertex count
+        # and the first vertex of the selection mesh
+        self.index_starts: np.ndarray = np.zeros(1, dtype=np.int64)
+        self.selected_rows: np.ndarray = np.empty(0, dtype=np.int64)
+        self.vertex_count: int = 0
+        self.mesh_first: int = 0
+
+        # per side count: unit table in float64 and the fan triangulation of one polygon
+        self.unit_tables: Dict[int, np.ndarray] = {}
+        self.fan_indices: Dict[int, np.ndarray] = {}
+
+    def release(self) -> None:
+        super().release()
+
+        if self.vertex_buffer is not None:
+            glDeleteBuffers(2, [self.vertex_buffer, self.index_buffer])
+            self.vertex_buffer = self.index_buffer = None
+
+    def unit_table(self, number_of_sides: int) -> np.ndarray:
+        """
+        Returns the cached fill table of a polygon as an array of shape (number_of_sides, 2).
+        """
+        table: np.ndarray | None = self.unit_tables.get(number_of_sides)
+
+        if table is None:
+            table = np.array(unit_vertices(number_of_sides, FILL_PHASE), dtype=np.float64)
+            self.unit_tables[number_of_sides] = table
+
+        return table
+
+    def fan(self, number_of_sides: int) -> np.ndarray:
+        """
+        Returns the triangle fan of a polygon as an array of shape (number_of_sides - 2, 3).
+        """
+        indices: np.ndarray | None = self.fan_indices.get(number_of_sides)
+
+        if indices is None:
+            second: np.ndarray = np.arange(1, number_of_sides - 1, dtype=np.uint32)
+            indices = np.stack([np.zeros_like(second), second, second + 1], axis=1)
+            self.fan_indices[number_of_sides] = indices
+
+        return indices
+
+    def build(self, shapes: ShapeStore) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Builds the interleaved vertex array and the triangle indices of the scene from the store columns.
+
+        Args:
+            shapes (ShapeStore): The shapes of the canvas.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: The vertices, the indices and the offset
+            of the first index of each shape (with the total index count appended).
+        """
+        count: int = len(shapes)
+
+        # circles are tessellated for their radius, so they share the tables of polygons with as many sides
+        sides: np.ndarray = drawn_sides(shapes.sides, shapes.half_sizes * self.scale, shapes.circles())
+        centers: np.ndarray = shapes.centers
+        half_sizes: np.ndarray = shapes.half_sizes
+        angles: np.ndarray = np.radians(shapes.angles)
+        colors: np.ndarray = shapes.background_colors
+
+        vertex_starts: np.ndarray = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(sides, out=vertex_starts[1:])
+
+        index_starts: np.ndarray = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(3 * (sides - 2), out=index_starts[1:])
+
+        vertices: np.ndarray = np.empty((vertex_starts[-1], FLOATS_PER_VERTEX), dtype=np.float32)
+        indices: np.ndarray = np.empty(index_starts[-1], dtype=np.uint32)
+
+        for number_of_sides in np.unique(sides):
+            number_of_sides = int(number_of_sides)
+            members: np.ndarray = np.flatnonzero(sides == number_of_sides)
+
+            # scale the unit table, then rotate it around the center like glRotatef does
+            table: np.ndarray = self.unit_table(number_of_sides)
+            cosines: np.ndarray = np.cos(angles[members])[:, None]
+            sines: np.ndarray = np.sin(angles[members])[:, None]
+            scaled_x: np.ndarray = half_sizes[members, None] * table[None, :, 0]
+            scaled_y: np.ndarray = half_sizes[members, None] * table[None, :, 1]
+
+            rows: np.ndarray = (vertex_starts[members, None] + np.arange(number_of_sides)).ravel()
+            vertices[rows, 0] = (centers[members, 0, None] + scaled_x * cosines - scaled_y * sines).ravel()
+            vertices[rows, 1] = (centers[members, 1, None] + scaled_x * sines + scaled_y * cosines).ravel()
+            vertices[rows, 2:] = np.repeat(colors[members], number_of_sides, axis=0)
+
+            fan: np.ndarray = self.fan(number_of_sides).ravel()
+            slots: np.ndarray = (index_starts[members, None] + np.arange(fan.size)).ravel()
+            indices[slots] = (vertex_starts[members, None] + fan[None, :]).ravel()
+
+        return vertices, indices, index_starts
+
+    def upload(self, vertices: np.ndarray, indices: np.ndarray) -> None:
+        """
+        Streams the scene arrays into the vertex and index buffers, creating them on first use.
+        """
+        if self.vertex_buffer is None:
+            self.vertex_buffer, self.index_buffer = glGenBuffers(2)
+
+        glBindBuffer(GL_ARRAY_BUFFER, self.vertex_buffer)
+        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STREAM_DRAW)
+
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.index_buffer)
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, GL_STREAM_DRAW)
+
+    def draw_range(self, first: int, last: int) -> None:
+        """
+        Draws the triangles from index first up to (not including) index last.
+        """
+        if last <= first:
+            return
+
+        glDrawElements(GL_TRIANGLES, int(last - first), GL_UNSIGNED_INT, ctypes.c_void_p(int(first) * INDEX_SIZE))
+
+    def prepare(self, shapes: ShapeStore) -> None:
+        """
+        Builds the scene and the selection mesh and uploads them, with the mesh after the scene in both buffers.
+        """
+        vertices, indices, self.index_starts = self.build(shapes)
+        self.selected_rows = np.flatnonzero(shapes.selected)
+        mesh: SelectionMesh = self.selection_mesh
+
+        self.mesh_first = len(vertices)
+
+        if self.selected_rows.size:
+            mesh.update(shapes, self.selected_rows, self.frame_scale, self.scale)
+            vertices = np.concatenate([vertices, mesh.vertices])
+            indices = np.concatenate([indices, mesh.line_indices + self.mesh_first, mesh.triangle_indices + self.mesh_first])
+
+        self.upload(vertices, indices)
+        self.vertex_count = len(vertices)
+
+    def render(self, shapes: ShapeStore, stats: FrameStats) -> None:
+        """
+        Draws every shape with one glDrawElements call per run between selected shapes, plus the border of each selected shape.
+        The buffers are only built and uploaded again when geometry_changed is set.
+
+        Args:
+            shapes (ShapeStore): The visible shapes.
+            stats (FrameStats): Where the shapes, vertices and GL calls submitted are counted.
+        """
+        if not shapes:
+            return
+
+        uploaded: bool = self.geometry_changed or self.vertex_buffer is None
+        mesh: SelectionMesh = self.selection_mesh
+        mesh_moved: bool = False
+
+        if uploaded:
+            self.prepare(shapes)
+        else:
+            glBindBuffer(GL_ARRAY_BUFFER, self.vertex_buffer)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.index_buffer)
+
+            # only the zoom changed, which moves the vertices of the mesh without changing their count or indices
+            mesh_moved = bool(self.selected_rows.size) and mesh.update(shapes, self.selected_rows, self.frame_scale, self.scale)
+
+            if mesh_moved:
+                glBufferSubData(GL_ARRAY_BUFFER, self.mesh_first * VERTEX_STRIDE, mesh.vertices.nbytes, mesh.vertices)
+
+        index_starts: np.ndarray = self.index_starts
+        selected_rows: np.ndarray = self.selected_rows
+
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glVertexPointer(2, GL_FLOAT, VERTEX_STRIDE, ctypes.c_void_p(0))
+        glColorPointer(3, GL_FLOAT, VERTEX_STRIDE, ctypes.c_void_p(COLOR_OFFSET))
+
+        lines: int = int(index_starts[-1]) * INDEX_SIZE
+        triangles: int = lines + len(mesh.line_indices) * INDEX_SIZE
+        first: int = 0
+
+        for index, row in enumerate(selected_rows):
+            self.draw_range(first, index_starts[row + 1])
+            first = index_starts[row + 1]
+
+            with stats.phase('selection'):
+                self.draw_selection(index, lines, triangles)
+
+        self.draw_range(first, index_starts[-1])
+
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+
+        # the immediate renderer leaves the last fill color current, which the drag preview line inherits
+        glColor3f(*shapes.background_colors[-1])
+
+        glFlush()
+
+        # buffer binds and uploads, client state, pointers, one draw per run between selected shapes, the borders, color and flush
+        selection_calls: int = mesh.draw_calls() if selected_rows.size else 0
+        buffer_calls: int = 4 if uploaded else 2 + mesh_moved
+        stats.count(shapes_drawn=len(shapes), vertices=self.vertex_count, gl_calls=11 + buffer_calls + len(selected_rows) + selection_calls)
@@ -0,0 +1,63 @@
+from OpenGL.GL import *
+import numpy as np
+import ctypes
+
+from Renderers.Renderer import Renderer, immediate_mode_cost
+from Renderers.SelectionMesh import SelectionMesh, FLOATS_PER_VERTEX, VERTEX_STRIDE
+from Shapes.ShapeStore import ShapeStore
+from FrameStats import FrameStats
+
+class ImmediateRenderer(Renderer):
+    """
+    Draws each shape on its own using OpenGL immediate mode.
+    """
+
+    def render(self, shapes: ShapeStore, stats: FrameStats) -> None:
+        """
+        Calls Shape.draw_to_canvas for every shape, and draws the selection borders from client-side arrays.
+
+        Args:
+            shapes (ShapeStore): The shapes of the canvas.
+            stats (FrameStats): Where the shapes, vertices and GL calls submitted are counted.
+        """
+        selected_rows: np.ndarray = np.flatnonzero(shapes.selected)
+        mesh: SelectionMesh = self.selection_mesh
+
+        if selected_rows.size:
+            mesh.update(shapes, selected_rows, self.frame_scale, self.scale)
+
+            # immediate mode ignores the arrays, so they stay enabled while the fills are drawn
+            glEnableClientState(GL_VERTEX_ARRAY)
+            glEnableClientState(GL_COLOR_ARRAY)
+            glVertexPointer(2, GL_FLOAT, VERTEX_STRIDE, ctypes.c_void_p(mesh.vertices.ctypes.data))
+            glColorPointer(3, GL_FLOAT, VERTEX_STRIDE, ctypes.c_void_p(mesh.vertices[:, 2:].ctypes.data))
+
+        first: int = 0
+
+        for index, row in enumerate(selected_rows):
+            for shape in shapes[first:row]:
+                shape.draw_to_canvas()
+
+            with stats.phase('selection'):
+                shapes[int(row)].draw_to_canvas()
+                self.draw_selection(index, mesh.line_indices.ctypes.data, mesh.triangle_indices.ctypes.data)
+
+            first = row + 1
+
+        for shape in shapes[first:]:
+            shape.draw_to_canvas()
+
+        vertices, gl_calls = immediate_mode_cost(shapes.sides, shapes.half_sizes * self.scale, shapes.circles())
+
+        if selected_rows.size:
+            glDisableClientState(GL_COLOR_ARRAY)
+            glDisableClientState(GL_VERTEX_ARRAY)
+
+            # the drag preview line inherits the color left current, the fill color of the top shape
+            glColor3f(*shapes.background_colors[-1])
+
+            # client state, pointers and the color
+            vertices += len(mesh.vertices)
+            gl_calls += mesh.draw_calls() + 7
+
+        stats.count(shapes_drawn=len(shapes), vertices=vertices, gl_calls=gl_calls)
@@ -0,0 +1,26 @@
+from typing import Dict, List, Type
+
+from Renderers.Renderer import Renderer
+from Renderers.ImmediateRenderer import ImmediateRenderer
+from Renderers.BatchedRenderer import BatchedRenderer
+
+DEFAULT_RENDERER: str = 'immediate'
+
+def renderers() -> Dict[str, Type[Renderer]]:
+    """
+    Maps the names accepted by the --renderer option to their renderer classes.
+
+    Returns:
+        Dict[str, Type[Renderer]]: Dictionary mapping renderer names to renderer classes.
+    """
+    return {
+        'immediate': ImmediateRenderer,
+        'batched': BatchedRenderer
+    }
+
+def names() -> List[str]:
+    """
+    Returns:
+        List[str]: The names of every available renderer.
+    """
+    return list(renderers())
@@ -0,0 +1,253 @@
+from abc import ABC, abstractmethod
+from typing import Tuple
+from OpenGL.GL import *
+import numpy as np
+import ctypes
+
+from Shapes.ShapeStore import ShapeStore
+from Shapes.Shape import Shape
+from Shapes.Polygon import Polygon
+from Shapes.unit_tables import drawn_sides
+from Renderers.SelectionMesh import SelectionMesh, DOT_RADIUS
+from FrameStats import FrameStats
+from custom_types import RECTANGLE
+
+# GL calls Shape.draw_to_canvas makes besides the vertices of the fill:
+# push, three transforms, color, begin, end, pop and flush
+DRAW_CALLS: int = 9
+
+INDEX_SIZE: int = ctypes.sizeof(ctypes.c_uint32)
+
+# how far past its bounding circle a selected shape draws its border and corner dots, in canvas pixels
+SELECTION_MARGIN: float = Polygon.padding + DOT_RADIUS
+
+# how far past each side of the view shapes are kept when culling, as a share of the view's size,
+# so panning doesn't cull and rebuild again until the view leaves that margin
+VIEW_MARGIN: float = 0.25
+
+# how much the zoom may change before shapes are tessellated again, the step between level of detail buckets
+LOD_ZOOM_RATIO: float = 2.0
+
+def immediate_mode_cost(sides: np.ndarray, half_sizes: np.ndarray, circles: np.ndarray) -> Tuple[int, int]:
+    """
+    Returns the vertices and GL calls Shape.draw_to_canvas submits for the given shapes,
+    so renderers can count them without wrapping every GL call.
+
+    Args:
+        sides (np.ndarray): The number of sides of each shape.
+        half_sizes (np.ndarray): The radius of each shape in canvas pixels, which picks the segments of circles.
+        circles (np.ndarray): Whether each shape is a circle.
+
+    Returns:
+        Tuple[int, int]: The number of vertices and of GL calls.
+    """
+    vertices: int = int(drawn_sides(sides, half_sizes, circles).sum())
+    return vertices, vertices + DRAW_CALLS * len(sides)
+
+class Renderer(ABC):
+    """
+    Abstract base class for the strategies the canvas uses to submit its shapes to OpenGL.
+
+    Every frame of shapes is copied to a texture once drawn. Frames that only change what is drawn over
+    the shapes, such as a drag preview, draw that texture instead of the shapes, so their cost doesn't
+    depend on the size of the scene.
+
+    Shapes are culled against the view grown by VIEW_MARGIN, and the visible ones are kept until the scene
+    changes, the view leaves that rectangle or the zoom changes by LOD_ZOOM_RATIO. Until then, panning and
+    zooming only change the projection, and renderers can draw what they built for the previous frame.
+
+    Attributes:
+        scene_changed (bool): Whether the shapes changed since the last frame. The canvas leaves it unset
+            for frames that only move a preview, pan or zoom.
+        visible (ShapeStore | None): The shapes left after culling, drawn until they are culled again.
+        geometry_changed (bool): Whether visible was culled again since the last render.
+        scale (float): The canvas pixels per world unit visible was culled at, which picks the segments of circles.
+        frame_scale (float): The canvas pixels per world unit of the frame being drawn, which sizes selection borders and dots.
+    """
+
+    scene_changed: bool = True
+
+    # the texture holding the last frame of shapes, its size, the world rectangle it shows and the color current after drawing it
+    frame_texture: int | None = None
+    frame_size: Tuple[int, int] = (0, 0)
+    frame_view: RECTANGLE | None = None
+    frame_color: Tuple[float, ...] = (1.0, 1.0, 1.0, 1.0)
+
+    # the world rectangle visible was culled against, None when nothing was culled
+    visible_view: RECTANGLE | None = None
+
+    def __init__(self) -> None:
+        self.selection_mesh: SelectionMesh = SelectionMesh()
+        self.visible: ShapeStore | None = None
+        self.geometry_changed: bool = True
+        self.scale: float = 1.0
+        self.frame_scale: float = 1.0
+
+    @abstractmethod
+    def render(self, shapes: ShapeStore, stats: FrameStats) -> None:
+        """
+        Draws every shape in order, so later shapes are drawn on top of earlier ones.
+        The border of each selected shape is drawn from selection_mesh right after its fill,
+        inside the 'selection' phase of stats.
+
+        Args:
+            shapes (ShapeStore): The visible shapes, the same store as the previous call unless geometry_changed is set.
+            stats (FrameStats): Where the shapes, vertices and GL calls submitted are counted.
+        """
+        pass
+
+    def draw_frame(self, shapes: ShapeStore, width: int, height: int, stats: FrameStats, view: RECTANGLE | None = None) -> None:
+        """
+        Clears the frame, maps OpenGL coordinates to the world rectangle shown and draws the shapes.
+
+        Args:
+            shapes (ShapeStore): The shapes of the canvas.
+            width (int): The width of the canvas in pixels.
+            height (int): The height of the canvas in pixels.
+            stats (FrameStats): The timings of the frame being drawn.
+            view (RECTANGLE | None): The world rectangle shown, as left, top, right, bottom. Defaults to the canvas itself.
+        """
+        view = view or (0, 0, width, height)
+        left, top, right, bottom = view
+
+        with stats.phase('setup'):
+            glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+
+            glMatrixMode(GL_PROJECTION)
+            glLoadIdentity()
+            glOrtho(left, right, bottom, top, -1, 1)
+            glMatrixMode(GL_MODELVIEW)
+            glLoadIdentity()
+
+        stats.count(gl_calls=6)
+
+        with stats.phase('shapes'):
+            if not self.scene_changed and self.frame_texture is not None and self.frame_size == (width, height) and self.frame_view == view:
+                self.draw_kept_frame(view)
+                stats.count(vertices=4, gl_calls=16)
+                return
+
+            scale: float = width / (right - left)
+            self.frame_scale = scale
+
+            if self.scene_changed or self.visible is None or not self.covers(view, scale):
+                culled_view: RECTANGLE = self.grow(view)
+                self.visible = self.cull(shapes, *culled_view, scale)
+                self.visible_view = None if len(self.visible) == len(shapes) else culled_view
+                self.geometry_changed = True
+                self.scale = scale
+
+            stats.count(culled=len(shapes) - len(self.visible))
+
+            if self.visible:
+                Shape.scale = self.scale
+                self.render(self.visible, stats)
+
+            self.geometry_changed = False
+            self.keep_frame(width, height, view)
+            self.scene_changed = False
+
+    def covers(self, view: RECTANGLE, scale: float) -> bool:
+        """
+        Whether the shapes culled last can be drawn for a view: it is inside the rectangle they were culled against,
+        or nothing was culled, and the zoom is within LOD_ZOOM_RATIO of the one they were tessellated for.
+        """
+        if not 1 / LOD_ZOOM_RATIO <= scale / self.scale <= LOD_ZOOM_RATIO:
+            return False
+
+        if self.visible_view is None:
+            return True
+
+        left, top, right, bottom = view
+        culled_left, culled_top, culled_right, culled_bottom = self.visible_view
+        return culled_left <= left and culled_top <= top and right <= culled_right and bottom <= culled_bottom
+
+    @staticmethod
+    def grow(view: RECTANGLE) -> RECTANGLE:
+        """
+        Returns a view grown by VIEW_MARGIN of its size on every side.
+        """
+        left, top, right, bottom = view
+        margin_x: float = (right - left) * VIEW_MARGIN
+        margin_y: float = (bottom - top) * VIEW_MARGIN
+        return left - margin_x, top - margin_y, right + margin_x, bottom + margin_y
+
+    def release(self) -> None:
+        """
+        Deletes the OpenGL objects of the renderer, for renderers made for a single job such as an export.
+        The context they were created in must be current.
+        """
+        if self.frame_texture is not None:
+            glDeleteTextures([self.frame_texture])
+            self.frame_texture = None
+
+    def draw_selection(self, index: int, lines: int, triangles: int) -> None:
+        """
+        Draws the border and corner dots of a selected shape from selection_mesh, with the vertex and color
+        pointers already set to its vertices.
+
+        Args:
+            index (int): The position of the shape among the selected shapes.
+            lines (int): The address or buffer offset of the mesh's line indices.
+            triangles (int): The address or buffer offset of the mesh's triangle indices.
+        """
+        first_line, last_line, first_triangle, last_triangle = self.selection_mesh.ranges(index)
+
+        glDrawElements(GL_LINES, int(last_line - first_line), GL_UNSIGNED_INT, ctypes.c_void_p(int(lines + first_line * INDEX_SIZE)))
+
+        if last_triangle > first_triangle:
+            glDrawElements(GL_TRIANGLES, int(last_triangle - first_triangle), GL_UNSIGNED_INT, ctypes.c_void_p(int(triangles + first_triangle * INDEX_SIZE)))
+
+    def cull(self, shapes: ShapeStore, left: float, top: float, right: float, bottom: float, scale: float = 1.0) -> ShapeStore:
+        """
+        Leaves out the shapes whose bounding circle, grown by SELECTION_MARGIN for selected ones, is outside
+        the visible rectangle, before any of their geometry is generated.
+
+        The margin is in canvas pixels, so it is turned into world units at the smallest scale the culled
+        shapes are drawn at before they are culled again, LOD_ZOOM_RATIO below the one they were culled at.
+
+        Returns:
+            ShapeStore: The store itself when every shape is visible, or a copy of the visible rows.
+        """
+        margins: np.ndarray = shapes.selected * (SELECTION_MARGIN * LOD_ZOOM_RATIO / scale)
+        rows: np.ndarray = shapes.intersecting_rectangle(left, top, right, bottom, margins=margins)
+
+        return shapes if len(rows) == len(shapes) else shapes.subset(rows)
+
+    def keep_frame(self, width: int, height: int, view: RECTANGLE) -> None:
+        """
+        Copies the frame just drawn, showing a world rectangle, to frame_texture.
+        """
+        if self.frame_texture is None:
+            self.frame_texture = glGenTextures(1)
+
+        glBindTexture(GL_TEXTURE_2D, self.frame_texture)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        glCopyTexImage2D(GL_TEXTURE_2D, 0, GL_RGB, 0, 0, width, height, 0)
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+        self.frame_size = (width, height)
+        self.frame_view = view
+        self.frame_color = tuple(glGetFloatv(GL_CURRENT_COLOR))
+
+    def draw_kept_frame(self, view: RECTANGLE) -> None:
+        """
+        Covers the world rectangle shown with frame_texture, leaving the same color current as drawing the shapes did.
+        """
+        left, top, right, bottom = view
+
+        glEnable(GL_TEXTURE_2D)
+        glBindTexture(GL_TEXTURE_2D, self.frame_texture)
+        glTexEnvi(GL_TEXTURE_ENV, GL_TEXTURE_ENV_MODE, GL_REPLACE)
+
+        # the texture starts at the bottom row of the frame, which is the bottom of the canvas
+        glBegin(GL_QUADS)
+        for texture_x, texture_y in ((0, 0), (1, 0), (1, 1), (0, 1)):
+            glTexCoord2f(texture_x, texture_y)
+            glVertex2f(left + texture_x * (right - left), bottom + texture_y * (top - bottom))
+        glEnd()
+
+        glBindTexture(GL_TEXTURE_2D, 0)
+        glDisable(GL_TEXTURE_2D)
+        glColor4f(*self.frame_color)
@@ -0,0 +1,159 @@
+from typing import Tuple
+import numpy as np
+import ctypes
+
+from Shapes.Polygon import Polygon, BORDER_PHASE
+from Shapes.ShapeStore import ShapeStore
+from Shapes.unit_tables import unit_vertices, circle_segments, drawn_sides
+
+# x, y, r, g, b, the vertex layout of BatchedRenderer
+FLOATS_PER_VERTEX: int = 5
+VERTEX_STRIDE: int = FLOATS_PER_VERTEX * ctypes.sizeof(ctypes.c_float)
+
+# the corner dots of a selection border, with their radius in canvas pixels at any zoom
+DOT_RADIUS: int = 4
+DOT_SEGMENTS: int = circle_segments(DOT_RADIUS)
+
+class SelectionMesh:
+    """
+    The borders and corner dots of the selected shapes, built with numpy for all of them at once and kept
+    until the geometry or colors of the selected shapes change, so redrawing a selection builds nothing.
+
+    Each selected shape gets a GL_LINES loop in its border color, padding pixels outside its bounding circle,
+    and, unless it is a circle, a triangle fan in its background color on every corner of that loop.
+    Vertices are in world coordinates with the rotation of the shape applied, like the batched fills, with
+    the padding and dots divided by the scale so they keep their size on screen at any zoom.
+
+    Attributes:
+        vertices (np.ndarray): Interleaved x, y, r, g, b of every border and dot, float32.
+        line_indices (np.ndarray): Pairs of vertices to draw with GL_LINES.
+        triangle_indices (np.ndarray): Triples of vertices to draw with GL_TRIANGLES.
+        line_starts (np.ndarray): The first line index of each selected shape, with the total appended.
+        triangle_starts (np.ndarray): The first triangle index of each selected shape, with the total appended.
+    """
+
+    def __init__(self) -> None:
+        self.key: np.ndarray | None = None
+        self.scale: float = 1.0
+        self.detail_scale: float = 1.0
+        self.vertices: np.ndarray = np.empty((0, FLOATS_PER_VERTEX), dtype=np.float32)
+        self.line_indices: np.ndarray = np.empty(0, dtype=np.uint32)
+        self.triangle_indices: np.ndarray = np.empty(0, dtype=np.uint32)
+        self.line_starts: np.ndarray = np.zeros(1, dtype=np.int64)
+        self.triangle_starts: np.ndarray = np.zeros(1, dtype=np.int64)
+
+    def update(self, shapes: ShapeStore, rows: np.ndarray, scale: float = 1.0, detail_scale: float | None = None) -> bool:
+        """
+        Rebuilds the mesh when anything drawn from the selected shapes, or the scale they are drawn at, changed since the last call.
+
+        Args:
+            shapes (ShapeStore): The shapes being drawn.
+            rows (np.ndarray): The rows of the selected shapes, bottom to top.
+            scale (float): The canvas pixels per world unit of the frame, which sizes the padding and the dots.
+            detail_scale (float | None): The canvas pixels per world unit the shapes were tessellated at, which picks
+                the segments of circle borders. Defaults to scale. Meshes of the same shapes at the same detail_scale
+                have the same vertex count and indices, only their vertices move.
+
+        Returns:
+            bool: Whether the mesh was rebuilt.
+        """
+        detail_scale = detail_scale or scale
+        key: np.ndarray = np.column_stack([
+            shapes.centers[rows], shapes.half_sizes[rows], shapes.angles[rows], shapes.sides[rows], shapes.circles(rows),
+            shapes.background_colors[rows], shapes.border_colors[rows]
+        ])
+
+        if self.key is not None and scale == self.scale and detail_scale == self.detail_scale and np.array_equal(self.key, key):
+            return False
+
+        self.key = key
+        self.scale = scale
+        self.detail_scale = detail_scale
+        self.build(shapes, rows)
+        return True
+
+    def build(self, shapes: ShapeStore, rows: np.ndarray) -> None:
+        count: int = len(rows)
+        sides: np.ndarray = shapes.sides[rows]
+        circles: np.ndarray = shapes.circles(rows)
+        radii: np.ndarray = shapes.half_sizes[rows] + Polygon.padding / self.scale
+
+        # the padding is the same on screen at any zoom, so only detail_scale changes the segments of circles
+        corners: np.ndarray = drawn_sides(sides, shapes.half_sizes[rows] * self.detail_scale + Polygon.padding, circles)
+        dotted: np.ndarray = ~circles
+
+        # per shape: the border loop, then DOT_SEGMENTS vertices for each corner dot
+        dot_vertices: np.ndarray = np.where(dotted, corners * DOT_SEGMENTS, 0)
+        vertex_starts: np.ndarray = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(corners + dot_vertices, out=vertex_starts[1:])
+
+        self.line_starts = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(2 * corners, out=self.line_starts[1:])
+
+        self.triangle_starts = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(np.where(dotted, corners * 3 * (DOT_SEGMENTS - 2), 0), out=self.triangle_starts[1:])
+
+        self.vertices = np.empty((vertex_starts[-1], FLOATS_PER_VERTEX), dtype=np.float32)
+        self.line_indices = np.empty(self.line_starts[-1], dtype=np.uint32)
+        self.triangle_indices = np.empty(self.triangle_starts[-1], dtype=np.uint32)
+
+        centers: np.ndarray = shapes.centers[rows]
+        angles: np.ndarray = np.radians(shapes.angles[rows])
+        background_colors: np.ndarray = shapes.background_colors[rows]
+        border_colors: np.ndarray = shapes.border_colors[rows]
+
+        dot_table: np.ndarray = np.array(unit_vertices(DOT_SEGMENTS), dtype=np.float64) * (DOT_RADIUS / self.scale)
+        second: np.ndarray = np.arange(1, DOT_SEGMENTS - 1)
+        dot_fan: np.ndarray = np.stack([np.zeros_like(second), second, second + 1], axis=1).ravel()
+
+        for number_of_corners, is_dotted in {(int(corner), bool(dot)) for corner, dot in zip(corners, dotted)}:
+            members: np.ndarray = np.flatnonzero((corners == number_of_corners) & (dotted == is_dotted))
+
+            # the border winds clockwise, so the table is mirrored on the y axis
+            table: np.ndarray = np.array(unit_vertices(number_of_corners, BORDER_PHASE), dtype=np.float64) * (1, -1)
+            border: np.ndarray = radii[members, None, None] * table[None]
+            first: np.ndarray = vertex_starts[members]
+
+            self.place(first, border, centers[members], angles[members], border_colors[members])
+
+            loop: np.ndarray = np.arange(number_of_corners)
+            pairs: np.ndarray = np.stack([loop, (loop + 1) % number_of_corners], axis=1).ravel()
+            slots: np.ndarray = (self.line_starts[members, None] + np.arange(pairs.size)).ravel()
+            self.line_indices[slots] = (first[:, None] + pairs[None]).ravel()
+
+            if not is_dotted:
+                continue
+
+            # every dot is a fan around its corner, rotated with the shape like the rest of it
+            dots: np.ndarray = (border[:, :, None, :] + dot_table[None, None]).reshape(len(members), -1, 2)
+            dot_first: np.ndarray = first + number_of_corners
+            self.place(dot_first, dots, centers[members], angles[members], background_colors[members])
+
+            fans: np.ndarray = (np.arange(number_of_corners)[:, None] * DOT_SEGMENTS + dot_fan[None]).ravel()
+            slots = (self.triangle_starts[members, None] + np.arange(fans.size)).ravel()
+            self.triangle_indices[slots] = (dot_first[:, None] + fans[None]).ravel()
+
+    def place(self, first: np.ndarray, local: np.ndarray, centers: np.ndarray, angles: np.ndarray, colors: np.ndarray) -> None:
+        """
+        Writes vertices given around the center of their shape, shape (members, vertices, 2), rotated and
+        moved to the shape, from index first of each member on.
+        """
+        cosines: np.ndarray = np.cos(angles)[:, None]
+        sines: np.ndarray = np.sin(angles)[:, None]
+        slots: np.ndarray = (first[:, None] + np.arange(local.shape[1])).ravel()
+
+        self.vertices[slots, 0] = (centers[:, 0, None] + local[:, :, 0] * cosines - local[:, :, 1] * sines).ravel()
+        self.vertices[slots, 1] = (centers[:, 1, None] + local[:, :, 0] * sines + local[:, :, 1] * cosines).ravel()
+        self.vertices[slots, 2:] = np.repeat(colors, local.shape[1], axis=0)
+
+    def ranges(self, index: int) -> Tuple[int, int, int, int]:
+        """
+        Returns the first and last line index and the first and last triangle index of a selected shape.
+        """
+        return self.line_starts[index], self.line_starts[index + 1], self.triangle_starts[index], self.triangle_starts[index + 1]
+
+    def draw_calls(self) -> int:
+        """
+        Returns how many glDrawElements calls drawing every selected shape takes, one per non-empty range.
+        """
+        return int((np.diff(self.line_starts) > 0).sum() + (np.diff(self.triangle_starts) > 0).sum())
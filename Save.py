@@ -1,28 +1,37 @@
 from tkinter import filedialog, Tk
-from CTkToast import CTkToast
+from typing import IO, Any, BinaryIO, Dict, Iterator, List
+from contextlib import contextmanager
+from math import prod
+from os import path
+import numpy as np
+import os
 import pickle
+import struct
+import mmap
+import traceback
+import sys
 
-def export_to_file(input_list) -> bool:
-    """
-    Save a list of class instances to a file with the .dsd format.
-
-    Args:
-    input_list (list): The list of class instances to be saved.
-    file_path (str): The path to save the file.
+from Shapes.ShapeStore import ShapeStore, COLUMNS
+from Shapes.Manager import shapes as shape_classes, side_counts
+from Shapes.unit_tables import MAX_SIDES
+from Background import PROGRESS
 
-    Returns:
-        bool: If the file has been saved succesfully
-    """
-    file_path: str = save_file_dialog()
+# .dsd layout (little endian):
+#   header     magic, version, flags, shape count, kind table size, column count
+#   kind table class names separated by newlines, padded to COLUMN_ALIGNMENT
+#   directory  one entry per column: name, dtype, values per row, byte offset
+#   columns    the raw values of each column, each starting on a COLUMN_ALIGNMENT boundary
+DSD_MAGIC: bytes = b'DSD\x00'
+DSD_VERSION: int = 1
+HEADER: struct.Struct = struct.Struct('<4sHHQII')
+DIRECTORY_ENTRY: struct.Struct = struct.Struct('<16s8sIxxxxQ')
+COLUMN_ALIGNMENT: int = 64
 
-    if file_path is None:
-        CTkToast.toast('Cancelled file selection')
-        return False
+# bytes written between two progress reports
+WRITE_CHUNK: int = 1 << 22
 
-    with open(file_path, 'wb') as file:
-        pickle.dump(input_list, file)
-
-    return True
+# shapes handed over at a time by stream_scene
+STREAM_CHUNK: int = 10000
 
 def open_file_dialog() -> str | None:
     """
@@ -31,7 +40,13 @@ def open_file_dialog() -> str | None:
     root = Tk()
     root.withdraw()
 
-    file_path: str = filedialog.askopenfilename()
+    file_path: str = filedialog.askopenfilename(
+        filetypes=[
+            ("2D Shape Drawer", "*.dsd"),
+            ("Pickle", "*.pkl"),
+            ("All files", "*.*")
+        ]
+    )
     return file_path if file_path else None
 
 def save_file_dialog() -> str | None:
@@ -42,32 +57,381 @@ def save_file_dialog() -> str | None:
     root.withdraw()
 
     file_path: str = filedialog.asksaveasfilename(
-        defaultextension=".pkl",
+        defaultextension=".dsd",
         filetypes=[
-            ("Pickle", "*.pkl"),
+            ("2D Shape Drawer", "*.dsd"),
+            ("PNG image", "*.png"),
+            ("SVG image", "*.svg"),
             ("All files", "*.*")
         ]
     )
 
     return file_path if file_path else None
 
-def import_from_file():
+def read_scene(file_path: str, progress: PROGRESS | None = None) -> ShapeStore:
     """
-    Import a list of class instances from a file with the .dsd format.
+    Import the shapes of a .dsd file, falling back to the pickle format of older versions of the app
+    when the file doesn't start with the .dsd magic.
 
     Args:
-    file_path (str): The path of the file to import.
+        file_path (str): The path of the file to import.
+        progress (PROGRESS | None): Called with the fraction of the file read so far.
 
     Returns:
-    list: The imported list of class instances.
+        ShapeStore: The imported shapes.
+    """
+    if is_dsd(file_path):
+        shapes: ShapeStore = read_dsd(file_path)
+
+        if progress:
+            progress(1.0)
+
+        return shapes
+
+    return read_pickle(file_path, progress)
+
+def stream_scene(file_path: str, progress: PROGRESS | None = None, chunk_size: int = STREAM_CHUNK) -> Iterator[ShapeStore]:
     """
-    file_path: str = open_file_dialog()
+    Import the shapes of a file in chunks, bottom to top, so they can be shown before the whole file is processed.
+
+    A .dsd file is memory-mapped and validated up front, then sliced without copying. A legacy pickle can only
+    be loaded whole, so its chunks only come once the whole file was read.
+
+    Args:
+        file_path (str): The path of the file to import.
+        progress (PROGRESS | None): Called with the fraction of the import done so far.
+        chunk_size (int): The maximum number of shapes per chunk.
+
+    Yields:
+        ShapeStore: The next chunk of shapes.
+    """
+    report: PROGRESS = progress or (lambda fraction: None)
+
+    if is_dsd(file_path):
+        shapes: ShapeStore = read_dsd(file_path)
+
+        for done, chunk in enumerate(shapes.chunks(chunk_size), 1):
+            report(min(1, done * chunk_size / len(shapes)))
+            yield chunk
 
-    if not file_path:
-        CTkToast.toast('Cancelled selection')
         return
 
+    shapes: ShapeStore = read_pickle(file_path, progress)
+
+    for chunk in shapes.chunks(chunk_size):
+        yield chunk
+
+def is_dsd(file_path: str) -> bool:
+    with open(file_path, 'rb') as file:
+        return file.read(len(DSD_MAGIC)) == DSD_MAGIC
+
+@contextmanager
+def atomic_open(file_path: str, mode: str = 'wb', **options: Any) -> Iterator[IO]:
+    """
+    Opens a temporary file next to file_path, which replaces it once the with block finishes. A write that fails
+    or is abandoned deletes the temporary file, so the file that was there before is left untouched.
+
+    Args:
+        file_path (str): The file to write.
+        mode (str): The mode to open the temporary file with.
+        **options: Passed on to open, like encoding or buffering.
+    """
+    temporary_path: str = file_path + '.tmp'
+
+    try:
+        with open(temporary_path, mode, **options) as file:
+            yield file
+    except BaseException:
+        try:
+            os.remove(temporary_path)
+        except OSError:
+            pass
+
+        raise
+
+    os.replace(temporary_path, file_path)
+
+def _padding(position: int) -> int:
+    return -position % COLUMN_ALIGNMENT
+
+def write_dsd(file_path: str, shapes: ShapeStore, progress: PROGRESS | None = None) -> None:
+    """
+    Writes the columns of a store to a .dsd file.
+
+    Args:
+        file_path (str): The path to save the file.
+        shapes (ShapeStore): The shapes to be saved. Pass a ShapeStore.snapshot when writing from another thread.
+        progress (PROGRESS | None): Called with the fraction of the column data written so far.
+    """
+    kind_table: bytes = '\n'.join(kind.__name__ for kind in shapes.kinds).encode('utf-8')
+    columns: Dict[str, np.ndarray] = {
+        name: np.ascontiguousarray(shapes.column(name), dtype=np.dtype(dtype).newbyteorder('<')) for name, (dtype, _) in COLUMNS.items()
+    }
+
+    position: int = HEADER.size + len(kind_table)
+    position += _padding(position) + DIRECTORY_ENTRY.size * len(columns)
+
+    directory: List[bytes] = []
+    offsets: List[int] = []
+
+    for name, column in columns.items():
+        position += _padding(position)
+        offsets.append(position)
+        directory.append(DIRECTORY_ENTRY.pack(name.encode('ascii'), column.dtype.str.encode('ascii'), prod(column.shape[1:]), position))
+        position += column.nbytes
+
+    with atomic_open(file_path) as file:
+        file.write(HEADER.pack(DSD_MAGIC, DSD_VERSION, 0, len(shapes), len(kind_table), len(columns)))
+        file.write(kind_table)
+        file.write(bytes(_padding(file.tell())))
+        file.write(b''.join(directory))
+
+        total: int = max(1, sum(column.nbytes for column in columns.values()))
+        written: int = 0
+
+        for offset, column in zip(offsets, columns.values()):
+            file.write(bytes(offset - file.tell()))
+            raw: np.ndarray = column.reshape(-1).view(np.uint8)
+
+            for first in range(0, raw.size, WRITE_CHUNK):
+                file.write(raw[first:first + WRITE_CHUNK].data)
+                written += min(WRITE_CHUNK, raw.size - first)
+
+                if progress:
+                    progress(written / total)
+
+def read_dsd(file_path: str) -> ShapeStore:
+    """
+    Memory-maps a .dsd file and builds a store whose columns are zero-copy views of the file.
+
+    The mapping is copy-on-write, so editing the shapes never writes back to the file. Files that can't be
+    read, or hold shapes the app can't draw, raise ValueError with the mapping closed.
+
+    Args:
+        file_path (str): The path of the file to import.
+
+    Returns:
+        ShapeStore: The imported shapes.
+    """
     with open(file_path, 'rb') as file:
-        output_list = pickle.load(file)
+        buffer: mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    columns: Dict[str, np.ndarray] = {}
+
+    try:
+        try:
+            magic, version, _, count, kind_table_size, column_count = HEADER.unpack_from(buffer, 0)
+        except struct.error:
+            raise ValueError(f'{file_path} is not a .dsd file') from None
+
+        if magic != DSD_MAGIC:
+            raise ValueError(f'{file_path} is not a .dsd file')
+
+        if version > DSD_VERSION:
+            raise ValueError(f'{file_path} was saved by a newer version of the app (format version {version})')
+
+        try:
+            kind_table: bytes = buffer[HEADER.size:HEADER.size + kind_table_size]
+            kind_names: List[str] = kind_table.decode('utf-8').split('\n') if kind_table else []
+
+            position: int = HEADER.size + kind_table_size
+            position += _padding(position)
+
+            for _ in range(column_count):
+                raw_name, raw_dtype, width, offset = DIRECTORY_ENTRY.unpack_from(buffer, position)
+                position += DIRECTORY_ENTRY.size
+
+                name: str = raw_name.rstrip(b'\x00').decode('ascii')
+
+                # columns added by later versions of the format are skipped
+                if name not in COLUMNS or width != prod(COLUMNS[name][1]):
+                    continue
+
+                columns[name] = np.frombuffer(
+                    buffer, dtype=raw_dtype.rstrip(b'\x00').decode('ascii'), count=count * width, offset=offset
+                ).reshape(count, *COLUMNS[name][1])
+        except (struct.error, TypeError, ValueError) as error:
+            raise ValueError(f'{file_path} has a damaged column directory ({error})') from error
+
+        kinds: List[type] = _resolve_kinds(kind_names)
+        missing: List[str] = [name for name in COLUMNS if name not in columns]
+
+        if missing:
+            raise ValueError(f'{file_path} is missing the columns {", ".join(missing)}')
+
+        # native byte order and the store's dtypes; astype only copies when they differ
+        for name, (dtype, _) in COLUMNS.items():
+            columns[name] = columns[name].astype(dtype, copy=False)
+
+        _validate_columns(file_path, columns, kinds)
+    except Exception as error:
+        # the mapping can only be closed once no array views it, including the locals of the frames that raised
+        columns.clear()
+        traceback.clear_frames(error.__traceback__)
+        buffer.close()
+        raise
+
+    return ShapeStore.from_columns(columns, kinds)
+
+def _validate_columns(file_path: str, columns: Dict[str, np.ndarray], kinds: List[type]) -> None:
+    """
+    Rejects shapes the app can't draw safely: unknown kinds, side counts that don't match their kind or are
+    out of range, and coordinates or colors that aren't finite numbers. The columns must have the store's dtypes.
+    """
+    kind_column: np.ndarray = columns['kind']
+    sides: np.ndarray = columns['sides']
+
+    if not len(kind_column):
+        return
+
+    if int(kind_column.min()) < 0 or int(kind_column.max()) >= len(kinds):
+        raise ValueError(f'{file_path} refers to a shape type it does not name')
+
+    if int(sides.min()) < 3 or int(sides.max()) > MAX_SIDES:
+        raise ValueError(f'{file_path} has shapes with fewer than 3 or more than {MAX_SIDES} sides')
+
+    # -1 for classes whose shapes don't all have the same number of sides
+    counts: Dict[type, int | None] = side_counts()
+    expected: np.ndarray = np.array([-1 if counts.get(kind) is None else counts[kind] for kind in kinds], dtype=np.int64)[kind_column]
+
+    if ((expected >= 0) & (expected != sides)).any():
+        raise ValueError(f'{file_path} has shapes whose number of sides does not match their type')
+
+    for name, (dtype, _) in COLUMNS.items():
+        if np.issubdtype(dtype, np.floating) and not np.isfinite(columns[name]).all():
+            raise ValueError(f'{file_path} has shapes whose {name} is not a finite number')
+
+def _resolve_kinds(names: List[str]) -> List[type]:
+    """
+    Maps the class names stored in a file to the shape classes of the app.
+    """
+    classes: Dict[str, type] = shape_classes()
+    unknown: List[str] = [name for name in names if name not in classes]
+
+    if unknown:
+        raise ValueError(f'Unknown shape types: {", ".join(unknown)}')
+
+    return [classes[name] for name in names]
+
+class PickledShape:
+    """
+    What ShapeUnpickler creates in place of a shape: its class and pickled state, which read_pickle writes
+    into store columns all at once instead of giving every shape a store of its own.
+    """
+
+    __slots__ = ('state',)
+
+    kind: type
+
+    def __setstate__(self, state: Dict[str, Any] | tuple) -> None:
+        # objects with __slots__ and no __getstate__ pickle their state as (__dict__, slots)
+        if isinstance(state, tuple):
+            state = {**(state[0] or {}), **(state[1] if len(state) > 1 and state[1] else {})}
+
+        if not isinstance(state, dict):
+            raise pickle.UnpicklingError('a shape was saved without its attributes')
+
+        self.state = state
+
+class ShapeUnpickler(pickle.Unpickler):
+    """
+    Unpickler for legacy saves that only resolves shape classes, so opening a file can't run arbitrary code.
+    Shapes are loaded as PickledShape.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.stand_ins: Dict[type, type] = {}
+
+    def find_class(self, module: str, name: str) -> type:
+        shape_class: type | None = shape_classes().get(name)
+
+        if shape_class is None or module != shape_class.__module__:
+            raise pickle.UnpicklingError(f'{module}.{name} is not a shape')
+
+        if shape_class not in self.stand_ins:
+            self.stand_ins[shape_class] = type(name, (PickledShape,), {'__slots__': (), 'kind': shape_class})
+
+        return self.stand_ins[shape_class]
+
+class ProgressReader:
+    """
+    File wrapper reporting how much of the file has been read, for readers like pickle that consume it in pieces.
+    """
+
+    def __init__(self, file: BinaryIO, size: int, progress: PROGRESS) -> None:
+        self.file: BinaryIO = file
+        self.size: int = max(1, size)
+        self.progress: PROGRESS = progress
+        self.reported: float = 0
+
+    def _report(self) -> None:
+        fraction: float = self.file.tell() / self.size
+
+        # at most one report per percent
+        if fraction - self.reported >= 0.01 or fraction >= 1:
+            self.reported = fraction
+            self.progress(fraction)
+
+    def read(self, size: int = -1) -> bytes:
+        data: bytes = self.file.read(size)
+        self._report()
+        return data
+
+    def readline(self) -> bytes:
+        data: bytes = self.file.readline()
+        self._report()
+        return data
+
+    def readinto(self, buffer) -> int:
+        count: int = self.file.readinto(buffer)
+        self._report()
+        return count
+
+def read_pickle(file_path: str, progress: PROGRESS | None = None) -> ShapeStore:
+    """
+    Reads the list of shapes saved by versions of the app that exported pickles, straight into store columns.
+
+    Args:
+        file_path (str): The path of the pickle file.
+        progress (PROGRESS | None): Called with the fraction of the file read so far.
+
+    Returns:
+        ShapeStore: The shapes in the file.
+    """
+    with open(file_path, 'rb') as file:
+        source: BinaryIO | ProgressReader = ProgressReader(file, path.getsize(file_path), progress) if progress else file
+        loaded: Any = ShapeUnpickler(source).load()
+
+    if not isinstance(loaded, list) or not all(isinstance(shape, PickledShape) and hasattr(shape, 'state') for shape in loaded):
+        raise ValueError(f'{file_path} does not contain a list of shapes')
+
+    try:
+        shapes: ShapeStore = ShapeStore.from_states([shape.kind for shape in loaded], [shape.state for shape in loaded])
+    except (TypeError, ValueError) as error:
+        raise ValueError(f'{file_path} has shapes with invalid attributes ({error})') from error
+
+    _validate_columns(file_path, {name: shapes.column(name) for name in COLUMNS}, shapes.kinds)
+    return shapes
+
+def convert_pickle_to_dsd(pickle_path: str, dsd_path: str) -> int:
+    """
+    Converts a legacy pickle save into a .dsd file.
+
+    Args:
+        pickle_path (str): The pickle file to read.
+        dsd_path (str): The .dsd file to write.
+
+    Returns:
+        int: The number of shapes converted.
+    """
+    shapes: ShapeStore = read_pickle(pickle_path)
+    write_dsd(dsd_path, shapes)
+    return len(shapes)
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        print('usage: python Save.py <saved.pkl> <converted.dsd>')
+        sys.exit(2)
 
-    return output_list
+    print(f'Converted {convert_pickle_to_dsd(sys.argv[1], sys.argv[2])} shapes')
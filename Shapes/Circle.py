@@ -1,16 +1,37 @@
-from OpenGL.GLUT import *
-from OpenGL.GLU import *
+from typing import override
 from OpenGL.GL import *
 from math import *
 
 from Shapes.Polygon import Polygon
+from Shapes.unit_tables import circle_segments, CIRCLE_SIDES
+from Shapes.registry import register_shape
 from custom_types import *
 from constants import *
 
+@register_shape
 class Circle(Polygon):
     """
     Represents an circle shape.
     """
+    __slots__ = ()
+
     def __init__(self, start_coordinates: COORDINATE, end_coordinates: COORDINATE):
-        super().__init__(100, start_coordinates, end_coordinates)
+        super().__init__(CIRCLE_SIDES, start_coordinates, end_coordinates)
+
+    @override
+    def drawn_sides(self, radius: NUMBER) -> int:
+        """
+        Returns the number of segments the circle needs at a radius in canvas pixels to look smooth, see circle_segments.
+        """
+        return circle_segments(radius)
+
+    @override
+    def within_bounds(self, mouse_x: int, mouse_y: int) -> bool:
+        """
+        Checks whether the mouse is inside the circle, comparing its distance to the center with the radius.
 
+        Args:
+            mouse_x (int): The mouse x-coordinate.
+            mouse_y (int): The mouse y-coordinate.
+        """
+        return (mouse_x - self.center_x) ** 2 + (mouse_y - self.center_y) ** 2 < self.half_size ** 2
@@ -1,35 +1,41 @@
 from typing import List, Dict, Type
-from Shapes.Polygon import Polygon
-from Shapes.Shape import Shape
 
-from Shapes.Circle import Circle
-from Shapes.Hexagon import Hexagon
-from Shapes.Octagon import Octagon
-from Shapes.Pentagon import Pentagon
-from Shapes.Square import Square
-from Shapes.Triangle import Triangle
+from Shapes.registry import REGISTRY, scanned, discover
+from Shapes.Shape import Shape
 
 def names() -> List[str]:
     """
-    Static method to get the class names of all subclasses of Shape.
+    Returns:
+        List[str]: The class names of every registered shape.
+    """
+    return list(shapes())
+
+def shapes() -> Dict[str, Type[Shape]]:
+    """
+    Returns the registry of shape classes, discovering them on the first call.
+    The dictionary is shared, so lookups cost nothing, but it must not be modified.
 
     Returns:
-        List[str]: List of class names of all subclasses of Shape.
+        Dict[str, Type[Shape]]: Dictionary mapping class names to the registered shape classes.
     """
-    shape_names: List[str] = shapes()
-    return list(shape_names)
+    return REGISTRY if scanned else discover()
+
+# the side count of each shape class, filled by side_counts
+SIDE_COUNTS: Dict[Type[Shape], int | None] = {}
 
-def shapes() -> Dict[str, Type['Shape']]:
+def side_counts() -> Dict[Type[Shape], int | None]:
     """
-    Static method to get the class names and class objects of all subclasses of Shape.
+    Returns the number of sides every shape of each registered class has, read from a throwaway instance,
+    or None for classes whose instances don't have a fixed number of sides.
 
     Returns:
-        Dict[str, Type['Shape']]: Dictionary mapping class names to class objects of all subclasses of Shape.
+        Dict[Type[Shape], int | None]: Dictionary mapping the registered shape classes to their number of sides.
     """
-    shape_dictionary: Dict[str, Type[Shape|Polygon]] = {subclass.__name__: subclass for subclass in Shape.__subclasses__()}
-    polygon_dictionary: Dict[str, Type[Shape|Polygon]] = {subclass.__name__: subclass for subclass in Polygon.__subclasses__()}
+    for shape_class in shapes().values():
+        if shape_class not in SIDE_COUNTS:
+            try:
+                SIDE_COUNTS[shape_class] = int(shape_class(start_coordinates=[0, 0], end_coordinates=[1, 1]).number_of_sides)
+            except (TypeError, AttributeError):
+                SIDE_COUNTS[shape_class] = None
 
-    shape_dictionary.pop('Polygon')
-    merged: Dict[str, Type[Shape|Polygon]] = shape_dictionary.copy()
-    merged.update(polygon_dictionary)
-    return merged
+    return SIDE_COUNTS
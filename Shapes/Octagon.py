@@ -1,16 +1,18 @@
-from OpenGL.GLUT import *
-from OpenGL.GLU import *
 from OpenGL.GL import *
 from math import *
 
 from Shapes.Polygon import Polygon
+from Shapes.registry import register_shape
 from custom_types import *
 from constants import *
 
+@register_shape
 class Octagon(Polygon):
     """
     Represents an octagon shape.
     """
+    __slots__ = ()
+
     def __init__(self, start_coordinates: COORDINATE, end_coordinates: COORDINATE):
         super().__init__(8, start_coordinates, end_coordinates)
 
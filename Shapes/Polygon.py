@@ -1,13 +1,17 @@
 from typing import override
-from OpenGL.GLUT import *
-from OpenGL.GLU import *
 from OpenGL.GL import *
 from math import *
 
+from Shapes.ShapeStore import StoreField
+from Shapes.unit_tables import unit_vertices
 from Shapes.Shape import Shape
 from custom_types import *
 from constants import *
 
+# phase of the first vertex for the fill and for the selection border (see Renderers.SelectionMesh)
+FILL_PHASE: float = pi / -10
+BORDER_PHASE: float = pi / 10
+
 class Polygon(Shape):
     """
     Abstract base class representing a geometric shape.
@@ -15,6 +19,7 @@ class Polygon(Shape):
     Attributes:
         static_field canvas_width (NUMBER): the width of the canvas
         static_field canvas_height (NUMBER): the height of the canvas
+        static_field scale (NUMBER): the canvas pixels per world unit shapes are drawn at
         background_color (RGB): The RGB values of the background color.
         border_color (RGB): The RGB values of the border color.
         width (NUMBER): The width of the shape.
@@ -22,8 +27,17 @@ class Polygon(Shape):
         start_coordinates (COORDINATE): The start coordinates of the shape's position.
         end_coordinates (COORDINATE): The end coordinates of the shape's position.
         selected (bool): Flag indicating if the shape is selected.
+        number_of_sides (int): The number of sides the polygon has.
+        padding (int): The gap between the polygon and its selection border.
     """
 
+    __slots__ = ()
+
+    padding: int = 10
+    number_of_sides: int = StoreField('sides', int)
+
+    STATE_FIELDS: Tuple[str, ...] = (*Shape.STATE_FIELDS, 'number_of_sides', 'padding')
+
     def __init__(self, number_of_sides: int, start_coordinates: COORDINATE, end_coordinates: COORDINATE, border_color: RGB = WHITE, background_color: RGB = WHITE, angle: NUMBER = 0) -> None:
         """
         Initializes a Shape object with the given parameters.
@@ -37,76 +51,54 @@ class Polygon(Shape):
             angle (NUMBER): The shapes initial angle of rotation.
         """
         super().__init__(start_coordinates, end_coordinates, border_color, background_color, angle)
-        self.number_of_sides: int = number_of_sides
-        self.padding: int = 10
+        self.number_of_sides = number_of_sides
 
-    def draw(self) -> None:
+    def drawn_sides(self, radius: NUMBER) -> int:
         """
-        Draws a polygon using GL_POLYGON
-
-        Args:
-            - self.number_of_sides (int): The number of sides for the polyon. Defaults to 0
+        Returns the number of vertices the polygon is drawn with at a radius in canvas pixels, which is its number of sides.
         """
-        glColor3f(*self.background_color)
-        glBegin(GL_POLYGON)
-        for index in range(self.number_of_sides):
-            angle = 2 * pi * index / self.number_of_sides + pi / -10
-            x: NUMBER = self.center_x + self.half_size * cos(angle)
-            y: NUMBER = self.center_y + self.half_size * sin(angle)
-            glVertex2f(x, y)
-        glEnd()
-
-        self.draw_border()
+        return self.number_of_sides
 
-    def draw_border(self) -> None:
+    def draw(self) -> None:
         """
-        Draws a polygon using GL_LINE_LOOP instead of GL_POLYGON.
-        After that, it draws a circle to where each point meet.
+        Draws a polygon using GL_POLYGON. The border of a selected polygon is drawn by the renderer.
 
         Args:
             - self.number_of_sides (int): The number of sides for the polyon. Defaults to 0
         """
-        if not self.selected:
-            return
+        center_x, center_y, half_size = self.center_x, self.center_y, self.half_size
 
-        glColor3f(*self.border_color)
-
-        self.border_endpoints = []
-
-        glBegin(GL_LINE_LOOP)
-        for index in range(self.number_of_sides):
-            angle: NUMBER = 2 * pi * index / self.number_of_sides + pi / 10
-            x: NUMBER = self.center_x + (self.half_size + self.padding) * cos(-angle)
-            y: NUMBER = self.center_y + (self.half_size + self.padding) * sin(-angle)
+        glColor3f(*self.background_color)
+        glBegin(GL_POLYGON)
+        for unit_x, unit_y in unit_vertices(self.drawn_sides(half_size * self.scale), FILL_PHASE):
+            x: NUMBER = center_x + half_size * unit_x
+            y: NUMBER = center_y + half_size * unit_y
             glVertex2f(x, y)
-
-            endpoint: ENDPOINT = (x, y)
-            self.border_endpoints.append(endpoint)
         glEnd()
 
-        # Prevent circle from having dots
-        if self.border_endpoints and self.number_of_sides != 100:
-            for endpoint in self.border_endpoints:
-                self.draw_dot_at(*endpoint)
-
     @override
     def within_bounds(self, mouse_x: int, mouse_y: int) -> None:
         """
         Checks whether the mouse is inside the polygon.
+        Shapes.vectorized.within_bounds_batch runs the same test over many shapes and points at once.
 
         Args:
             x (int): The mouse x-coordinate.
             y (int): The mouse y-coordinate.
             self.number_of_sides (int): The number of sides the polygon has.
         """
-        vertices: VERTICES = []
-
-        for index in range(self.number_of_sides):
-            angle = 2 * pi * index / self.number_of_sides + radians(self.angle)
-            x: NUMBER = self.center_x + self.half_size * cos(angle)
-            y: NUMBER = self.center_y + self.half_size * sin(angle)
-            endpoint: Tuple[NUMBER, NUMBER] = (x, y)
-            vertices.append(endpoint)
+        # Rotating the mouse into the shape's frame costs one cos/sin pair instead of one per vertex
+        rotation: float = radians(self.angle)
+        offset_x: NUMBER = mouse_x - self.center_x
+        offset_y: NUMBER = mouse_y - self.center_y
+
+        mouse_x = offset_x * cos(rotation) + offset_y * sin(rotation)
+        mouse_y = offset_y * cos(rotation) - offset_x * sin(rotation)
+
+        vertices: VERTICES = [
+            (self.half_size * unit_x, self.half_size * unit_y)
+            for unit_x, unit_y in unit_vertices(self.number_of_sides)
+        ]
 
         crossings: int = 0
 
@@ -1,9 +1,9 @@
 from abc import ABC, abstractmethod
-from OpenGL.GLUT import *
-from OpenGL.GLU import *
+from typing import Dict
 from OpenGL.GL import *
 from math import *
 
+from Shapes.ShapeStore import ShapeStore, StoreField, as_tuple
 from custom_types import *
 from constants import *
 
@@ -11,9 +11,13 @@ class Shape(ABC):
     """
     Abstract base class representing a geometric shape.
 
+    A shape is a view on one row of a ShapeStore: every attribute below is read from and written to
+    the store's columns, so the instance itself only holds the store and its row.
+
     Attributes:
         static_field canvas_width (NUMBER): the width of the canvas
         static_field canvas_height (NUMBER): the height of the canvas
+        static_field scale (NUMBER): the canvas pixels per world unit shapes are drawn at
         background_color (RGB): The RGB values of the background color.
         border_color (RGB): The RGB values of the border color.
         width (NUMBER): The width of the shape.
@@ -21,10 +25,30 @@ class Shape(ABC):
         start_coordinates (COORDINATE): The start coordinates of the shape's position.
         end_coordinates (COORDINATE): The end coordinates of the shape's position.
         selected (bool): Flag indicating if the shape is selected.
+        store (ShapeStore): The store holding the shape's values.
+        row (int): The row of the shape in its store.
     """
 
+    __slots__ = ('store', 'row')
+
     canvas_width: NUMBER = 0
     canvas_height: NUMBER = 0
+    scale: NUMBER = 1
+
+    background_color: RGB = StoreField('background_color', as_tuple)
+    border_color: RGB = StoreField('border_color', as_tuple)
+    selected: bool = StoreField('selected', bool)
+    start_coordinates: COORDINATE = StoreField('start', as_tuple)
+    end_coordinates: COORDINATE = StoreField('end', as_tuple)
+    angle: NUMBER = StoreField('angle', float)
+    center_x: NUMBER = StoreField('center', float, 0)
+    center_y: NUMBER = StoreField('center', float, 1)
+    half_size: NUMBER = StoreField('half_size', float)
+
+    # attributes written when pickling, named like the instance attributes shapes used to have
+    STATE_FIELDS: Tuple[str, ...] = (
+        'background_color', 'border_color', 'selected', 'start_coordinates', 'end_coordinates', 'angle', 'center_x', 'center_y', 'half_size'
+    )
 
     def __init__(self, start_coordinates: COORDINATE, end_coordinates: COORDINATE, border_color: RGB = WHITE, background_color: RGB = WHITE, angle: NUMBER = 0) -> None:
         """
@@ -37,20 +61,35 @@ class Shape(ABC):
             start_coordinates (COORDINATE): The start coordinates of the shape's position.
             end_coordinates (COORDINATE): The end coordinates of the shape's position.
         """
-        self.background_color: RGB = background_color
-        self.border_color: RGB = border_color
-        self.selected: bool = False
+        ShapeStore.detach(self)
+
+        self.background_color = background_color
+        self.border_color = border_color
+        self.selected = False
 
-        self.start_coordinates: COORDINATE = start_coordinates
-        self.end_coordinates: COORDINATE = end_coordinates
-        self.angle: NUMBER = angle
+        self.start_coordinates = start_coordinates
+        self.end_coordinates = end_coordinates
+        self.angle = angle
+
+        self.center_x = (self.start_coordinates[0] + self.end_coordinates[0]) / 2
+        self.center_y = (self.start_coordinates[1] + self.end_coordinates[1]) / 2
+        self.half_size = min(self.width, self.height) / 2
 
-        self.center_x: NUMBER = (self.start_coordinates[0] + self.end_coordinates[0]) / 2
-        self.center_y: NUMBER = (self.start_coordinates[1] + self.end_coordinates[1]) / 2
-        self.half_size: NUMBER = min(self.width, self.height) / 2
+    def __getstate__(self) -> Dict[str, object]:
+        """
+        Pickles the shape as a dictionary of its attributes, the same layout as files saved before shapes were store views.
+        """
+        return {name: getattr(self, name) for name in self.STATE_FIELDS}
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        """
+        Restores a pickled shape into a private store. Keys that are not store fields are ignored.
+        """
+        ShapeStore.detach(self)
 
-        # list of endpoints where the tip of each line meet (for creating dots)
-        self.border_endpoints: VERTICES = []
+        for name, value in state.items():
+            if isinstance(getattr(type(self), name, None), StoreField):
+                setattr(self, name, value)
 
     @property
     def width(self) -> NUMBER:
@@ -60,24 +99,6 @@ class Shape(ABC):
     def height(self) -> NUMBER:
         return abs(self.start_coordinates[1] - self.end_coordinates[1])
 
-    def draw_dot_at(self, x, y) -> None:
-        """
-        Draw a circle at the specified (x, y) coordinate.
-
-        Args:
-            x (int, int): The x-coordinate of the center of the circle.
-            y (int, int): The y-coordinate of the center of the circle.
-        """
-        num_segments: int = 100
-        radius: int = 4
-
-        glBegin(GL_POLYGON)
-        glColor3f(*self.background_color)
-        for index in range(num_segments):
-            theta = 2.0 * 3.1415926 * index / num_segments
-            glVertex2f(x + radius * cos(theta), y + radius * sin(theta))
-        glEnd()
-
     @abstractmethod
     def draw(self) -> None:
         """
@@ -153,7 +174,8 @@ class Shape(ABC):
         """
         self.angle += 1
 
-    def set_new_color_from_hex(self, hex_color: str) -> Tuple:
+    @staticmethod
+    def rgb_from_hex(hex_color: str) -> Tuple:
         """
         Convert a hexadecimal color string to RGB floats.
 
@@ -167,9 +189,13 @@ class Shape(ABC):
         hex_color = hex_color.lstrip('#')
 
         # Convert hexadecimal to RGB
-        rgb: Tuple[int] = tuple(int(hex_color[index: index + 2], 16) / 255.0 for index in (0, 2, 4))
+        return tuple(int(hex_color[index: index + 2], 16) / 255.0 for index in (0, 2, 4))
 
-        self.background_color = rgb
+    def set_new_color_from_hex(self, hex_color: str) -> None:
+        """
+        Sets the background color from a hexadecimal color string (e.g., "#051dff").
+        """
+        self.background_color = Shape.rgb_from_hex(hex_color)
 
     def move_up(self) -> None:
         """
@@ -0,0 +1,634 @@
+# for type checking purposes.
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from Shapes.Shape import Shape
+
+# start of code
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Set, Tuple, Type
+import numpy as np
+
+from Shapes.vectorized import within_bounds_batch
+
+# column name: (dtype, shape of one row)
+COLUMNS: Dict[str, Tuple[type, Tuple[int, ...]]] = {
+    'kind': (np.int16, ()),
+    'start': (np.float64, (2,)),
+    'end': (np.float64, (2,)),
+    'center': (np.float64, (2,)),
+    'half_size': (np.float64, ()),
+    'angle': (np.float64, ()),
+    'sides': (np.int32, ()),
+    'background_color': (np.float32, (3,)),
+    'border_color': (np.float32, (3,)),
+    'selected': (np.bool_, ()),
+}
+
+def as_tuple(value: np.ndarray) -> Tuple:
+    return tuple(value.tolist())
+
+class StoreField:
+    """
+    Descriptor exposing one row of a ShapeStore column as an attribute of a shape view.
+    """
+
+    def __init__(self, column: str, convert: Callable[[Any], Any], component: int | None = None) -> None:
+        """
+        Args:
+            column (str): The name of the column in COLUMNS.
+            convert (Callable): Turns the stored numpy value into the Python value the shape exposes.
+            component (int | None): For vector columns, the component to expose on its own.
+        """
+        self.column: str = column
+        self.convert: Callable[[Any], Any] = convert
+        self.component: int | None = component
+
+    def __get__(self, shape: Type[Shape] | None, owner: type) -> Any:
+        if shape is None:
+            return self
+
+        value = shape.store.columns[self.column][shape.row]
+        return self.convert(value if self.component is None else value[self.component])
+
+    def __set__(self, shape: Type[Shape], value: Any) -> None:
+        if self.component is None:
+            shape.store.columns[self.column][shape.row] = value
+        else:
+            shape.store.columns[self.column][shape.row, self.component] = value
+
+class ShapeStore:
+    """
+    Keeps every shape attribute in contiguous typed arrays, one row per shape, in z-order.
+
+    Shape instances are thin views holding a reference to a store and a row, so renderers and
+    hit-testing can work on whole columns at once while the rest of the app keeps using the Shape API.
+    A shape created on its own lives in a private single-row store until it is appended to another one.
+    The store behaves like the list of shapes it replaces: it supports len, iteration, indexing,
+    append and remove.
+
+    Attributes:
+        count (int): The number of shapes in the store.
+        columns (Dict[str, np.ndarray]): The backing arrays, with room for more rows than count.
+        kinds (List[type]): The shape classes, indexed by the values of the kind column.
+    """
+
+    INITIAL_CAPACITY: int = 16
+
+    def __init__(self, shapes: Iterable[Type[Shape]] = (), capacity: int = INITIAL_CAPACITY) -> None:
+        """
+        Initializes a store, moving the given shapes into it.
+
+        Args:
+            shapes (Iterable[Type[Shape]]): Shapes to append, from bottom to top.
+            capacity (int): The number of rows to allocate up front.
+        """
+        self.count: int = 0
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.zeros((capacity, *row_shape), dtype=dtype) for name, (dtype, row_shape) in COLUMNS.items()
+        }
+        self.kinds: List[type] = []
+        self.kind_codes: Dict[type, int] = {}
+
+        # views are created on first access, so stores built from columns don't pay for them up front
+        self.views: List[Type[Shape] | None] = []
+
+        for shape in shapes:
+            self.append(shape)
+
+    @classmethod
+    def detach(cls, shape: Type[Shape]) -> None:
+        """
+        Gives a shape a private single-row store, copying its current row when it already has one.
+
+        Args:
+            shape (Type[Shape]): The shape to detach.
+        """
+        store: ShapeStore = cls(capacity=1)
+
+        if getattr(shape, 'store', None) is None:
+            shape.store, shape.row = store, store._new_row(type(shape))
+            store.views.append(shape)
+            return
+
+        store.append(shape)
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, np.ndarray], kinds: List[type]) -> ShapeStore:
+        """
+        Builds a store directly on top of existing column arrays without creating any view.
+
+        Args:
+            columns (Dict[str, np.ndarray]): One array per column in COLUMNS, all with the same length.
+            kinds (List[type]): The shape classes, indexed by the values of the kind column.
+
+        Returns:
+            ShapeStore: The new store.
+        """
+        store: ShapeStore = cls(capacity=0)
+        store.columns = {name: columns[name] for name in COLUMNS}
+        store.count = len(columns['kind'])
+        store.kinds = list(kinds)
+        store.kind_codes = {kind: code for code, kind in enumerate(store.kinds)}
+        store.views = [None] * store.count
+        return store
+
+    @classmethod
+    def from_states(cls, kinds: List[type], states: List[Dict[str, Any]]) -> ShapeStore:
+        """
+        Builds a store from the pickled states of shapes (see Shape.__getstate__) without creating any shape,
+        writing each attribute into its column for every shape at once. Keys that are not store fields are
+        ignored and missing ones are left at zero, like Shape.__setstate__ does.
+
+        Args:
+            kinds (List[type]): The class of each shape.
+            states (List[Dict[str, Any]]): The state of each shape, in the same order.
+
+        Returns:
+            ShapeStore: The new store.
+        """
+        count: int = len(states)
+        store: ShapeStore = cls(capacity=count)
+        store.count = count
+        store.views = [None] * count
+
+        codes: np.ndarray = np.fromiter((store._kind_code(kind) for kind in kinds), dtype=np.int16, count=count)
+        store.columns['kind'][:count] = codes
+
+        rows_of_kind: Dict[type, List[int]] = {}
+
+        for row, kind in enumerate(kinds):
+            rows_of_kind.setdefault(kind, []).append(row)
+
+        # one numpy assignment per attribute of each kind, for the rows whose state has it
+        for kind, rows in rows_of_kind.items():
+            names: Set[str] = set().union(*(states[row].keys() for row in rows))
+
+            for name in names:
+                field: Any = getattr(kind, name, None)
+
+                if not isinstance(field, StoreField):
+                    continue
+
+                present: List[int] = [row for row in rows if name in states[row]]
+                values: List[Any] = [states[row][name] for row in present]
+                column: np.ndarray = store.columns[field.column]
+
+                if field.component is None:
+                    column[present] = values
+                else:
+                    column[present, field.component] = values
+
+        return store
+
+    def snapshot(self) -> ShapeStore:
+        """
+        Returns a copy of the used rows that later edits to this store won't affect, for readers on other threads.
+        """
+        return ShapeStore.from_columns({name: self.column(name).copy() for name in self.columns}, self.kinds)
+
+    def subset(self, rows: np.ndarray) -> ShapeStore:
+        """
+        Returns a copy of some rows, in the same order, without any view.
+        """
+        return ShapeStore.from_columns({name: self.column(name)[rows] for name in self.columns}, self.kinds)
+
+    # List behaviour
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Type[Shape]]:
+        for row in range(self.count):
+            yield self.view(row)
+
+    def __getitem__(self, key: int | slice) -> Type[Shape] | List[Type[Shape]]:
+        if isinstance(key, slice):
+            return [self.view(row) for row in range(self.count)[key]]
+
+        if key < 0:
+            key += self.count
+
+        if not 0 <= key < self.count:
+            raise IndexError('shape index out of range')
+
+        return self.view(key)
+
+    def __contains__(self, shape: Type[Shape]) -> bool:
+        return getattr(shape, 'store', None) is self
+
+    def index(self, shape: Type[Shape]) -> int:
+        if shape not in self:
+            raise ValueError('shape is not in this store')
+
+        return shape.row
+
+    def append(self, shape: Type[Shape]) -> None:
+        """
+        Moves a shape to the top of this store, copying its row out of the store it was in.
+
+        Args:
+            shape (Type[Shape]): The shape to append.
+        """
+        if shape in self:
+            raise ValueError('shape is already in this store')
+
+        source, source_row = shape.store, shape.row
+        row: int = self._new_row(type(shape))
+
+        for name, column in self.columns.items():
+            if name != 'kind':
+                column[row] = source.columns[name][source_row]
+
+        # the private store of a detached shape is dropped along with it, there is nothing to shift
+        if source.count == 1:
+            source.count = 0
+            source.views = []
+        else:
+            source._delete_row(source_row)
+
+        shape.store, shape.row = self, row
+        self.views.append(shape)
+
+    def extend(self, shapes: Iterable[Type[Shape]]) -> None:
+        for shape in shapes:
+            self.append(shape)
+
+    def insert(self, row: int, shape: Type[Shape]) -> None:
+        """
+        Moves a shape into this store at a row, shifting the shapes from that row up by one.
+
+        Args:
+            row (int): The row the shape ends up at. The count of the store appends it on top.
+            shape (Type[Shape]): The shape to insert.
+        """
+        self.append(shape)
+
+        if row >= self.count - 1:
+            return
+
+        for column in self.columns.values():
+            column[row:self.count] = np.roll(column[row:self.count], 1, axis=0)
+
+        self.views.insert(row, self.views.pop())
+        self._renumber_views(row)
+
+    def extend_store(self, other: ShapeStore) -> None:
+        """
+        Moves every shape of another store on top of this one, copying whole columns at once.
+        The other store is left empty, and the views it had created now point into this store.
+
+        Args:
+            other (ShapeStore): The store to empty into this one.
+        """
+        first: int = self.count
+        self._reserve(first + other.count)
+
+        for name, column in self.columns.items():
+            if name != 'kind':
+                column[first:first + other.count] = other.column(name)
+
+        codes: np.ndarray = np.array([self._kind_code(kind) for kind in other.kinds], dtype=np.int16)
+        self.columns['kind'][first:first + other.count] = codes[other.column('kind')] if other.count else 0
+        self.count += other.count
+
+        for row, shape in enumerate(other.views, first):
+            if shape is not None:
+                shape.store, shape.row = self, row
+
+        self.views.extend(other.views)
+        other.views = []
+        other.count = 0
+
+    def take(self, rows: np.ndarray) -> ShapeStore:
+        """
+        Removes many rows at once, keeping the order of the remaining ones.
+
+        Args:
+            rows (np.ndarray): The rows to remove, sorted and without duplicates.
+
+        Returns:
+            ShapeStore: The removed shapes, in the same order. Their views now point into it.
+        """
+        keep: np.ndarray = np.ones(self.count, dtype=bool)
+        keep[rows] = False
+
+        taken: ShapeStore = ShapeStore.from_columns({name: self.column(name)[rows] for name in self.columns}, self.kinds)
+        taken.views = [self.views[row] for row in rows.tolist()]
+
+        for row, shape in enumerate(taken.views):
+            if shape is not None:
+                shape.store, shape.row = taken, row
+
+        remaining: int = int(keep.sum())
+
+        for name, column in self.columns.items():
+            column[:remaining] = column[:self.count][keep]
+
+        self.views = [shape for shape, kept in zip(self.views, keep.tolist()) if kept]
+        self.count = remaining
+        self._renumber_views(int(rows[0]) if len(rows) else remaining)
+        return taken
+
+    def put(self, rows: np.ndarray, other: ShapeStore) -> None:
+        """
+        Moves every shape of another store back into this one at the given rows, undoing take.
+
+        Args:
+            rows (np.ndarray): The row each shape of other ends up at, sorted and without duplicates.
+            other (ShapeStore): The store to empty into this one.
+        """
+        total: int = self.count + other.count
+        self._reserve(total)
+
+        placed: np.ndarray = np.zeros(total, dtype=bool)
+        placed[rows] = True
+
+        codes: np.ndarray = np.array([self._kind_code(kind) for kind in other.kinds], dtype=np.int16)
+
+        for name, column in self.columns.items():
+            merged: np.ndarray = np.empty((total, *column.shape[1:]), dtype=column.dtype)
+            merged[~placed] = column[:self.count]
+            merged[placed] = codes[other.column(name)] if name == 'kind' and other.count else other.column(name)
+            column[:total] = merged
+
+        views: Iterator[Type[Shape] | None] = iter(self.views)
+        others: Iterator[Type[Shape] | None] = iter(other.views)
+        self.views = [next(others) if is_placed else next(views) for is_placed in placed.tolist()]
+        self.count = total
+
+        for row in rows.tolist():
+            shape: Type[Shape] | None = self.views[row]
+
+            if shape is not None:
+                shape.store = self
+
+        self._renumber_views(int(rows[0]) if len(rows) else total)
+        other.views = []
+        other.count = 0
+
+    def chunks(self, size: int) -> Iterator[ShapeStore]:
+        """
+        Splits the store into stores of at most size rows, whose columns are views of this store's columns.
+        """
+        for first in range(0, self.count, size):
+            yield ShapeStore.from_columns({name: self.column(name)[first:first + size] for name in self.columns}, self.kinds)
+
+    def remove(self, shape: Type[Shape]) -> None:
+        """
+        Removes a shape from this store. The shape keeps its values in a private store of its own.
+
+        Args:
+            shape (Type[Shape]): The shape to remove.
+        """
+        if shape not in self:
+            raise ValueError('shape is not in this store')
+
+        ShapeStore.detach(shape)
+
+    # Columns
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Returns the used rows of a column. The result is a view, so writing to it updates the shapes.
+        """
+        return self.columns[name][:self.count]
+
+    @property
+    def centers(self) -> np.ndarray:
+        return self.column('center')
+
+    @property
+    def half_sizes(self) -> np.ndarray:
+        return self.column('half_size')
+
+    @property
+    def angles(self) -> np.ndarray:
+        return self.column('angle')
+
+    @property
+    def sides(self) -> np.ndarray:
+        return self.column('sides')
+
+    @property
+    def background_colors(self) -> np.ndarray:
+        return self.column('background_color')
+
+    @property
+    def border_colors(self) -> np.ndarray:
+        return self.column('border_color')
+
+    @property
+    def selected(self) -> np.ndarray:
+        return self.column('selected')
+
+    def own_columns(self) -> None:
+        """
+        Copies columns that view memory the store doesn't own, such as a memory-mapped file, into arrays of its own.
+        """
+        for name, column in self.columns.items():
+            if column.base is not None:
+                self.columns[name] = column.copy()
+
+    def kind_of(self, row: int) -> type:
+        return self.kinds[self.columns['kind'][row]]
+
+    # Bulk edits, each applied to many rows with one numpy operation
+
+    def translate(self, rows: np.ndarray, offset_x: float, offset_y: float) -> None:
+        """
+        Moves the shapes of the given rows like Shape.move_up and its siblings do.
+        """
+        self.columns['center'][rows] += (offset_x, offset_y)
+
+    def rotate(self, rows: np.ndarray, degrees: float) -> None:
+        """
+        Rotates the shapes of the given rows, clockwise for positive degrees.
+        """
+        self.columns['angle'][rows] += degrees
+
+    def resize(self, rows: np.ndarray, amount: float) -> None:
+        """
+        Moves the end corner of the shapes of the given rows by amount pixels on both axes, like
+        Shape.increase_shape and Shape.decrease_shape do. Shapes 10 pixels wide or less aren't shrunk.
+        """
+        if amount < 0:
+            widths: np.ndarray = np.abs(self.columns['start'][rows, 0] - self.columns['end'][rows, 0])
+            rows = rows[widths > 10]
+
+        self.columns['end'][rows] += amount
+        sizes: np.ndarray = np.abs(self.columns['start'][rows] - self.columns['end'][rows])
+        self.columns['half_size'][rows] = sizes.min(axis=1) / 2
+
+    def recolor(self, rows: np.ndarray, color: Tuple[float, float, float]) -> None:
+        """
+        Sets the background color of the shapes of the given rows.
+        """
+        self.columns['background_color'][rows] = color
+
+    def select(self, rows: np.ndarray | None = None) -> None:
+        """
+        Selects the shapes of the given rows and deselects every other one. None deselects everything.
+        """
+        self.selected[:] = False
+
+        if rows is not None:
+            self.selected[rows] = True
+
+    # Queries
+
+    def circles(self, rows: np.ndarray | slice = slice(None)) -> np.ndarray:
+        """
+        Returns whether the shapes of the given rows, all of them by default, are circles. It is read from
+        the kind column, since a polygon may have as many sides as circles are stored with.
+        """
+        # Circle is built on this module, so it can only be imported once both are loaded
+        from Shapes.Circle import Circle
+
+        codes: List[int] = [code for kind, code in self.kind_codes.items() if issubclass(kind, Circle)]
+        return np.isin(self.column('kind')[rows], codes)
+
+    def bounds(self) -> Tuple[float, float, float, float] | None:
+        """
+        Returns the rectangle around the bounding circles of every shape, as left, top, right, bottom, or None when the store is empty.
+        """
+        if not self.count:
+            return None
+
+        low: np.ndarray = (self.centers - self.half_sizes[:, None]).min(axis=0)
+        high: np.ndarray = (self.centers + self.half_sizes[:, None]).max(axis=0)
+        return float(low[0]), float(low[1]), float(high[0]), float(high[1])
+
+    def topmost_within_bounds(self, mouse_x: float, mouse_y: float, rows: Iterable[int] | None = None) -> Type[Shape] | None:
+        """
+        Returns the topmost shape containing the point, testing the given rows or the whole store.
+
+        Args:
+            mouse_x (float): The x-coordinate of the point.
+            mouse_y (float): The y-coordinate of the point.
+            rows (Iterable[int] | None): The rows to test, for example the candidates of a spatial index.
+
+        Returns:
+            Type[Shape] | None: The shape under the point, or None.
+        """
+        rows = np.arange(self.count) if rows is None else np.fromiter(rows, dtype=np.int64)
+
+        if rows.size == 0:
+            return None
+
+        hits: np.ndarray = within_bounds_batch(
+            mouse_x, mouse_y, self.centers[rows], self.half_sizes[rows], self.angles[rows], self.sides[rows], self.circles(rows)
+        )
+
+        if not hits.any():
+            return None
+
+        return self.view(int(rows[hits].max()))
+
+    def intersecting_rectangle(self, left: float, top: float, right: float, bottom: float, rows: Iterable[int] | None = None, margins: np.ndarray | float = 0) -> np.ndarray:
+        """
+        Returns the rows of the shapes whose bounds intersect or lie inside a rectangle, testing the given rows or the whole store.
+        The bounds of a shape are the box around its bounding circle, the same the spatial index registers.
+        The bounding circle doesn't depend on the rotation, so neither does the result.
+
+        Args:
+            left (float): The smallest x-coordinate of the rectangle.
+            top (float): The smallest y-coordinate of the rectangle.
+            right (float): The largest x-coordinate of the rectangle.
+            bottom (float): The largest y-coordinate of the rectangle.
+            rows (Iterable[int] | None): The rows to test, for example the candidates of a spatial index.
+            margins (np.ndarray | float): Added to the radius of the bounding circles, one per tested row or for all of them.
+
+        Returns:
+            np.ndarray: The matching rows, sorted.
+        """
+        rows = np.arange(self.count) if rows is None else np.sort(np.fromiter(rows, dtype=np.int64))
+
+        centers: np.ndarray = self.centers[rows]
+        radii: np.ndarray = self.half_sizes[rows] + margins
+
+        hits: np.ndarray = (
+            (centers[:, 0] + radii >= left) & (centers[:, 0] - radii <= right)
+            & (centers[:, 1] + radii >= top) & (centers[:, 1] - radii <= bottom)
+        )
+
+        return rows[hits]
+
+    # Rows
+
+    def view(self, row: int) -> Type[Shape]:
+        """
+        Returns the shape of a row, creating its view the first time it is needed.
+        """
+        shape: Type[Shape] | None = self.views[row]
+
+        if shape is None:
+            kind: type = self.kind_of(row)
+            shape = kind.__new__(kind)
+            shape.store, shape.row = self, row
+            self.views[row] = shape
+
+        return shape
+
+    def _kind_code(self, kind: type) -> int:
+        code: int | None = self.kind_codes.get(kind)
+
+        if code is None:
+            code = len(self.kinds)
+            self.kinds.append(kind)
+            self.kind_codes[kind] = code
+
+        return code
+
+    def _reserve(self, capacity: int) -> None:
+        """
+        Grows every column so it can hold at least capacity rows.
+        """
+        current: int = len(self.columns['kind'])
+
+        if capacity <= current:
+            return
+
+        capacity = max(capacity, current * 2, self.INITIAL_CAPACITY)
+
+        for name, column in self.columns.items():
+            grown: np.ndarray = np.zeros((capacity, *column.shape[1:]), dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            self.columns[name] = grown
+
+    def _new_row(self, kind: type) -> int:
+        """
+        Adds a zeroed row on top and returns its index. The caller is responsible for its view.
+        """
+        self._reserve(self.count + 1)
+        row: int = self.count
+        self.count += 1
+
+        for column in self.columns.values():
+            column[row] = 0
+
+        self.columns['kind'][row] = self._kind_code(kind)
+        return row
+
+    def _delete_row(self, row: int) -> None:
+        """
+        Removes a row, shifting every row above it down by one.
+        """
+        for column in self.columns.values():
+            column[row:self.count - 1] = column[row + 1:self.count]
+
+        self.count -= 1
+        del self.views[row]
+        self._renumber_views(row)
+
+    def _renumber_views(self, first: int) -> None:
+        """
+        Gives the views from row first up the row they are now at, after rows below them moved.
+        """
+        for row in range(first, self.count):
+            shape: Type[Shape] | None = self.views[row]
+
+            if shape is not None:
+                shape.row = row
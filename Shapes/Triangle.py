@@ -1,15 +1,17 @@
-from OpenGL.GLUT import *
-from OpenGL.GLU import *
 from OpenGL.GL import *
 from math import *
 
 from Shapes.Polygon import Polygon
+from Shapes.registry import register_shape
 from custom_types import *
 from constants import *
 
+@register_shape
 class Triangle(Polygon):
     """
     Represents a triangle shape.
     """
+    __slots__ = ()
+
     def __init__(self, start_coordinates: COORDINATE, end_coordinates: COORDINATE):
         super().__init__(3, start_coordinates, end_coordinates)
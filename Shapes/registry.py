@@ -0,0 +1,57 @@
+# for type checking purposes.
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from Shapes.Shape import Shape
+
+# start of code
+from typing import Dict, List, Tuple, Type
+from importlib import import_module
+from pkgutil import iter_modules
+import os
+
+# every shape class decorated with register_shape, by class name, in registration order
+REGISTRY: Dict[str, Type[Shape]] = {}
+
+# (directory, modification time) of the package directories when they were last scanned
+scanned: List[Tuple[str, int]] = []
+
+def register_shape(shape_class: Type[Shape]) -> Type[Shape]:
+    """
+    Class decorator adding a shape to the registry, which makes it available in the toolbar, imports and autosaves.
+
+    Args:
+        shape_class (Type[Shape]): The shape class to register.
+
+    Returns:
+        Type[Shape]: The same class.
+    """
+    REGISTRY[shape_class.__name__] = shape_class
+    return shape_class
+
+def discover() -> Dict[str, Type[Shape]]:
+    """
+    Imports every module of the Shapes package so their shape classes register themselves.
+
+    The package is only listed again when the modification time of one of its directories changed
+    since the last scan, so calling this again is cheap. Nothing is written to disk, so it works
+    from read-only installs.
+
+    Returns:
+        Dict[str, Type[Shape]]: The registry.
+    """
+    import Shapes
+
+    directories: List[Tuple[str, int]] = [(directory, os.stat(directory).st_mtime_ns) for directory in Shapes.__path__]
+
+    if directories == scanned:
+        return REGISTRY
+
+    for module in sorted(iter_modules(Shapes.__path__), key=lambda module: module.name):
+        import_module(f'Shapes.{module.name}')
+
+    scanned[:] = directories
+    return REGISTRY
@@ -0,0 +1,80 @@
+from functools import lru_cache
+from math import acos, ceil, cos, log2, sin, pi
+from typing import Tuple
+import numpy as np
+
+type UNIT_TABLE = Tuple[Tuple[float, float], ...]
+
+# circles are stored as polygons with this many sides, but drawn with a segment count picked from their radius
+CIRCLE_SIDES: int = 100
+
+# the most a tessellated circle may stray from the true one, in pixels on screen
+LOD_TOLERANCE: float = 0.25
+
+# segment counts are rounded up to a power of two between these, so a handful of unit tables serve every radius
+MIN_SEGMENTS: int = 8
+MAX_SEGMENTS: int = 512
+
+# the most sides a shape may have, so a file can't make a single shape allocate unbounded vertices
+MAX_SIDES: int = MAX_SEGMENTS
+
+@lru_cache(maxsize=None)
+def unit_vertices(number_of_sides: int, phase_offset: float = 0.0) -> UNIT_TABLE:
+    """
+    Returns the vertices of a regular polygon inscribed in the unit circle.
+
+    The table is computed once per (number_of_sides, phase_offset) pair and shared by every shape,
+    so drawing or hit-testing a shape only has to scale and translate it.
+
+    Args:
+        number_of_sides (int): The number of vertices in the table.
+        phase_offset (float): The angle in radians of the first vertex.
+
+    Returns:
+        UNIT_TABLE: A tuple of (cos, sin) pairs, one for each vertex.
+    """
+    return tuple(
+        (cos(2 * pi * index / number_of_sides + phase_offset), sin(2 * pi * index / number_of_sides + phase_offset))
+        for index in range(number_of_sides)
+    )
+
+def circle_segments(radius: float, tolerance: float = LOD_TOLERANCE) -> int:
+    """
+    Returns the number of segments a circle needs so that no point of its edge is further than tolerance
+    from the true circle, rounded up to its level of detail bucket.
+
+    The gap between a chord and its arc is radius * (1 - cos(pi / segments)), which gives the count.
+
+    Args:
+        radius (float): The radius of the circle on screen, in pixels.
+        tolerance (float): The largest gap allowed, in pixels.
+
+    Returns:
+        int: A power of two between MIN_SEGMENTS and MAX_SEGMENTS.
+    """
+    if radius <= tolerance:
+        return MIN_SEGMENTS
+
+    segments: float = pi / acos(1 - tolerance / radius)
+    return min(MAX_SEGMENTS, max(MIN_SEGMENTS, 2 ** ceil(log2(ceil(segments)))))
+
+def circle_segments_batch(radii: np.ndarray, tolerance: float = LOD_TOLERANCE) -> np.ndarray:
+    """
+    Vectorized circle_segments.
+    """
+    cosines: np.ndarray = np.clip(1 - tolerance / np.maximum(radii, tolerance), -1, 1)
+
+    with np.errstate(divide='ignore'):
+        segments: np.ndarray = np.ceil(np.pi / np.arccos(cosines))
+
+    buckets: np.ndarray = np.exp2(np.ceil(np.log2(np.clip(segments, MIN_SEGMENTS, MAX_SEGMENTS))))
+    return buckets.astype(np.int64)
+
+def drawn_sides(sides: np.ndarray, radii: np.ndarray, circles: np.ndarray) -> np.ndarray:
+    """
+    Returns the number of vertices each shape is drawn with: its sides, or the circle_segments of its radius in canvas pixels
+    for the shapes circles marks, see ShapeStore.circles.
+    """
+    drawn: np.ndarray = sides.astype(np.int64)
+    drawn[circles] = circle_segments_batch(radii[circles])
+    return drawn
@@ -0,0 +1,79 @@
+import numpy as np
+
+from custom_types import *
+
+# upper bound on the number of (point, shape) pairs evaluated at once, to keep temporaries small
+PAIRS_PER_CHUNK: int = 1 << 20
+
+def within_bounds_batch(mouse_x: NUMBER | np.ndarray, mouse_y: NUMBER | np.ndarray, centers: np.ndarray, half_sizes: np.ndarray, angles: np.ndarray, sides: np.ndarray, circles: np.ndarray) -> np.ndarray:
+    """
+    Vectorized Polygon.within_bounds: tests one or many points against many regular polygons at once.
+
+    Instead of walking the edges, each point is rotated into the polygon's frame and its polar angle
+    picks the sector (edge) it faces. The point is inside when its distance along that sector's
+    bisector is shorter than the apothem, which gives the same answers as the crossing test.
+    Circles are tested against their radius, like Circle.within_bounds.
+
+    Args:
+        mouse_x (NUMBER | np.ndarray): The x-coordinate of the point, or an array of them.
+        mouse_y (NUMBER | np.ndarray): The y-coordinate of the point, or an array of them.
+        centers (np.ndarray): The (center_x, center_y) of each shape, shape (S, 2).
+        half_sizes (np.ndarray): The circumradius of each shape, shape (S,).
+        angles (np.ndarray): The rotation of each shape in degrees, shape (S,).
+        sides (np.ndarray): The number of sides of each shape, shape (S,).
+        circles (np.ndarray): Whether each shape is a circle, shape (S,), see ShapeStore.circles.
+
+    Returns:
+        np.ndarray: Booleans of shape (S,) for a single point, or (P, S) for P points.
+    """
+    single_point: bool = np.ndim(mouse_x) == 0
+    points_x: np.ndarray = np.atleast_1d(np.asarray(mouse_x, dtype=np.float64))
+    points_y: np.ndarray = np.atleast_1d(np.asarray(mouse_y, dtype=np.float64))
+
+    centers = np.asarray(centers, dtype=np.float64).reshape(-1, 2)
+    half_sizes = np.asarray(half_sizes, dtype=np.float64)
+    rotations: np.ndarray = np.radians(np.asarray(angles, dtype=np.float64))
+    sides = np.asarray(sides, dtype=np.float64)
+
+    cosines: np.ndarray = np.cos(rotations)
+    sines: np.ndarray = np.sin(rotations)
+    sector_angles: np.ndarray = 2 * np.pi / sides
+    apothems: np.ndarray = half_sizes * np.cos(np.pi / sides)
+    circles = np.asarray(circles, dtype=bool)
+
+    result: np.ndarray = np.empty((points_x.size, half_sizes.size), dtype=bool)
+    chunk: int = max(1, PAIRS_PER_CHUNK // max(1, half_sizes.size))
+
+    for first in range(0, points_x.size, chunk):
+        offset_x: np.ndarray = points_x[first:first + chunk, None] - centers[None, :, 0]
+        offset_y: np.ndarray = points_y[first:first + chunk, None] - centers[None, :, 1]
+
+        # the point in the shape's frame, where vertex k sits at 2 * pi * k / sides
+        local_x: np.ndarray = offset_x * cosines + offset_y * sines
+        local_y: np.ndarray = offset_y * cosines - offset_x * sines
+
+        polar: np.ndarray = np.mod(np.arctan2(local_y, local_x), 2 * np.pi)
+        bisectors: np.ndarray = (np.floor(polar / sector_angles) + 0.5) * sector_angles
+
+        result[first:first + chunk] = local_x * np.cos(bisectors) + local_y * np.sin(bisectors) < apothems
+
+        # circles are tested against their true radius
+        if circles.any():
+            result[first:first + chunk, circles] = offset_x[:, circles] ** 2 + offset_y[:, circles] ** 2 < half_sizes[circles] ** 2
+
+    return result[0] if single_point else result
+
+def topmost_within_bounds(mouse_x: NUMBER, mouse_y: NUMBER, centers: np.ndarray, half_sizes: np.ndarray, angles: np.ndarray, sides: np.ndarray, circles: np.ndarray) -> int:
+    """
+    Returns the index of the last (topmost) shape containing the point, or -1 when none does.
+
+    Args:
+        mouse_x (NUMBER): The x-coordinate of the point.
+        mouse_y (NUMBER): The y-coordinate of the point.
+        centers, half_sizes, angles, sides, circles (np.ndarray): The shape columns, see within_bounds_batch.
+
+    Returns:
+        int: The index of the topmost shape under the point, or -1.
+    """
+    hits: np.ndarray = np.flatnonzero(within_bounds_batch(mouse_x, mouse_y, centers, half_sizes, angles, sides, circles))
+    return int(hits[-1]) if hits.size else -1
@@ -0,0 +1,272 @@
+# for type checking purposes.
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from Shapes.Shape import Shape
+    from Shapes.ShapeStore import ShapeStore
+
+# start of code
+from typing import Dict, Iterator, List, Set, Tuple, Type
+from math import floor
+import numpy as np
+
+type CELL = Tuple[int, int]
+
+# cell coordinates are clipped to this magnitude, far past any drawable extent, so huge bounds can't overflow int64
+MAX_CELL: float = float(1 << 40)
+
+class SpatialIndex:
+    """
+    Uniform grid over the bounding circles of the canvas shapes.
+
+    Each shape is registered by its row in every cell its bounding box touches, so a point query only has
+    to run the exact within_bounds test on the rows sharing the cell under the point. Shapes covering more
+    than LARGE_SHAPE_CELLS cells are kept in a separate set that every query checks instead.
+    Rows are the z-order of the store, so nothing else needs to be kept to sort the candidates.
+
+    Attributes:
+        cell_size (int): The width and height of a grid cell in pixels.
+        cells (Dict[CELL, Set[int]]): The rows registered in each non-empty cell.
+        ranges (np.ndarray): The first and last cell column and row each row is registered in, one line per row.
+        large_rows (Set[int]): Rows whose shape is too big to be registered cell by cell.
+        count (int): The number of rows in the index.
+    """
+
+    LARGE_SHAPE_CELLS: int = 256
+
+    def __init__(self, cell_size: int = 64) -> None:
+        """
+        Initializes an empty index.
+
+        Args:
+            cell_size (int): The width and height of a grid cell in pixels.
+        """
+        self.cell_size: int = cell_size
+        self.cells: Dict[CELL, Set[int]] = {}
+        self.ranges: np.ndarray = np.empty((0, 4), dtype=np.int64)
+        self.large_rows: Set[int] = set()
+        self.count: int = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def cell_ranges(self, shapes: ShapeStore, rows: np.ndarray) -> np.ndarray:
+        """
+        Returns the first and last cell column and row covered by the bounding circles of the shapes of many rows,
+        computed on the store columns at once.
+        """
+        centers: np.ndarray = shapes.centers[rows]
+        radii: np.ndarray = shapes.half_sizes[rows, None]
+
+        bounds: np.ndarray = np.floor(np.concatenate([centers - radii, centers + radii], axis=1) / self.cell_size)
+        return np.clip(bounds, -MAX_CELL, MAX_CELL).astype(np.int64)
+
+    def _reserve(self, count: int) -> None:
+        """
+        Grows the ranges array so it holds at least count rows, doubling it to keep appends amortized.
+        """
+        if count <= len(self.ranges):
+            return
+
+        ranges: np.ndarray = np.empty((max(count, 2 * len(self.ranges)), 4), dtype=np.int64)
+        ranges[:self.count] = self.ranges[:self.count]
+        self.ranges = ranges
+
+    def _cell_groups(self, rows: np.ndarray) -> Tuple[Iterator[Tuple[CELL, List[int]]], List[int]]:
+        """
+        Expands the registered ranges of many rows into the rows of each cell they cover.
+
+        Returns:
+            Tuple[Iterator[Tuple[CELL, List[int]]], List[int]]: Every covered cell with its rows, and the rows too large to register by cell.
+        """
+        # a single shape, inserted or dragged, is cheaper to expand without numpy
+        if len(rows) == 1:
+            row: int = int(rows[0])
+            first_column, first_row, last_column, last_row = self.ranges[row].tolist()
+
+            if (last_column - first_column + 1) * (last_row - first_row + 1) > self.LARGE_SHAPE_CELLS:
+                return iter(()), [row]
+
+            return (
+                ((column, cell_row), [row]) for column in range(first_column, last_column + 1) for cell_row in range(first_row, last_row + 1)
+            ), []
+
+        first_column, first_row, last_column, last_row = self.ranges[rows].T
+        heights: np.ndarray = last_row - first_row + 1
+        counts: np.ndarray = (last_column - first_column + 1) * heights
+        small: np.ndarray = counts <= self.LARGE_SHAPE_CELLS
+        large_rows: List[int] = rows[~small].tolist()
+
+        # one entry per covered cell of every small row, the row-major offset inside its range picks the cell
+        counts = counts[small]
+        owners: np.ndarray = np.repeat(np.flatnonzero(small), counts)
+        offsets: np.ndarray = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        columns: np.ndarray = first_column[owners] + offsets // heights[owners]
+        cell_rows: np.ndarray = first_row[owners] + offsets % heights[owners]
+
+        order: np.ndarray = np.lexsort((cell_rows, columns))
+        columns, cell_rows, members = columns[order], cell_rows[order], rows[owners[order]].tolist()
+
+        starts: np.ndarray = np.flatnonzero((np.diff(columns) != 0) | (np.diff(cell_rows) != 0)) + 1
+        firsts: List[int] = [0, *starts.tolist()] if len(members) else []
+        lasts: List[int] = [*starts.tolist(), len(members)] if len(members) else []
+        cells: Iterator[CELL] = zip(columns[firsts].tolist(), cell_rows[firsts].tolist())
+
+        return ((cell, members[first:last]) for cell, first, last in zip(cells, firsts, lasts)), large_rows
+
+    def _register_rows(self, rows: np.ndarray) -> None:
+        """
+        Adds many rows to the cells covered by their ranges.
+        """
+        groups, large_rows = self._cell_groups(rows)
+        self.large_rows.update(large_rows)
+
+        for cell, members in groups:
+            registered: Set[int] | None = self.cells.get(cell)
+
+            if registered is None:
+                self.cells[cell] = set(members)
+            else:
+                registered.update(members)
+
+    def _unregister_rows(self, rows: np.ndarray) -> None:
+        """
+        Removes many rows from the cells covered by their ranges.
+        """
+        groups, large_rows = self._cell_groups(rows)
+        self.large_rows.difference_update(large_rows)
+
+        for cell, members in groups:
+            registered: Set[int] = self.cells[cell]
+            registered.difference_update(members)
+
+            if not registered:
+                del self.cells[cell]
+
+    def insert(self, shape: Type[Shape]) -> None:
+        """
+        Adds a shape that was just inserted into the store.
+
+        Args:
+            shape (Type[Shape]): The shape to add.
+        """
+        self.insert_rows(shape.store, np.array([shape.row]))
+
+    def insert_rows(self, shapes: ShapeStore, rows: np.ndarray) -> None:
+        """
+        Adds the shapes of many rows that were just inserted into the store. Rows added on top are registered
+        on their own, while rows put below others shift every row above them, so the index is rebuilt.
+
+        Args:
+            shapes (ShapeStore): The store the rows belong to.
+            rows (np.ndarray): The rows to add, sorted and without duplicates.
+        """
+        if len(rows) and rows[0] < self.count:
+            self.rebuild(shapes)
+            return
+
+        self._reserve(self.count + len(rows))
+        self.ranges[rows] = self.cell_ranges(shapes, rows)
+        self.count += len(rows)
+        self._register_rows(rows)
+
+    def update_rows(self, shapes: ShapeStore, rows: np.ndarray) -> None:
+        """
+        Re-registers the shapes of many rows after they were moved, resized or rotated.
+        Rows whose bounds still cover the same cells are left as they are.
+
+        Args:
+            shapes (ShapeStore): The store the rows belong to.
+            rows (np.ndarray): The rows that changed.
+        """
+        ranges: np.ndarray = self.cell_ranges(shapes, rows)
+        changed: np.ndarray = (ranges != self.ranges[rows]).any(axis=1)
+        rows = rows[changed]
+
+        if not len(rows):
+            return
+
+        self._unregister_rows(rows)
+        self.ranges[rows] = ranges[changed]
+        self._register_rows(rows)
+
+    def remove_rows(self, shapes: ShapeStore, rows: np.ndarray) -> None:
+        """
+        Removes the shapes of many rows that were just taken out of the store. Rows taken from the top are
+        unregistered on their own, while rows taken below others shift every row above them, so the index is rebuilt.
+
+        Args:
+            shapes (ShapeStore): The store the rows were taken out of.
+            rows (np.ndarray): The rows the shapes had before they were taken out, sorted and without duplicates.
+        """
+        if len(rows) and rows[0] < self.count - len(rows):
+            self.rebuild(shapes)
+            return
+
+        self._unregister_rows(rows)
+        self.count -= len(rows)
+
+    def rebuild(self, shapes: ShapeStore) -> None:
+        """
+        Replaces the content of the index with every row of a store, computed from its columns at once.
+
+        Args:
+            shapes (ShapeStore): The shapes of the canvas.
+        """
+        rows: np.ndarray = np.arange(len(shapes))
+
+        self.cells.clear()
+        self.large_rows.clear()
+        self.ranges = self.cell_ranges(shapes, rows)
+        self.count = len(rows)
+        self._register_rows(rows)
+
+    def candidates(self, x: float, y: float) -> List[int]:
+        """
+        Returns the rows whose bounding box may contain the point, topmost first.
+
+        Args:
+            x (float): The x-coordinate of the point.
+            y (float): The y-coordinate of the point.
+
+        Returns:
+            List[int]: The rows to run the exact within_bounds test on.
+        """
+        cell: Set[int] = self.cells.get((floor(x / self.cell_size), floor(y / self.cell_size)), set())
+        rows: Set[int] = cell | self.large_rows if self.large_rows else cell
+
+        return sorted(rows, reverse=True)
+
+    def candidates_in(self, left: float, top: float, right: float, bottom: float) -> Set[int]:
+        """
+        Returns the rows whose bounding box may intersect a rectangle, in no particular order.
+
+        Args:
+            left (float): The smallest x-coordinate of the rectangle.
+            top (float): The smallest y-coordinate of the rectangle.
+            right (float): The largest x-coordinate of the rectangle.
+            bottom (float): The largest y-coordinate of the rectangle.
+
+        Returns:
+            Set[int]: The rows to run the exact intersection test on.
+        """
+        first_column, first_row = floor(left / self.cell_size), floor(top / self.cell_size)
+        last_column, last_row = floor(right / self.cell_size), floor(bottom / self.cell_size)
+
+        # a rectangle covering more cells than are in use is cheaper to answer from the used cells
+        if (last_column - first_column + 1) * (last_row - first_row + 1) > len(self.cells):
+            cells: List[Set[int]] = [
+                rows for (column, row), rows in self.cells.items()
+                if first_column <= column <= last_column and first_row <= row <= last_row
+            ]
+        else:
+            cells = [
+                self.cells[(column, row)]
+                for column in range(first_column, last_column + 1) for row in range(first_row, last_row + 1)
+                if (column, row) in self.cells
+            ]
+
+        return self.large_rows.union(*cells)
@@ -0,0 +1,119 @@
+from typing import Dict, Iterator, List
+import numpy as np
+
+from Shapes.ShapeStore import ShapeStore
+from Shapes.Polygon import FILL_PHASE
+from Shapes.unit_tables import unit_vertices
+from Background import PROGRESS
+from Save import atomic_open
+from custom_types import RECTANGLE
+from constants import CANVAS_COLOR
+
+# shapes formatted at a time, and the size of the write buffer of the file
+SVG_CHUNK: int = 10000
+SVG_BUFFER: int = 1 << 20
+
+# every coordinate is written with this many decimals
+COORDINATE: str = '%.2f'
+
+def hex_colors(colors: np.ndarray) -> np.ndarray:
+    """
+    Returns the #rrggbb strings of RGB colors with channels from 0 to 1.
+    """
+    channels: np.ndarray = np.clip(np.rint(colors * 255), 0, 255).astype(np.int64)
+    packed: np.ndarray = (channels[:, 0] << 16) | (channels[:, 1] << 8) | channels[:, 2]
+    return np.array([f'#{value:06x}' for value in packed.tolist()], dtype=object)
+
+def polygon_template(number_of_sides: int) -> str:
+    """
+    Returns the %-format of the <polygon> of a shape with number_of_sides sides, taking its vertices,
+    its fill, and its angle and center to rotate around.
+    """
+    points: str = ' '.join([f'{COORDINATE},{COORDINATE}'] * number_of_sides)
+    return f'<polygon points="{points}" fill="%s" transform="rotate({COORDINATE} {COORDINATE} {COORDINATE})"/>\n'
+
+CIRCLE_TEMPLATE: str = f'<circle cx="{COORDINATE}" cy="{COORDINATE}" r="{COORDINATE}" fill="%s"/>\n'
+
+def svg_elements(shapes: ShapeStore, chunk_size: int = SVG_CHUNK) -> Iterator[str]:
+    """
+    Yields one SVG element per shape, bottom to top.
+
+    Polygons get their unrotated vertices, from the same cached unit tables Polygon.draw uses, and the rotation
+    of Shape.angle around their center as a transform, which turns the same way as glRotatef does on the canvas.
+    Circles are written as <circle>, whatever segment count the canvas draws them with. Every element is filled
+    with the background color of its shape; selection borders aren't written.
+
+    The vertices of a chunk of shapes are computed with numpy for each side count at once, then formatted
+    in the order of the chunk.
+
+    Args:
+        shapes (ShapeStore): The shapes to write.
+        chunk_size (int): How many shapes are formatted at a time.
+
+    Yields:
+        str: The next element, ending with a newline.
+    """
+    templates: Dict[int, str] = {}
+
+    for chunk in shapes.chunks(chunk_size):
+        sides: np.ndarray = chunk.sides
+        centers: np.ndarray = chunk.centers
+        half_sizes: np.ndarray = chunk.half_sizes
+        fills: np.ndarray = hex_colors(chunk.background_colors)
+        elements: np.ndarray = np.empty(len(chunk), dtype=object)
+        circles: np.ndarray = chunk.circles()
+
+        members: np.ndarray = np.flatnonzero(circles)
+        values: List[list] = np.column_stack([centers[members], half_sizes[members]]).tolist()
+        elements[members] = [CIRCLE_TEMPLATE % (*value, fill) for value, fill in zip(values, fills[members])]
+
+        for number_of_sides in np.unique(sides[~circles]).tolist():
+            members = np.flatnonzero((sides == number_of_sides) & ~circles)
+            template: str | None = templates.get(number_of_sides)
+
+            if template is None:
+                template = templates[number_of_sides] = polygon_template(number_of_sides)
+
+            table: np.ndarray = np.array(unit_vertices(number_of_sides, FILL_PHASE), dtype=np.float64)
+            points: np.ndarray = centers[members, None, :] + half_sizes[members, None, None] * table[None]
+            rotations: List[list] = np.column_stack([chunk.angles[members], centers[members]]).tolist()
+
+            elements[members] = [
+                template % (*vertices, fill, *rotation)
+                for vertices, fill, rotation in zip(points.reshape(len(members), -1).tolist(), fills[members], rotations)
+            ]
+
+        yield from elements
+
+def write_svg(file_path: str, shapes: ShapeStore, view: RECTANGLE | None = None, progress: PROGRESS | None = None) -> None:
+    """
+    Streams the shapes into an SVG file through a buffered writer, without building a document in memory.
+
+    Args:
+        file_path (str): The SVG file to write.
+        shapes (ShapeStore): The shapes to write.
+        view (RECTANGLE | None): The world rectangle the image shows, as left, top, right, bottom. Defaults to every shape.
+        progress (PROGRESS | None): Called with the fraction of the shapes written so far.
+    """
+    left, top, right, bottom = view or shapes.bounds() or (0, 0, 1, 1)
+    width: float = right - left
+    height: float = bottom - top
+    background: str = hex_colors(np.array([CANVAS_COLOR]))[0]
+
+    with atomic_open(file_path, 'w', encoding='utf-8', buffering=SVG_BUFFER) as file:
+        file.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.2f}" height="{height:.2f}" viewBox="{left:.2f} {top:.2f} {width:.2f} {height:.2f}">\n'
+            f'<rect x="{left:.2f}" y="{top:.2f}" width="{width:.2f}" height="{height:.2f}" fill="{background}"/>\n'
+        )
+
+        for number, element in enumerate(svg_elements(shapes), 1):
+            file.write(element)
+
+            if progress and number % SVG_CHUNK == 0:
+                progress(number / len(shapes))
+
+        file.write('</svg>\n')
+
+    if progress:
+        progress(1.0)
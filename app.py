@@ -1,9 +1,13 @@
-from Shapes.auto_manager import update_manager_py
+from Renderers.Manager import names, DEFAULT_RENDERER
+from Program import App
+from argparse import ArgumentParser
 
 if __name__ == '__main__':
-    update: bool = update_manager_py()
+    parser: ArgumentParser = ArgumentParser(description="2D Shape Drawer")
+    parser.add_argument('--renderer', choices=names(), default=DEFAULT_RENDERER, help="how shapes are submitted to OpenGL")
+    parser.add_argument('--max-fps', type=int, default=None, help="caps how many frames per second the canvas draws")
+    parser.add_argument('--animate', action='store_true', help="redraw continuously instead of only when something changes")
+    parser.add_argument('--stats-csv', default=None, help="append the timings of every frame to this CSV file")
+    arguments = parser.parse_args()
 
-    from Program import App
-
-    if update:
-        App().mainloop()
+    App(renderer=arguments.renderer, max_fps=arguments.max_fps, animate=arguments.animate, stats_csv=arguments.stats_csv).mainloop()
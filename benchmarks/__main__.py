@@ -0,0 +1,108 @@
+from benchmarks.targets import prepare_platform, create_target, gl_description, headless
+
+# before anything imports OpenGL
+prepare_platform()
+
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+import platform
+import json
+import sys
+
+import numpy as np
+
+from benchmarks.scenes import SCENE_WIDTH, SCENE_HEIGHT
+from benchmarks.suite import run_suite, compare, RESULT
+from benchmarks.startup import import_time, first_frame_time, ENTRY_MODULE
+
+DEFAULT_SIZES: str = '1000,10000,100000,1000000'
+DEFAULT_RENDERERS: str = 'immediate,batched'
+
+def print_result(result: RESULT) -> None:
+    per_operation: str = f"  ({result['per_operation'] * 1000:.4f} ms each)" if result['operations'] > 1 else ''
+    print(f"{result['case']:<20} {result['shapes']:>9,} shapes  median {result['median'] * 1000:10.3f} ms  over {result['runs']} runs{per_operation}", flush=True)
+
+def print_comparison(comparisons: List[RESULT]) -> None:
+    for comparison in comparisons:
+        flag: str = 'REGRESSION' if comparison['regression'] else ''
+        print(f"{comparison['case']:<20} {comparison['shapes']:>9,} shapes  {comparison['baseline'] * 1000:10.3f} ms -> {comparison['median'] * 1000:10.3f} ms  x{comparison['ratio']:.2f}  {flag}")
+
+if __name__ == '__main__':
+    parser: ArgumentParser = ArgumentParser(prog='python -m benchmarks', description="Times the 2D Shape Drawer on seeded synthetic scenes")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help="comma separated scene sizes")
+    parser.add_argument('--renderers', default=DEFAULT_RENDERERS, help="comma separated renderers to time redraws with")
+    parser.add_argument('--cases', default='', help="comma separated case names, or parts of them, to run instead of every case")
+    parser.add_argument('--seed', type=int, default=2024, help="seed of the synthetic scenes")
+    parser.add_argument('--repeat', type=int, default=5, help="most runs per case")
+    parser.add_argument('--budget', type=float, default=3.0, help="seconds after which a case stops starting new runs")
+    parser.add_argument('--no-gl', action='store_true', help="skip the redraw cases")
+    parser.add_argument('--output', default='benchmark-results.json', help="where to write the results")
+    parser.add_argument('--compare', metavar='BASELINE', help="results file to compare with; exits with status 1 on a regression")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="how much slower than the baseline a case may get before it is flagged")
+    parser.add_argument('--results', metavar='RESULTS', help="compare this results file with the baseline instead of running the suite")
+    arguments = parser.parse_args()
+
+    if arguments.results:
+        with open(arguments.results) as file:
+            results: List[RESULT] = json.load(file)['results']
+    else:
+        patterns: List[str] = [pattern for pattern in arguments.cases.split(',') if pattern]
+        target: Any | None = None if arguments.no_gl else create_target(SCENE_WIDTH, SCENE_HEIGHT)
+
+        environment: Dict[str, Any] = {
+            'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(),
+            'target': target.name if target else None,
+            'opengl': gl_description() if target else None,
+            'seed': arguments.seed,
+        }
+
+        selected: Callable[[str], bool] = lambda case: not patterns or any(pattern in case for pattern in patterns)
+        results: List[RESULT] = []
+        eager_imports: List[str] = []
+
+        if selected('startup'):
+            startup: RESULT = import_time(arguments.repeat)
+            eager_imports = startup['eager_lazy_modules']
+            print_result(startup)
+            results.append(startup)
+
+            # the first frame needs a window
+            if not headless():
+                print_result(first_frame := first_frame_time(arguments.repeat))
+                results.append(first_frame)
+
+        for result in run_suite(
+            [int(size) for size in arguments.sizes.split(',')],
+            arguments.renderers.split(','),
+            arguments.seed,
+            arguments.repeat,
+            arguments.budget,
+            target,
+            selected
+        ):
+            print_result(result)
+            results.append(result)
+
+        with open(arguments.output, 'w') as file:
+            json.dump({'environment': environment, 'results': results}, file, indent=2)
+
+        print(f'Results written to {arguments.output}')
+
+        if eager_imports:
+            print(f"Importing {ENTRY_MODULE} also imports {', '.join(eager_imports)}, which should only load on first use")
+            sys.exit(1)
+
+    if arguments.compare:
+        with open(arguments.compare) as file:
+            baseline: List[RESULT] = json.load(file)['results']
+
+        comparisons: List[RESULT] = compare(results, baseline, arguments.tolerance)
+        print_comparison(comparisons)
+
+        if any(comparison['regression'] for comparison in comparisons):
+            sys.exit(1)
@@ -0,0 +1,151 @@
+from typing import Dict, List, Tuple
+from statistics import median
+from time import time
+import subprocess
+import tempfile
+import sys
+import os
+
+from benchmarks.suite import RESULT
+
+# the module the app imports before its window can appear
+ENTRY_MODULE: str = 'Program'
+
+# modules that must only be imported once the user needs them
+LAZY_MODULES: Tuple[str, ...] = ('OpenGL.GLUT', 'CTkColorPicker', 'Tutorial')
+
+# the heaviest imports listed with the result
+REPORTED_MODULES: int = 10
+
+REPOSITORY: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# starts the app and prints the wall-clock time at which the canvas finished its first frame
+FIRST_FRAME_SCRIPT: str = """
+from time import time
+from Program import App
+
+app = App()
+canvas = app.right_content
+redraw = canvas.redraw
+
+def first_redraw():
+    redraw()
+    canvas.redraw = redraw
+    print(f'first frame {time()}', flush=True)
+    app.after_idle(app.destroy)
+
+canvas.redraw = first_redraw
+app.mainloop()
+"""
+
+def isolated_environment(home: str) -> Dict[str, str]:
+    """
+    The environment of the measured interpreters: the repository on the path and a throwaway home,
+    so the app neither recovers nor rewrites the user's autosave.
+    """
+    # the EGL platform picked for the offscreen benchmarks doesn't work with the GLX canvas of the app
+    inherited: Dict[str, str] = {name: value for name, value in os.environ.items() if name not in ('PYOPENGL_PLATFORM', 'EGL_PLATFORM')}
+    return {**inherited, 'PYTHONPATH': REPOSITORY, 'HOME': home}
+
+def parse_importtime(report: str) -> List[Tuple[str, int, int]]:
+    """
+    Parses the stderr of python -X importtime.
+
+    Returns:
+        List[Tuple[str, int, int]]: The name, self time and cumulative time in microseconds of each imported module.
+    """
+    modules: List[Tuple[str, int, int]] = []
+
+    for line in report.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+
+        self_time, cumulative, name = line[len('import time:'):].split('|')
+        modules.append((name.strip(), int(self_time), int(cumulative)))
+
+    return modules
+
+def import_time(runs: int) -> RESULT:
+    """
+    Measures how long importing ENTRY_MODULE takes in a fresh interpreter, like python -X importtime does.
+
+    Args:
+        runs (int): How many fresh interpreters to measure.
+
+    Returns:
+        RESULT: The timings in seconds, the heaviest imports of the last run and the LAZY_MODULES imported eagerly.
+    """
+    timings: List[float] = []
+    modules: List[Tuple[str, int, int]] = []
+
+    with tempfile.TemporaryDirectory() as home:
+        for _ in range(runs):
+            process: subprocess.CompletedProcess = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', f'import {ENTRY_MODULE}'],
+                cwd=REPOSITORY, env=isolated_environment(home), capture_output=True, text=True, check=True
+            )
+            modules = parse_importtime(process.stderr)
+            timings.append(sum(cumulative for name, _, cumulative in modules if name == ENTRY_MODULE) / 1e6)
+
+    imported: set = {name for name, _, _ in modules}
+    heaviest: List[Tuple[str, int, int]] = sorted(modules, key=lambda module: module[1], reverse=True)[:REPORTED_MODULES]
+
+    return {
+        'case': f'startup[import {ENTRY_MODULE}]',
+        'shapes': 0,
+        'runs': runs,
+        'operations': 1,
+        'min': min(timings),
+        'median': median(timings),
+        'mean': sum(timings) / runs,
+        'per_operation': median(timings),
+        'heaviest_imports_ms': {name: self_time / 1000 for name, self_time, _ in heaviest},
+        'eager_lazy_modules': [name for name in LAZY_MODULES if name in imported],
+    }
+
+def first_frame_time(runs: int, timeout: float = 60) -> RESULT:
+    """
+    Measures the time from starting the interpreter to the end of the canvas' first frame. Needs a display.
+
+    Args:
+        runs (int): How many times to start the app.
+        timeout (float): The seconds after which a start counts as failed and the app is killed.
+
+    Returns:
+        RESULT: The timings in seconds.
+    """
+    timings: List[float] = []
+
+    with tempfile.TemporaryDirectory() as home:
+        for _ in range(runs):
+            # the wall clock, as the child reports when its frame ended rather than the parent noticing
+            started: float = time()
+            process: subprocess.Popen = subprocess.Popen(
+                [sys.executable, '-c', FIRST_FRAME_SCRIPT],
+                cwd=REPOSITORY, env=isolated_environment(home), stdout=subprocess.PIPE, text=True
+            )
+
+            try:
+                output, _ = process.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.communicate()
+                raise RuntimeError(f'The app did not draw its first frame within {timeout} s') from None
+
+            reported: List[str] = [line.split()[-1] for line in output.splitlines() if line.startswith('first frame ')]
+
+            if not reported:
+                raise RuntimeError('The app exited before drawing its first frame')
+
+            timings.append(float(reported[0]) - started)
+
+    return {
+        'case': 'startup[first frame]',
+        'shapes': 0,
+        'runs': runs,
+        'operations': 1,
+        'min': min(timings),
+        'median': median(timings),
+        'mean': sum(timings) / runs,
+        'per_operation': median(timings),
+    }
@@ -0,0 +1,275 @@
+from typing import Any, Callable, Dict, Iterator, List
+from time import perf_counter
+from statistics import mean, median
+import tempfile
+import os
+
+import numpy as np
+
+from benchmarks.scenes import make_scene, random_points, SCENE_WIDTH, SCENE_HEIGHT
+from FrameStats import COUNTERS
+
+type RESULT = Dict[str, Any]
+
+# clicks simulated per run of the hit-testing cases and shapes added per run of insert_shape
+CLICKS: int = 100
+INSERTS: int = 1000
+
+# the share of the scene selected for transform_selection
+SELECTED_SHARE: float = 0.1
+
+# how far the camera moves between the frames of the pan cases, in canvas pixels, and how far in they are zoomed
+PAN_STEP: int = 8
+PAN_ZOOM: float = 4.0
+
+def measure(case: str, shapes: int, function: Callable[[], Any], repeat: int, budget: float, operations: int = 1) -> RESULT:
+    """
+    Times a function, running it repeat times or until budget seconds are spent, whichever comes first.
+    It always runs at least once, so slow cases on big scenes still get a number.
+
+    Args:
+        case (str): The name of the case.
+        shapes (int): The size of the scene.
+        function (Callable[[], Any]): The code to time.
+        repeat (int): The most runs.
+        budget (float): The seconds after which no new run is started.
+        operations (int): How many operations one run performs, for the per-operation time.
+
+    Returns:
+        RESULT: The timings of the case in seconds.
+    """
+    timings: List[float] = []
+    started: float = perf_counter()
+
+    while len(timings) < repeat and (not timings or perf_counter() - started < budget):
+        start: float = perf_counter()
+        function()
+        timings.append(perf_counter() - start)
+
+    return {
+        'case': case,
+        'shapes': shapes,
+        'runs': len(timings),
+        'operations': operations,
+        'min': min(timings),
+        'median': median(timings),
+        'mean': mean(timings),
+        'per_operation': median(timings) / operations,
+    }
+
+def run_suite(sizes: List[int], renderers: List[str], seed: int, repeat: int, budget: float, target: Any | None, selected: Callable[[str], bool]) -> Iterator[RESULT]:
+    """
+    Runs every selected case on a scene of each size, yielding results as they come.
+
+    Args:
+        sizes (List[int]): The numbers of shapes of the scenes.
+        renderers (List[str]): The renderers to time redraws with.
+        seed (int): The seed of the scenes and click positions.
+        repeat (int): The most runs per case.
+        budget (float): The seconds after which a case stops starting new runs.
+        target (Any | None): The offscreen drawing target, or None to skip the redraw cases.
+        selected (Callable[[str], bool]): Tells whether a case should run.
+
+    Yields:
+        RESULT: The timings of one case on one scene.
+    """
+    from Shapes.ShapeStore import ShapeStore
+    from Shapes.Manager import shapes as shape_classes
+    from SpatialIndex import SpatialIndex
+    from Journal import Journal, Operation
+    from History import History, capture
+    from Save import write_dsd, read_dsd, stream_scene
+    from SvgExport import write_svg
+    from Camera import Camera
+
+    for size in sizes:
+        scene: ShapeStore = make_scene(size, seed)
+        points: np.ndarray = random_points(CLICKS, seed)
+
+        if target is not None:
+            target.set_scene(scene)
+
+            for renderer in renderers:
+                case: str = f'redraw[{renderer}]'
+
+                if selected(case):
+                    target.use_renderer(renderer)
+                    target.draw()
+
+                    # the counters of the last frame, which are the same for every frame of the scene
+                    counters: Dict[str, int] = {name: int(target.stats.latest()[name]) for name in COUNTERS}
+                    yield {**measure(case, size, target.draw, repeat, budget), **counters}
+
+                # frames where only a drag preview moved over the shapes
+                case = f'redraw[{renderer}, preview]'
+
+                if selected(case):
+                    target.use_renderer(renderer)
+                    target.draw()
+                    yield measure(case, size, lambda: target.draw(scene_changed=False), repeat, budget)
+
+                # frames where the camera, zoomed in on the middle of the scene, panned back and forth
+                case = f'redraw[{renderer}, pan]'
+
+                if selected(case):
+                    camera: Camera = Camera()
+                    camera.zoom_at(SCENE_WIDTH / 2, SCENE_HEIGHT / 2, PAN_ZOOM)
+                    target.use_renderer(renderer)
+                    target.draw(camera=camera)
+
+                    def pan() -> None:
+                        camera.pan(PAN_STEP, 0)
+                        target.draw(scene_changed=False, camera=camera)
+                        camera.pan(-PAN_STEP, 0)
+                        target.draw(scene_changed=False, camera=camera)
+
+                    counters = {name: int(target.stats.latest()[name]) for name in COUNTERS}
+                    yield {**measure(case, size, pan, repeat, budget, 2), **counters}
+
+        index: SpatialIndex = SpatialIndex()
+
+        if selected('index_rebuild') or selected('hit_test[indexed]'):
+            yield measure('index_rebuild', size, lambda: index.rebuild(scene), 1, budget)
+
+        if selected('hit_test[indexed]'):
+            def indexed_clicks() -> None:
+                for x, y in points:
+                    scene.topmost_within_bounds(x, y, index.candidates(x, y))
+
+            yield measure('hit_test[indexed]', size, indexed_clicks, repeat, budget, CLICKS)
+
+        if selected('box_select'):
+            if not len(index):
+                index.rebuild(scene)
+
+            corners: np.ndarray = random_points(2 * CLICKS, seed + 2).reshape(CLICKS, 4)
+
+            def box_selections() -> None:
+                # the boxes OpenGLCanvas.select_in_box gets when a drag on empty canvas is released
+                for start_x, start_y, end_x, end_y in corners:
+                    left, right = sorted((start_x, end_x))
+                    top, bottom = sorted((start_y, end_y))
+                    candidates = index.candidates_in(left, top, right, bottom)
+                    scene.intersecting_rectangle(left, top, right, bottom, (candidate.row for candidate in candidates))
+
+            yield measure('box_select', size, box_selections, repeat, budget, CLICKS)
+
+        if selected('hit_test[batch]'):
+            def batch_clicks() -> None:
+                for x, y in points:
+                    scene.topmost_within_bounds(x, y)
+
+            yield measure('hit_test[batch]', size, batch_clicks, repeat, budget, CLICKS)
+
+        if selected('hit_test[scalar]'):
+            x, y = points[0]
+
+            def scalar_click() -> None:
+                # the linear scan the canvas used before the spatial index
+                for row in range(len(scene) - 1, -1, -1):
+                    if scene[row].within_bounds(x, y):
+                        break
+
+            yield measure('hit_test[scalar]', size, scalar_click, repeat, budget)
+
+        with tempfile.TemporaryDirectory() as directory:
+            if selected('insert_shape'):
+                # what OpenGLCanvas.insert_shape does once the toolbar button is released
+                canvas_shapes: ShapeStore = scene.snapshot()
+                canvas_index: SpatialIndex = SpatialIndex()
+                canvas_index.rebuild(canvas_shapes)
+                journal: Journal = Journal(os.path.join(directory, 'autosave'))
+                history: History = History(1 << 24)
+                kinds: List[type] = list(shape_classes().values())
+                corners: np.ndarray = random_points(2 * INSERTS, seed + 1).reshape(INSERTS, 4)
+
+                def insert_shapes() -> None:
+                    for number, (start_x, start_y, end_x, end_y) in enumerate(corners):
+                        shape = kinds[number % len(kinds)](start_coordinates=[start_x, start_y], end_coordinates=[end_x, end_y])
+                        canvas_shapes.append(shape)
+                        canvas_index.insert(shape)
+                        journal.record(Operation.INSERT, shape)
+                        history.record(Operation.INSERT, shape, None, shape.row)
+
+                yield measure('insert_shape', size, insert_shapes, repeat, budget, INSERTS)
+                journal.discard()
+
+            if selected('transform_selection'):
+                # what OpenGLCanvas.edit_rows does for one press of an arrow key with a tenth of the scene selected
+                canvas_shapes = scene.snapshot()
+                canvas_index = SpatialIndex()
+                canvas_index.rebuild(canvas_shapes)
+                journal = Journal(os.path.join(directory, 'autosave'))
+                history = History(1 << 24)
+                rows: np.ndarray = np.flatnonzero(np.random.default_rng(seed).random(size) < SELECTED_SHARE)
+
+                def transform_selection() -> None:
+                    before: tuple = capture(Operation.MOVE, canvas_shapes, rows)
+                    canvas_shapes.translate(rows, 10, 0)
+                    history.record(Operation.MOVE, rows, before, capture(Operation.MOVE, canvas_shapes, rows))
+                    canvas_index.update_rows(canvas_shapes, rows)
+                    journal.record_rows(Operation.MOVE, canvas_shapes, rows)
+
+                yield {**measure('transform_selection', size, transform_selection, repeat, budget), 'selected': len(rows)}
+                journal.discard()
+
+            file_path: str = os.path.join(directory, 'scene.dsd')
+
+            if selected('export') or selected('import'):
+                yield {**measure('export', size, lambda: write_dsd(file_path, scene), repeat, budget), 'bytes': os.path.getsize(file_path)}
+
+            if selected('export[svg]'):
+                svg_path: str = os.path.join(directory, 'scene.svg')
+                yield {**measure('export[svg]', size, lambda: write_svg(svg_path, scene), repeat, budget), 'bytes': os.path.getsize(svg_path)}
+
+            if selected('import'):
+                def import_scene() -> None:
+                    # own_columns forces the memory-mapped pages to be read
+                    read_dsd(file_path).own_columns()
+
+                yield measure('import', size, import_scene, repeat, budget)
+
+            if selected('import[stream]'):
+                write_dsd(file_path, scene)
+
+                def stream_import() -> None:
+                    imported: ShapeStore = ShapeStore()
+
+                    for chunk in stream_scene(file_path):
+                        imported.extend_store(chunk)
+
+                yield measure('import[stream]', size, stream_import, repeat, budget)
+
+def compare(results: List[RESULT], baseline: List[RESULT], tolerance: float) -> List[RESULT]:
+    """
+    Matches results with a baseline by case and scene size and flags the ones that got slower.
+
+    Args:
+        results (List[RESULT]): The new results.
+        baseline (List[RESULT]): The stored results to compare with.
+        tolerance (float): How much slower than the baseline median a case may get, 0.2 for 20%.
+
+    Returns:
+        List[RESULT]: One comparison per case present in both, with the ratio of the medians and a regression flag.
+    """
+    stored: Dict[tuple, RESULT] = {(result['case'], result['shapes']): result for result in baseline}
+    comparisons: List[RESULT] = []
+
+    for result in results:
+        previous: RESULT | None = stored.get((result['case'], result['shapes']))
+
+        if previous is None:
+            continue
+
+        ratio: float = result['median'] / previous['median'] if previous['median'] else float('inf')
+
+        comparisons.append({
+            'case': result['case'],
+            'shapes': result['shapes'],
+            'baseline': previous['median'],
+            'median': result['median'],
+            'ratio': ratio,
+            'regression': ratio > 1 + tolerance,
+        })
+
+    return comparisons
@@ -0,0 +1,88 @@
+from typing import Any
+
+from Offscreen import OffscreenContext, headless, prepare_platform
+
+# OpenGL and the modules using it are imported inside the functions, once prepare_platform has picked the platform
+
+class EGLTarget:
+    """
+    Offscreen pbuffer the size of the canvas. Frames go through Renderer.draw_frame, the body of OpenGLCanvas.redraw,
+    since the canvas itself needs a GLX window.
+    """
+
+    name: str = 'egl'
+
+    def __init__(self, width: int, height: int) -> None:
+        from FrameStats import FrameStats
+
+        self.width: int = width
+        self.height: int = height
+        self.context: OffscreenContext = OffscreenContext(width, height)
+
+        self.renderer: Any = None
+        self.shapes: Any = None
+        self.stats: FrameStats = FrameStats()
+
+    def use_renderer(self, renderer: str) -> None:
+        from Renderers.Manager import renderers
+        self.renderer = renderers()[renderer]()
+
+    def set_scene(self, shapes) -> None:
+        self.shapes = shapes
+
+    def draw(self, scene_changed: bool = True, camera: Any | None = None) -> None:
+        from OpenGL.GL import glFinish
+        self.renderer.scene_changed = scene_changed
+        self.stats.begin_frame()
+        view: tuple | None = camera.visible_rectangle(self.width, self.height) if camera is not None else None
+        self.renderer.draw_frame(self.shapes, self.width, self.height, self.stats, view)
+        glFinish()
+        self.stats.end_frame()
+
+class CanvasTarget:
+    """
+    An OpenGLCanvas in a Tk window, for when a display (or Xvfb) is available.
+    """
+
+    name: str = 'tk'
+
+    def __init__(self, width: int, height: int) -> None:
+        from tkinter import Tk
+        from Canvas import OpenGLCanvas
+
+        self.root: Tk = Tk()
+        self.canvas: OpenGLCanvas = OpenGLCanvas(self.root, width=width, height=height)
+        self.canvas.pack()
+        self.root.update()
+        self.stats = self.canvas.frame_stats
+
+    def use_renderer(self, renderer: str) -> None:
+        from Renderers.Manager import renderers
+        self.canvas.renderer = renderers()[renderer]()
+
+    def set_scene(self, shapes) -> None:
+        self.canvas.set_shapes(shapes, autosave=False)
+
+    def draw(self, scene_changed: bool = True, camera: Any | None = None) -> None:
+        from OpenGL.GL import glFinish
+        self.canvas.renderer.scene_changed = scene_changed
+
+        if camera is not None:
+            self.canvas.camera = camera
+
+        self.canvas.tkMakeCurrent()
+        self.canvas.redraw()
+        glFinish()
+
+def create_target(width: int, height: int) -> EGLTarget | CanvasTarget:
+    """
+    Returns the Tk canvas when a display is available, an EGL pbuffer otherwise.
+    """
+    return EGLTarget(width, height) if headless() else CanvasTarget(width, height)
+
+def gl_description() -> str:
+    """
+    Returns the OpenGL renderer and version of the current context, for the results file.
+    """
+    from OpenGL.GL import glGetString, GL_RENDERER, GL_VERSION
+    return f'{glGetString(GL_RENDERER).decode()} ({glGetString(GL_VERSION).decode()})'
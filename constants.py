@@ -4,7 +4,26 @@ from os import path
 WINDOW_SIZE: str = "1080x720"
 WHITE: Tuple[float, float, float] = (1.0, 1.0, 1.0)
 BLACK: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+CANVAS_COLOR: Tuple[float, float, float] = (0.17, 0.17, 0.17)
 ICON_PATH: str = path.join('icon_asset', "switch.ico")
+ICON_DIRECTORY: str = 'icon_asset'
+
+AUTOSAVE_DIRECTORY: str = path.join(path.expanduser('~'), '.2d_shape_drawer', 'autosave')
+CACHE_DIRECTORY: str = path.join(path.expanduser('~'), '.2d_shape_drawer', 'cache')
+JOURNAL_FLUSH_INTERVAL: int = 1000
+
+HISTORY_MEMORY_LIMIT: int = 16 * 1024 * 1024
+
+STATS_OVERLAY_INTERVAL: int = 250
+
+# drags shorter than this many pixels on empty canvas count as a click
+BOX_SELECT_THRESHOLD: int = 3
+SELECTION_BOX_COLOR: Tuple[float, float, float] = (0.3, 0.6, 1.0)
+
+# how much one notch of the mouse wheel zooms, and how far the camera can zoom out and in
+ZOOM_STEP: float = 1.1
+MIN_ZOOM: float = 0.01
+MAX_ZOOM: float = 100.0
 
 DEFAULT_PADDING: int = 5
 
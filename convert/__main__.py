@@ -0,0 +1,90 @@
+from Offscreen import prepare_platform
+
+# before anything imports OpenGL: every image is drawn offscreen, even with a display
+prepare_platform(offscreen=True)
+
+from argparse import ArgumentParser, ArgumentTypeError
+from concurrent.futures import Future, ProcessPoolExecutor
+from time import perf_counter
+from typing import Dict, List, Tuple
+import os
+import sys
+
+from convert.jobs import FORMATS, find_scenes, output_path, refused_outputs, start_worker, convert_scene
+from Renderers.Manager import renderers, DEFAULT_RENDERER
+
+def print_summary(converted: int, failed: int, shapes: int, elapsed: float) -> None:
+    print(
+        f'{converted:,} files converted, {failed:,} failed, {shapes:,} shapes in {elapsed:.2f} s: '
+        f'{converted / elapsed:,.1f} files/s, {shapes / elapsed:,.0f} shapes/s'
+    )
+
+def positive_int(text: str) -> int:
+    """
+    Parses a command line value that must be a whole number of at least 1, for argparse.
+    """
+    try:
+        value: int = int(text)
+    except ValueError:
+        raise ArgumentTypeError(f'{text!r} is not a whole number') from None
+
+    if value < 1:
+        raise ArgumentTypeError(f'{value} is not at least 1')
+
+    return value
+
+if __name__ == '__main__':
+    parser: ArgumentParser = ArgumentParser(prog='python -m convert', description="Converts saved 2D Shape Drawer scenes without opening the app")
+    parser.add_argument('inputs', nargs='+', help="scene files, or directories whose .dsd and .pkl files are converted")
+    parser.add_argument('--to', dest='output_format', choices=list(FORMATS), required=True, help="the format to convert to")
+    parser.add_argument('--output', default='.', help="the directory the converted files are written to")
+    parser.add_argument('--size', type=positive_int, help="the longest side of png and thumbnail images in pixels")
+    parser.add_argument('--workers', type=positive_int, default=os.cpu_count() or 1, help="how many processes convert files at once")
+    parser.add_argument('--renderer', default=DEFAULT_RENDERER, choices=list(renderers()), help="the renderer drawing png and thumbnail images")
+    arguments = parser.parse_args()
+
+    scenes: List[str] = find_scenes(arguments.inputs)
+
+    if not scenes:
+        print('No scenes to convert')
+        sys.exit(1)
+
+    os.makedirs(arguments.output, exist_ok=True)
+
+    started: float = perf_counter()
+    converted: int = 0
+    failed: int = 0
+    total_shapes: int = 0
+
+    destinations: List[str] = [output_path(scene, arguments.output, arguments.output_format) for scene in scenes]
+
+    # checked before anything is written, as the workers would overwrite each other's outputs or the scenes themselves
+    refused: Dict[str, str] = refused_outputs(scenes, destinations)
+
+    with ProcessPoolExecutor(max_workers=arguments.workers, initializer=start_worker, initargs=(arguments.output_format, arguments.renderer)) as executor:
+        jobs: List[Tuple[str, str, Future | None]] = []
+
+        for scene, destination in zip(scenes, destinations):
+            job: Future | None = None if scene in refused else executor.submit(convert_scene, scene, destination, arguments.output_format, arguments.size)
+            jobs.append((scene, destination, job))
+
+        # reported in the order the scenes were given, whichever worker finishes first
+        for scene, destination, job in jobs:
+            if job is None:
+                failed += 1
+                print(f'FAILED {scene}: {refused[scene]}', flush=True)
+                continue
+
+            try:
+                shapes, seconds = job.result()
+            except Exception as error:
+                failed += 1
+                print(f'FAILED {scene}: {type(error).__name__}: {error}', flush=True)
+                continue
+
+            converted += 1
+            total_shapes += shapes
+            print(f'{scene} -> {destination}  {shapes:,} shapes in {seconds * 1000:.1f} ms', flush=True)
+
+    print_summary(converted, failed, total_shapes, perf_counter() - started)
+    sys.exit(1 if failed else 0)
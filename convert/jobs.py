@@ -0,0 +1,158 @@
+from typing import Dict, List, Set, Tuple
+from time import perf_counter
+from os import path
+import os
+
+# the workers inherit the OpenGL platform convert.__main__ picked before anything imported OpenGL
+from Offscreen import OffscreenContext
+from ImageExport import write_png
+from SvgExport import write_svg
+from Save import read_scene, write_dsd
+from Shapes.ShapeStore import ShapeStore
+from Renderers.Manager import DEFAULT_RENDERER
+
+# what each output format is written as, appended to the name of the scene
+FORMATS: Dict[str, str] = {
+    'png': '.png',
+    'thumbnail': '.thumbnail.png',
+    'svg': '.svg',
+    'dsd': '.dsd',
+}
+
+# the formats drawn with OpenGL, and the default length of their longest side in pixels
+IMAGE_SIZES: Dict[str, int] = {'png': 2048, 'thumbnail': 256}
+
+# the saved scenes found in the directories given to the command
+SCENE_EXTENSIONS: Tuple[str, ...] = ('.dsd', '.pkl')
+
+# the offscreen context and renderer of this worker process, set by start_worker
+context: OffscreenContext | None = None
+renderer: str = DEFAULT_RENDERER
+
+def same_file_key(file_path: str) -> str:
+    """
+    Returns a key equal for every spelling of the same path, through links and case-insensitive file systems.
+    """
+    return path.normcase(path.realpath(file_path))
+
+def find_scenes(inputs: List[str]) -> List[str]:
+    """
+    Expands the paths given to the command into scene files: files are kept as they are, and directories
+    are replaced by the SCENE_EXTENSIONS files they contain, sorted by name. A scene given more than once,
+    such as a file and its directory, is only kept the first time.
+    """
+    scenes: List[str] = []
+    seen: Set[str] = set()
+
+    for input_path in inputs:
+        if path.isdir(input_path):
+            names: List[str] = sorted(name for name in os.listdir(input_path) if name.lower().endswith(SCENE_EXTENSIONS))
+            found: List[str] = [path.join(input_path, name) for name in names]
+        else:
+            found = [input_path]
+
+        for scene in found:
+            if same_file_key(scene) not in seen:
+                seen.add(same_file_key(scene))
+                scenes.append(scene)
+
+    return scenes
+
+def output_path(source: str, directory: str, output_format: str) -> str:
+    """
+    Returns where a scene converted to a format is written: its name without extension, followed by the extension of the format.
+    """
+    stem: str = path.splitext(path.basename(source))[0]
+    return path.join(directory, stem + FORMATS[output_format])
+
+def refused_outputs(scenes: List[str], destinations: List[str]) -> Dict[str, str]:
+    """
+    Finds the conversions that must not run: those whose output would overwrite one of the scenes being
+    converted, and those sharing their output with another scene, such as scene.dsd and scene.pkl or two
+    scenes of the same name from different directories, which would overwrite each other.
+
+    Args:
+        scenes (List[str]): The scenes to convert.
+        destinations (List[str]): The output of each scene, see output_path.
+
+    Returns:
+        Dict[str, str]: Why each refused scene isn't converted.
+    """
+    sources: Dict[str, str] = {same_file_key(scene): scene for scene in scenes}
+    writers: Dict[str, List[str]] = {}
+
+    for scene, destination in zip(scenes, destinations):
+        writers.setdefault(same_file_key(destination), []).append(scene)
+
+    refused: Dict[str, str] = {}
+
+    for scene, destination in zip(scenes, destinations):
+        key: str = same_file_key(destination)
+
+        if key in sources:
+            refused[scene] = f'the output {destination} would overwrite the scene {sources[key]}'
+
+        elif len(writers[key]) > 1:
+            refused[scene] = f'{", ".join(writers[key])} would all be written to {destination}'
+
+    return refused
+
+def image_size(shapes: ShapeStore, longest: int) -> Tuple[int, int]:
+    """
+    Returns the width and height of an image whose longest side is longest pixels, with the aspect ratio of the scene.
+    """
+    bounds: Tuple[float, float, float, float] | None = shapes.bounds()
+
+    if bounds is None:
+        return longest, longest
+
+    width: float = max(bounds[2] - bounds[0], 1e-9)
+    height: float = max(bounds[3] - bounds[1], 1e-9)
+
+    if width >= height:
+        return longest, max(1, round(longest * height / width))
+
+    return max(1, round(longest * width / height)), longest
+
+def start_worker(output_format: str, renderer_name: str) -> None:
+    """
+    Initializes a worker process, creating its own offscreen OpenGL context when the format is drawn.
+    """
+    global context, renderer
+
+    renderer = renderer_name
+
+    if output_format in IMAGE_SIZES:
+        context = OffscreenContext()
+
+def convert_scene(source: str, destination: str, output_format: str, size: int | None = None) -> Tuple[int, float]:
+    """
+    Reads a saved scene, either .dsd or a legacy pickle, and writes it in another format. Runs in a worker process.
+
+    Args:
+        source (str): The scene file.
+        destination (str): The file to write.
+        output_format (str): One of FORMATS.
+        size (int | None): The longest side of drawn formats in pixels, defaulting to IMAGE_SIZES.
+
+    Returns:
+        Tuple[int, float]: The number of shapes converted and the seconds the conversion took.
+    """
+    started: float = perf_counter()
+
+    if same_file_key(source) == same_file_key(destination):
+        raise ValueError('the output would overwrite the scene')
+
+    shapes: ShapeStore = read_scene(source)
+
+    if output_format == 'svg':
+        write_svg(destination, shapes)
+
+    elif output_format == 'dsd':
+        write_dsd(destination, shapes)
+
+    else:
+        width, height = image_size(shapes, size or IMAGE_SIZES[output_format])
+        write_png(destination, shapes, width, height, renderer=renderer)
+
+    return len(shapes), perf_counter() - started
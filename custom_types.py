@@ -4,4 +4,5 @@ type ENDPOINT = Tuple[NUMBER, NUMBER]
 type VERTICES = List[ENDPOINT] | None
 type RGB = List[float, float, float]
 type COORDINATE = List[int ,int]
-type NUMBER = int|str
\ No newline at end of file
+type NUMBER = int|str
+type RECTANGLE = Tuple[float, float, float, float]
\ No newline at end of file
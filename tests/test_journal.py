@@ -0,0 +1,118 @@
+from os import path
+import tempfile
+import unittest
+import os
+
+import numpy as np
+
+from Shapes.Manager import shapes as shape_classes
+from Shapes.ShapeStore import ShapeStore
+from Journal import Journal, Operation, HEADER, RECORD, JOURNAL_MAGIC, JOURNAL_VERSION
+
+def make_shapes(count: int) -> ShapeStore:
+    """
+    Returns a store of count shapes, cycling through every shape class.
+    """
+    shapes: ShapeStore = ShapeStore()
+
+    for number, shape_class in zip(range(count), list(shape_classes().values()) * count):
+        shapes.append(shape_class(start_coordinates=[10 * number, 20], end_coordinates=[10 * number + 40, 70]))
+
+    return shapes
+
+class JournalRecoveryTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.root: str = path.join(self.temporary_directory.name, 'autosave')
+
+    def tearDown(self) -> None:
+        self.temporary_directory.cleanup()
+
+    def running_session(self) -> Journal:
+        """
+        Returns the journal of a session that snapshotted some shapes and edited them since.
+        """
+        shapes: ShapeStore = make_shapes(8)
+        journal: Journal = Journal(self.root)
+        journal.compact(shapes)
+
+        shapes.translate(np.arange(4), 5, 5)
+        journal.record_rows(Operation.MOVE, shapes, np.arange(4))
+        journal.record(Operation.DELETE, shapes[7])
+        shapes.remove(shapes[7])
+        journal.flush()
+
+        self.expected: ShapeStore = shapes
+        return journal
+
+    def crashed_session(self) -> Journal:
+        """
+        Leaves the autosave of a session that never exited, its lock released the way the operating system does.
+        """
+        journal: Journal = self.running_session()
+        journal.close()
+        journal.lock.close()
+        return journal
+
+    def test_recovers_snapshot_and_log(self) -> None:
+        crashed: Journal = self.crashed_session()
+        journal: Journal = Journal(self.root)
+        recovered: ShapeStore | None = journal.recover()
+
+        self.assertIsNotNone(recovered)
+        self.assertEqual(journal.directory, crashed.directory)
+        self.assertEqual(len(recovered), len(self.expected))
+        np.testing.assert_array_equal(recovered.centers, self.expected.centers)
+        journal.discard()
+
+    def test_running_session_is_left_alone(self) -> None:
+        running: Journal = self.running_session()
+        journal: Journal = Journal(self.root)
+
+        self.assertIsNone(journal.recover())
+        journal.compact(make_shapes(2))
+        journal.discard()
+
+        self.assertEqual(os.listdir(self.root), [path.basename(running.directory)])
+        self.assertEqual(len(running.generations()), 1)
+        running.discard()
+
+    def test_truncated_snapshot_is_set_aside(self) -> None:
+        crashed: Journal = self.crashed_session()
+        snapshot_path: str = crashed.snapshot_path(crashed.generation)
+
+        with open(snapshot_path, 'r+b') as file:
+            file.truncate(path.getsize(snapshot_path) // 2)
+
+        self.assert_set_aside(crashed.generation)
+
+    def test_log_with_unknown_kind_is_set_aside(self) -> None:
+        crashed: Journal = self.crashed_session()
+        kind_table: bytes = b'NoSuchShape'
+
+        with open(crashed.log_path(crashed.generation), 'wb') as file:
+            file.write(HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, crashed.generation, len(kind_table)))
+            file.write(kind_table)
+            file.write(RECORD.pack(Operation.INSERT, 0, len(self.expected), 0, 0, 10, 10))
+
+        self.assert_set_aside(crashed.generation)
+
+    def assert_set_aside(self, generation: int) -> None:
+        """
+        Checks that recovering the damaged generation fails, and that once it is set aside the next start has nothing to recover.
+        """
+        journal: Journal = Journal(self.root)
+
+        with self.assertRaises(ValueError):
+            journal.recover()
+
+        journal.set_aside()
+
+        self.assertTrue(any(file_name.endswith('.corrupt') for file_name in os.listdir(journal.directory)))
+        self.assertEqual(journal.generations(), [generation + 1])
+
+        journal.discard()
+        self.assertIsNone(Journal(self.root).recover())
+
+if __name__ == '__main__':
+    unittest.main()